@@ -1,16 +1,50 @@
 # backend/api/chat_routes.py
 import logging
 from flask import Blueprint, request, jsonify
+from config import Config
 from services.azure_openai import get_openai_response
 from services.function_router import route_function_call
+from services.admission import AdmissionRejected
+from services.circuit_breaker import CircuitOpen
+from services.deadline import deadline_scope, DeadlineExceeded
+from services.session_store import get_session_store, new_conversation_id
+from utils.log import summarize
 
 logger = logging.getLogger(__name__)
 chat_bp = Blueprint('chat', __name__)
 
+def busy_response(e):
+    """503 with Retry-After for a call rejected by admission control or an open circuit."""
+    logger.warning("Call to %s rejected: %s", e.backend, e)
+    response = jsonify({"error": str(e), "backend": e.backend})
+    if e.retry_after:
+        response.headers['Retry-After'] = str(e.retry_after)
+    return response, 503
+
+def deadline_response(e):
+    """504 for a request whose time budget ran out."""
+    logger.warning("Chat request deadline exceeded: %s", e)
+    return jsonify({"error": str(e)}), 504
+
+def finish_turn(conversation_id, user_message, reply):
+    """Append the turn to the server-side session (if any) and build the response body."""
+    if not conversation_id:
+        return jsonify({"response": reply})
+    get_session_store().append(conversation_id, [
+        {"role": "user", "content": user_message},
+        {"role": "assistant", "content": reply.get("content") or ""}
+    ])
+    return jsonify({"response": reply, "conversation_id": conversation_id})
+
 @chat_bp.route('/chat', methods=['POST'])
 def chat():
-    logger.debug(f"Received chat request: {request.data}")
+    logger.debug("Received chat request: %s", summarize(request.data))
     
+    # Every outbound call made for this request shares one time budget
+    with deadline_scope(Config.CHAT_DEADLINE_SECONDS):
+        return handle_chat()
+
+def handle_chat():
     try:
         data = request.json
         if not data or 'message' not in data:
@@ -20,11 +54,23 @@ def chat():
         user_message = data['message']
         chat_history = data.get('history', [])
         
-        logger.info(f"Processing message: {user_message}")
+        # Clients that send a conversation_id (or no history) use a server-side
+        # session and only send the new message; a client-sent history is still honoured
+        conversation_id = data.get('conversation_id')
+        session_messages = None
+        if conversation_id or 'history' not in data:
+            conversation_id = conversation_id or new_conversation_id()
+            session_messages = get_session_store().get(conversation_id)
+        
+        # Skip the completion cache for this request ("bypass_cache": true or Cache-Control: no-cache)
+        use_cache = not (data.get('bypass_cache') or 'no-cache' in request.headers.get('Cache-Control', ''))
+        
+        logger.info("Processing message: %s", summarize(user_message, 200))
         
         # Get response from OpenAI
         try:
-            ai_response = get_openai_response(user_message, chat_history)
+            ai_response = get_openai_response(user_message, chat_history, session_messages=session_messages,
+                                             use_cache=use_cache)
             # Convert OpenAI response to a serializable format
             serializable_response = {
                 "content": ai_response.content if hasattr(ai_response, 'content') else None,
@@ -38,8 +84,12 @@ def chat():
                     "arguments": ai_response.function_call.arguments
                 }
                 
-            logger.debug(f"Serializable response: {serializable_response}")
+            logger.debug("Serializable response: %s", summarize(serializable_response))
             
+        except (AdmissionRejected, CircuitOpen) as e:
+            return busy_response(e)
+        except DeadlineExceeded as e:
+            return deadline_response(e)
         except Exception as e:
             logger.error(f"Error getting OpenAI response: {str(e)}")
             return jsonify({"error": f"OpenAI API error: {str(e)}"}), 500
@@ -49,19 +99,24 @@ def chat():
             function_name = ai_response.function_call.name
             function_args = ai_response.function_call.arguments
             
-            logger.info(f"Function call detected: {function_name}")
+            logger.info("Function call detected: %s", function_name)
             
             # Route to appropriate function
             try:
                 function_result = route_function_call(function_name, function_args)
-                logger.debug(f"Function result: {function_result}")
+                logger.debug("Function result: %s", summarize(function_result))
+            except (AdmissionRejected, CircuitOpen) as e:
+                return busy_response(e)
+            except DeadlineExceeded as e:
+                return deadline_response(e)
             except Exception as e:
                 logger.error(f"Error executing function {function_name}: {str(e)}")
                 return jsonify({"error": f"Function execution error: {str(e)}"}), 500
             
             # Get final response incorporating function result
             try:
-                final_response = get_openai_response(user_message, chat_history, function_result)
+                final_response = get_openai_response(user_message, chat_history, function_result,
+                                                     session_messages=session_messages, use_cache=use_cache)
                 # Convert the final response to a serializable format
                 serializable_final_response = {
                     "content": final_response.content if hasattr(final_response, 'content') else None,
@@ -74,13 +129,17 @@ def chat():
                         "arguments": final_response.function_call.arguments
                     }
                     
-                logger.debug(f"Final serializable response: {serializable_final_response}")
-                return jsonify({"response": serializable_final_response})
+                logger.debug("Final serializable response: %s", summarize(serializable_final_response))
+                return finish_turn(conversation_id, user_message, serializable_final_response)
+            except (AdmissionRejected, CircuitOpen) as e:
+                return busy_response(e)
+            except DeadlineExceeded as e:
+                return deadline_response(e)
             except Exception as e:
                 logger.error(f"Error getting final response: {str(e)}")
                 return jsonify({"error": f"Error getting final response: {str(e)}"}), 500
         
-        return jsonify({"response": serializable_response})
+        return finish_turn(conversation_id, user_message, serializable_response)
     
     except Exception as e:
         logger.error(f"Unhandled error in chat endpoint: {str(e)}")
@@ -0,0 +1,31 @@
+# backend/api/job_routes.py
+import logging
+from flask import Blueprint, request, jsonify
+from services.job_queue import get_job_queue, PENDING_STATES
+
+logger = logging.getLogger(__name__)
+jobs_bp = Blueprint('jobs', __name__)
+
+@jobs_bp.route('/jobs', methods=['GET'])
+def list_jobs():
+    """List the most recent background jobs, newest first."""
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify({"jobs": get_job_queue().list_jobs(limit)})
+
+@jobs_bp.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Return a background job's status (queued, running, succeeded or failed)."""
+    job = get_job_queue().get_job(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown job ID: {job_id}"}), 404
+    return jsonify(job)
+
+@jobs_bp.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """Return a finished job with its result; 202 with the status while it is still pending."""
+    job = get_job_queue().get_job(job_id, include_result=True)
+    if job is None:
+        return jsonify({"error": f"Unknown job ID: {job_id}"}), 404
+    if job["status"] in PENDING_STATES:
+        return jsonify(job), 202
+    return jsonify(job)
@@ -0,0 +1,18 @@
+# backend/api/results_routes.py
+import logging
+from flask import Blueprint, request, jsonify
+from utils.result_pages import get_result_page_store
+
+logger = logging.getLogger(__name__)
+results_bp = Blueprint('results', __name__)
+
+@results_bp.route('/results/page', methods=['GET'])
+def results_page():
+    """Return the next page of a top-K result (variance rows, missing pairs, trend series)."""
+    cursor = request.args.get('cursor')
+    if not cursor:
+        return jsonify({"success": False, "error": "cursor is required"}), 400
+    page = get_result_page_store().get_page(cursor, request.args.get('page_size', type=int))
+    if not page["success"]:
+        return jsonify(page), 404
+    return jsonify(page)
@@ -0,0 +1,58 @@
+# backend/api/status_routes.py
+import queue
+import logging
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from config import Config
+from services.status_watcher import get_watcher
+from utils.serialization import dumps_str
+
+logger = logging.getLogger(__name__)
+status_bp = Blueprint('status', __name__)
+
+def format_sse(event):
+    """Format an event dict as a Server-Sent Events message."""
+    return f"event: {event['type']}\ndata: {dumps_str(event)}\n\n"
+
+@status_bp.route('/status/stream', methods=['GET'])
+def status_stream():
+    """Push live 6G status changes for a COB date (defaults to today) over SSE."""
+    watcher = get_watcher(request.args.get('cob_date'))
+    subscriber = watcher.subscribe()
+    logger.info(f"SSE subscriber joined for COB date {watcher.cob_date} "
+                f"({watcher.subscriber_count()} watching)")
+
+    def generate():
+        try:
+            while True:
+                try:
+                    event = subscriber.get(timeout=Config.STATUS_SSE_KEEPALIVE_SECONDS)
+                    yield format_sse(event)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+        finally:
+            watcher.unsubscribe(subscriber)
+            logger.info(f"SSE subscriber left for COB date {watcher.cob_date}")
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@status_bp.route('/status/current', methods=['GET'])
+def status_current():
+    """Return the watcher's in-memory snapshot without querying Oracle."""
+    watcher = get_watcher(request.args.get('cob_date'))
+    if not watcher.snapshot:
+        return jsonify({
+            "cob_date": watcher.cob_date,
+            "message": "No snapshot yet. Subscribe to /api/status/stream to start the watcher.",
+            "error": watcher.last_error
+        }), 404
+    return jsonify({
+        "cob_date": watcher.cob_date,
+        "last_polled_at": watcher.last_polled_at,
+        "subscribers": watcher.subscriber_count(),
+        "status": watcher.snapshot
+    })
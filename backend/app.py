@@ -6,24 +6,74 @@ from flask_cors import CORS
 import traceback
 import os
 from api.chat_routes import chat_bp
+from api.status_routes import status_bp
+from api.results_routes import results_bp
+from api.job_routes import jobs_bp
 from config import Config
+from services.metrics import get_metrics
+from services.admission import AdmissionRejected, get_admission_report
+from services.circuit_breaker import CircuitOpen, get_breaker_report
+from services.deadline import DeadlineExceeded
+from services.azure_openai import get_completion_cache
+from api.chat_routes import busy_response, deadline_response
+from services.warmup import start_warm_up, is_ready, get_warm_up_report
+from services.job_queue import get_job_queue
+from utils.serialization import FastJSONProvider, compress_response
+from utils.log import configure_logging
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
+# Set up logging (LOG_LEVEL, LOG_FORMAT, LOG_LEVELS)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+# orjson-backed jsonify (numpy/pandas values, valid JSON for NaN/inf)
+app.json = FastJSONProvider(app)
 CORS(app, resources={r"/api/*": {"origins": "*"}}, supports_credentials=True)
 app.config.from_object(Config)
 CORS(app)  # Enable CORS for all routes
 
 # Register blueprints
 app.register_blueprint(chat_bp, url_prefix='/api')
+app.register_blueprint(status_bp, url_prefix='/api')
+app.register_blueprint(results_bp, url_prefix='/api')
+app.register_blueprint(jobs_bp, url_prefix='/api')
 
 @app.route('/health', methods=['GET'])
 def health_check():
+    breakers = get_breaker_report()
+    degraded = sorted(name for name, breaker in breakers.items() if breaker["state"] != "closed")
+    return jsonify({"status": "degraded" if degraded else "ok", "ready": is_ready(),
+                    "warm_up": get_warm_up_report(), "breakers": breakers, "degraded": degraded})
+
+@app.route('/health/live', methods=['GET'])
+def liveness_check():
     return jsonify({"status": "ok"})
 
+@app.route('/health/ready', methods=['GET'])
+def readiness_check():
+    report = get_warm_up_report()
+    if not is_ready():
+        return jsonify({"status": "warming_up", "warm_up": report}), 503
+    return jsonify({"status": report["status"], "warm_up": report})
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return jsonify({**get_metrics(), "admission": get_admission_report(),
+                    "completion_cache": get_completion_cache().stats()})
+
+@app.after_request
+def compress(response):
+    return compress_response(response, request.headers.get('Accept-Encoding'))
+
+@app.errorhandler(AdmissionRejected)
+@app.errorhandler(CircuitOpen)
+def handle_backend_unavailable(e):
+    return busy_response(e)
+
+@app.errorhandler(DeadlineExceeded)
+def handle_deadline_exceeded(e):
+    return deadline_response(e)
+
 # Add a global error handler
 @app.errorhandler(Exception)
 def handle_exception(e):
@@ -34,6 +84,20 @@ def handle_exception(e):
         "message": str(e)
     }), 500
 
+def start_background_services():
+    """
+    Start the work a serving process needs besides answering requests.
+
+    Called by the dev server below and by wsgi.py; importing this module
+    (tests, load tests, scripts) starts nothing.
+    """
+    start_warm_up()
+    # Re-queue jobs that were pending when the server last stopped
+    get_job_queue()
+
 if __name__ == '__main__':
+    # With the debug reloader the app runs in a child process; warm that one only
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_services()
     logger.info("Starting Flask app...")
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)), debug=True)
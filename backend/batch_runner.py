@@ -0,0 +1,309 @@
+# backend/batch_runner.py
+"""
+Batch runner for bulk 6G status and variance backfills over a date range.
+
+    python batch_runner.py --start 2025-03-03 --end 2025-03-31 --output backfills/2025-03
+    python batch_runner.py --start 2025-03-03 --end 2025-03-31 --output backfills/2025-03 \\
+        --functions sls_details_variance --format csv --workers 8 --db-concurrency 3
+
+For every business day D in the range it runs the registered functions:
+
+- get_6g_status(D): one row per BPF table (status, start/end, duration).
+- sls_details_variance(D-1, D): one row per variance (and missing pair) of the
+  reporting, base data and SLS details tables, D-1 being the previous business day.
+
+Tasks run on --workers threads; Oracle and Impala calls go through the shared
+pooled backends and are limited to --db-concurrency at a time by admission
+control. Each finished task is written to <output>/<function>/<date>.<format>
+and recorded in <output>/_checkpoint.jsonl, so rerunning the same command
+after an interruption only runs what is missing (or failed). Once every task
+has succeeded the parts are combined into <output>/<function>.<format>.
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+
+# Add this directory to path so we can import our modules when run from elsewhere
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from utils.log import configure_logging
+
+logger = logging.getLogger("batch_runner")
+
+BATCH_FUNCTIONS = ("get_6g_status", "sls_details_variance")
+VARIANCE_ANALYSES = ("reporting_table_analysis", "base_data_analysis", "sls_details_analysis")
+CHECKPOINT_FILE = "_checkpoint.jsonl"
+
+def business_days(start_date, end_date):
+    """Every business day from start_date to end_date (YYYY-MM-DD), inclusive."""
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    if end < start:
+        raise ValueError(f"End date {end_date} is before start date {start_date}")
+    return [d.strftime('%Y-%m-%d') for d in pd.bdate_range(start, end)]
+
+def build_tasks(dates, function_names, product_identifiers=None, top_k=0):
+    """
+    Build the (function, date, args) tasks of a run.
+
+    Args:
+        dates (list): Business days in format YYYY-MM-DD
+        function_names (list): Functions from BATCH_FUNCTIONS
+        product_identifiers (str, optional): Passed to sls_details_variance
+        top_k (int, optional): Variance rows per table; 0 keeps every row
+
+    Returns:
+        list: Task dicts with function, date and args
+    """
+    tasks = []
+    for function_name in function_names:
+        if function_name not in BATCH_FUNCTIONS:
+            raise ValueError(f"Unknown batch function '{function_name}'. Use one of: {', '.join(BATCH_FUNCTIONS)}")
+        for date in dates:
+            if function_name == "get_6g_status":
+                args = {"cob_date": datetime.strptime(date, '%Y-%m-%d').strftime('%m-%d-%Y')}
+            else:
+                previous = (pd.Timestamp(date) - pd.offsets.BDay(1)).strftime('%Y-%m-%d')
+                args = {"date1": previous, "date2": date, "top_k": top_k}
+                if product_identifiers:
+                    args["product_identifiers"] = product_identifiers
+            tasks.append({"function": function_name, "date": date, "args": args})
+    return tasks
+
+def _scalar(value):
+    # Nested values (lists, dicts) become JSON text so every column is flat
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, default=str)
+    return value
+
+def status_rows(date, result):
+    """One row per table of a get_6g_status result."""
+    return [{"cob_date": date, **{key: _scalar(value) for key, value in table.items()}}
+            for table in result.get("tables", [])]
+
+def variance_rows(date, result):
+    """One row per variance and missing pair of an sls_details_variance result."""
+    rows = []
+    for analysis_name in VARIANCE_ANALYSES:
+        analysis = result.get(analysis_name) or {}
+        for kind in ("variance_data", "missing_pairs"):
+            for item in analysis.get(kind, []):
+                rows.append({"date1": result.get("date1"), "date2": date,
+                             "analysis": analysis_name.replace("_analysis", ""), "kind": kind,
+                             **{key: _scalar(value) for key, value in item.items()}})
+    return rows
+
+ROW_BUILDERS = {
+    "get_6g_status": status_rows,
+    "sls_details_variance": variance_rows
+}
+
+def args_hash(args):
+    """Stable hash of a task's arguments (e.g. top_k, product_identifiers)."""
+    return hashlib.sha256(json.dumps(args, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+class Checkpoint:
+    """
+    Append-only JSON-lines record of finished tasks; the last record of a task wins.
+
+    Each record carries the hash of the task's arguments, so a task rerun with
+    different arguments (another --top-k or --product-identifiers) is not done
+    and its part file is rewritten instead of reused.
+    """
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, CHECKPOINT_FILE)
+        self._lock = threading.Lock()
+        self.records = {}
+        if os.path.exists(self.path):
+            with open(self.path) as checkpoint_file:
+                for line in checkpoint_file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # a line cut short by the interruption
+                    self.records[(record["function"], record["date"])] = record
+
+    def is_done(self, task):
+        record = self.records.get((task["function"], task["date"]))
+        return bool(record) and record["status"] == "done" and record.get("args_hash") == args_hash(task["args"])
+
+    def record(self, task, status, **fields):
+        record = {"function": task["function"], "date": task["date"], "status": status,
+                  "args_hash": args_hash(task["args"]),
+                  "finished_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'), **fields}
+        with self._lock:
+            with open(self.path, 'a') as checkpoint_file:
+                checkpoint_file.write(json.dumps(record, default=str) + "\n")
+                checkpoint_file.flush()
+                os.fsync(checkpoint_file.fileno())
+            self.records[(task["function"], task["date"])] = record
+
+def _uniform_columns(df):
+    # Parquet needs one type per column; text wins where values are mixed (e.g. 5 and '5-10 mins')
+    for column in df.columns[df.dtypes == object]:
+        values = df[column].dropna()
+        if values.map(type).nunique() > 1:
+            df[column] = df[column].map(lambda value: value if value is None or pd.isna(value) else str(value))
+    return df
+
+def write_frame(df, path, output_format):
+    """Write a DataFrame atomically (temp file + rename) as parquet or csv."""
+    temp_path = f"{path}.tmp"
+    if output_format == "parquet":
+        _uniform_columns(df).to_parquet(temp_path, index=False)
+    else:
+        df.to_csv(temp_path, index=False)
+    os.replace(temp_path, path)
+
+def read_frame(path, output_format):
+    if output_format == "parquet":
+        return pd.read_parquet(path)
+    try:
+        return pd.read_csv(path)
+    except pd.errors.EmptyDataError:  # a task that returned no rows
+        return pd.DataFrame()
+
+def part_path(output_dir, task, output_format):
+    return os.path.join(output_dir, task["function"], f"{task['date']}.{output_format}")
+
+def run_task(task, output_dir, output_format, execute):
+    """Run one task and write its rows; returns (status, fields for the checkpoint)."""
+    start = time.perf_counter()
+    result = execute(task["function"], task["args"])
+    if not isinstance(result, dict) or not result.get("success", False):
+        error = result.get("error") if isinstance(result, dict) else f"Unexpected result: {result!r}"
+        return "failed", {"error": error, "seconds": round(time.perf_counter() - start, 2)}
+
+    rows = ROW_BUILDERS[task["function"]](task["date"], result)
+    path = part_path(output_dir, task, output_format)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_frame(pd.DataFrame(rows), path, output_format)
+    return "done", {"rows": len(rows), "path": os.path.relpath(path, output_dir),
+                    "seconds": round(time.perf_counter() - start, 2)}
+
+def combine_parts(output_dir, tasks, output_format):
+    """Concatenate each function's part files into <output>/<function>.<format>."""
+    combined = {}
+    for function_name in dict.fromkeys(task["function"] for task in tasks):
+        frames = [read_frame(part_path(output_dir, task, output_format), output_format)
+                  for task in tasks if task["function"] == function_name]
+        frames = [frame for frame in frames if not frame.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        path = os.path.join(output_dir, f"{function_name}.{output_format}")
+        write_frame(df, path, output_format)
+        combined[function_name] = {"path": path, "rows": len(df)}
+    return combined
+
+def run_batch(tasks, output_dir, output_format="parquet", workers=4, execute=None):
+    """
+    Run the tasks not yet done according to the checkpoint.
+
+    Args:
+        tasks (list): From build_tasks()
+        output_dir (str): Directory for part files, checkpoint and combined output
+        output_format (str): 'parquet' or 'csv'
+        workers (int): Tasks run at once
+        execute (callable, optional): (function_name, args) -> result; defaults to
+            function_router.execute_function (the registered functions)
+
+    Returns:
+        dict: done/skipped/failed counts, failed tasks and the combined files (when complete)
+    """
+    if execute is None:
+        import functions  # noqa: F401 (registers the functions)
+        from services.function_router import execute_function
+        execute = execute_function
+
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint = Checkpoint(output_dir)
+    pending = [task for task in tasks if not checkpoint.is_done(task)]
+    skipped = len(tasks) - len(pending)
+    if skipped:
+        logger.info("Resuming: %d of %d tasks already done", skipped, len(tasks))
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="batch") as executor:
+        futures = {executor.submit(run_task, task, output_dir, output_format, execute): task for task in pending}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                status, fields = future.result()
+            except Exception as e:
+                status, fields = "failed", {"error": str(e)}
+            checkpoint.record(task, status, **fields)
+            if status == "failed":
+                failed.append({**task, "error": fields.get("error")})
+                logger.warning("%s %s failed: %s", task["function"], task["date"], fields.get("error"))
+            else:
+                logger.info("%s %s: %d rows in %.1fs", task["function"], task["date"], fields["rows"], fields["seconds"])
+
+    summary = {"tasks": len(tasks), "done": len(pending) - len(failed), "skipped": skipped,
+               "failed": len(failed), "failed_tasks": failed}
+    if not failed:
+        summary["outputs"] = combine_parts(output_dir, tasks, output_format)
+    return summary
+
+def limit_db_concurrency(db_concurrency, workers):
+    """
+    Cap concurrent Oracle and Impala calls for this run.
+
+    Workers beyond the limit wait in the admission queue (sized to hold all of
+    them, without a practical timeout) instead of being rejected, and the
+    Oracle session pool is grown to the limit so waiting calls reuse sessions.
+    """
+    from services.admission import parse_limits
+    limits = parse_limits(Config.ADMISSION_LIMITS)
+    for backend in ("oracle", "impala"):
+        limits[backend] = (db_concurrency, max(workers, 1))
+    Config.ADMISSION_ENABLED = True
+    Config.ADMISSION_LIMITS = ",".join(f"{name}={slots}:{queue}" for name, (slots, queue) in limits.items())
+    Config.ADMISSION_QUEUE_TIMEOUT_SECONDS = 24 * 3600
+    Config.ORACLE_POOL_MAX = max(Config.ORACLE_POOL_MAX, db_concurrency)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Bulk 6G status and D vs D-1 variance over a date range")
+    arg_parser.add_argument('--start', required=True, help="First COB date, YYYY-MM-DD")
+    arg_parser.add_argument('--end', required=True, help="Last COB date, YYYY-MM-DD")
+    arg_parser.add_argument('--output', required=True, help="Output directory (also holds the checkpoint)")
+    arg_parser.add_argument('--functions', default=",".join(BATCH_FUNCTIONS),
+                            help=f"Comma-separated subset of {', '.join(BATCH_FUNCTIONS)}")
+    arg_parser.add_argument('--format', choices=("parquet", "csv"), default="parquet")
+    arg_parser.add_argument('--workers', type=int, default=4, help="Tasks run at once")
+    arg_parser.add_argument('--db-concurrency', type=int, default=2, help="Concurrent Oracle and Impala calls")
+    arg_parser.add_argument('--product-identifiers', help="Comma-separated product identifiers for the variance")
+    arg_parser.add_argument('--top-k', type=int, default=0, help="Variance rows kept per table (0 = all)")
+    arg_parser.add_argument('--restart', action='store_true', help="Ignore the checkpoint and run every task again")
+    args = arg_parser.parse_args()
+
+    configure_logging()
+    limit_db_concurrency(args.db_concurrency, args.workers)
+
+    if args.restart:
+        checkpoint_path = os.path.join(args.output, CHECKPOINT_FILE)
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    dates = business_days(args.start, args.end)
+    function_names = [name.strip() for name in args.functions.split(',') if name.strip()]
+    tasks = build_tasks(dates, function_names, args.product_identifiers, args.top_k)
+    logger.info("Running %d tasks (%d business days) with %d workers", len(tasks), len(dates), args.workers)
+
+    summary = run_batch(tasks, args.output, args.format, args.workers)
+    print(json.dumps(summary, indent=2, default=str))
+    sys.exit(1 if summary["failed"] else 0)
+
+if __name__ == "__main__":
+    main()
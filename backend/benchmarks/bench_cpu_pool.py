@@ -0,0 +1,99 @@
+# backend/benchmarks/bench_cpu_pool.py
+"""
+Mixed-traffic throughput with the CPU process pool off and on.
+
+    python benchmarks/bench_cpu_pool.py --threads 8 --pool-size 2
+
+Simulates one threaded backend worker: --threads request threads serve a
+shuffled mix of light requests (a few ms of Python work plus a 10 ms backend
+wait, like a status lookup answered from cache) and heavy variance analyses
+(run_variance_analysis on a --rows aggregate frame, see bench_variance_keys).
+
+With CPU_POOL_SIZE=0 the analyses hold the GIL on request threads and the
+light requests queue behind them; with a pool they run in worker processes
+(frames shipped as Arrow IPC through shared memory). Reported per mode:
+wall time, requests/s, and p50/p95 latency of the light and heavy requests.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from services.cpu_pool import get_cpu_pool, shutdown_cpu_pool
+from functions.sls_details_variance import run_variance_analysis
+from bench_variance_keys import make_frame, DATE1, DATE2
+
+def light_request():
+    payload = {"cob_date": "04-03-2025", "tables": [{"bpf_id": str(6101 + i), "status": "RUNNING"} for i in range(13)]}
+    for _ in range(200):
+        json.loads(json.dumps(payload))
+    time.sleep(0.01)
+
+def heavy_request(df):
+    run_variance_analysis(df, 'sls_line_number', 'ccf_flow_amt', DATE1, DATE2, top_k=50)
+
+def run_mix(df, threads, light, heavy, seed):
+    requests = [("light", None)] * light + [("heavy", df)] * heavy
+    random.Random(seed).shuffle(requests)
+
+    def timed(kind, frame):
+        start = time.perf_counter()
+        light_request() if kind == "light" else heavy_request(frame)
+        return kind, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(lambda item: timed(*item), requests))
+    wall = time.perf_counter() - start
+
+    summary = {"wall_seconds": round(wall, 3), "requests_per_second": round(len(requests) / wall, 1)}
+    for kind in ("light", "heavy"):
+        values = np.array([seconds for k, seconds in latencies if k == kind]) * 1000
+        summary[f"{kind}_p50_ms"] = round(float(np.percentile(values, 50)), 1)
+        summary[f"{kind}_p95_ms"] = round(float(np.percentile(values, 95)), 1)
+    return summary
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Mixed traffic with the CPU pool off and on")
+    arg_parser.add_argument('--rows', type=int, default=400000)
+    arg_parser.add_argument('--threads', type=int, default=8)
+    arg_parser.add_argument('--pool-size', type=int, default=2)
+    arg_parser.add_argument('--light', type=int, default=400)
+    arg_parser.add_argument('--heavy', type=int, default=8)
+    arg_parser.add_argument('--output', help="Write results as JSON")
+    args = arg_parser.parse_args()
+
+    df = make_frame(args.rows)
+    for column in ('sls_line_number', 'context_name'):
+        df[column] = df[column].astype('category')  # as load_table_aggregates returns them
+
+    results = []
+    print(f"{len(df):,} rows, {args.threads} threads, {args.light} light + {args.heavy} heavy requests")
+    print(f"{'pool':<6} {'wall s':>8} {'req/s':>8} {'light p50':>10} {'light p95':>10} {'heavy p50':>10} {'heavy p95':>10}")
+    for pool_size in (0, args.pool_size):
+        Config.CPU_POOL_SIZE = pool_size
+        if get_cpu_pool() is not None:
+            heavy_request(df)  # start the workers and import the modules outside the timing
+        summary = run_mix(df, args.threads, args.light, args.heavy, seed=1)
+        shutdown_cpu_pool()
+        summary["pool_size"] = pool_size
+        results.append(summary)
+        print(f"{pool_size:<6} {summary['wall_seconds']:>8.2f} {summary['requests_per_second']:>8.1f} "
+              f"{summary['light_p50_ms']:>10.1f} {summary['light_p95_ms']:>10.1f} "
+              f"{summary['heavy_p50_ms']:>10.1f} {summary['heavy_p95_ms']:>10.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# backend/benchmarks/bench_logging.py
+"""
+Measure logging overhead of the chat hot path at INFO and at DEBUG.
+
+    python benchmarks/bench_logging.py --variance-rows 10000
+
+Each iteration logs what one chat turn with a variance function call logs
+at DEBUG: the aggregate SQL text, the OpenAI response object and the function
+result. Two styles are compared:
+
+- eager: the previous f-string calls, which build the full string even
+  when DEBUG is disabled.
+- lazy: %-style arguments wrapped in utils.log.summarize, which are only
+  rendered (and capped at LOG_PAYLOAD_MAX_CHARS) when the record is emitted.
+
+Output goes to os.devnull through utils.log.configure_logging, so formatting
+is measured but terminal I/O is not.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tracemalloc
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.log import configure_logging, summarize
+
+logger = logging.getLogger("bench.logging")
+
+class FakeOpenAIResponse:
+    """Stands in for the ChatCompletion object whose repr the old code logged."""
+
+    def __init__(self, content):
+        self.content = content
+
+    def __repr__(self):
+        return f"ChatCompletion(choices=[Choice(message=ChatCompletionMessage(content={self.content!r}))])"
+
+def make_payloads(rows):
+    function_result = {"name": "sls_details_variance", "result": {"reporting": {"variance_data": [
+        {"sls_line": f"I.A.{i % 9 + 1}.{i:05d}", "context_name": f"CTX{i % 100:03d}",
+         "amount_date1": 1e6 + i, "amount_date2": 1.2e6 + i, "percentage_variance": 20.0}
+        for i in range(rows)]}}}
+    query = "SELECT context_key, cob_date, sls_line_number, context_name, SUM(ccf_flow_amt) " \
+            "FROM reporting WHERE context_key IN (" + ",".join(str(1000 + i) for i in range(400)) + ") GROUP BY 1,2,3,4"
+    response = FakeOpenAIResponse("The reporting table shows " + "several large variances. " * 200)
+    return query, response, function_result
+
+def log_eager(query, response, function_result):
+    logger.debug(f"Executing reporting aggregate query: {query}")
+    logger.debug(f"OpenAI API response received: {response}")
+    logger.debug(f"Function result: {function_result}")
+    logger.info(f"Function call detected: {function_result['name']}")
+
+def log_lazy(query, response, function_result):
+    logger.debug("Executing %s aggregate query: %s", "reporting", summarize(query))
+    logger.debug("OpenAI API response received: %s", summarize(response))
+    logger.debug("Function result: %s", summarize(function_result))
+    logger.info("Function call detected: %s", function_result['name'])
+
+def measure(fn, payloads, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(*payloads)
+    per_call = (time.perf_counter() - start) / iterations
+    tracemalloc.start()
+    fn(*payloads)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return per_call, peak
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Logging overhead of eager f-strings vs lazy summaries")
+    arg_parser.add_argument('--variance-rows', type=int, default=10000)
+    arg_parser.add_argument('--iterations', type=int, default=20)
+    arg_parser.add_argument('--output', help="Write results as JSON")
+    args = arg_parser.parse_args()
+
+    payloads = make_payloads(args.variance_rows)
+    results = []
+    with open(os.devnull, 'w') as devnull:
+        print(f"{'level':<6} {'style':<6} {'us/turn':>11} {'peak KiB':>10}")
+        for level in ("INFO", "DEBUG"):
+            configure_logging(level=level, log_format="text", module_levels="", stream=devnull)
+            for style, fn in (("eager", log_eager), ("lazy", log_lazy)):
+                per_call, peak = measure(fn, payloads, args.iterations)
+                results.append({"level": level, "style": style, "us_per_turn": round(per_call * 1e6, 1),
+                                "peak_kib": round(peak / 1024, 1)})
+                print(f"{level:<6} {style:<6} {per_call * 1e6:>11.1f} {peak / 1024:>10.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    main()
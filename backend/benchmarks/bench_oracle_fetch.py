@@ -0,0 +1,93 @@
+# backend/benchmarks/bench_oracle_fetch.py
+"""
+Compare Oracle fetch throughput of the JDBC and python-oracledb backends.
+
+Point the ORACLE_* / JDBC_DRIVER_PATH environment variables at the stand-in
+database (e.g. a local Oracle Free container) and run:
+
+    python benchmarks/bench_oracle_fetch.py --rows 200000 --repeat 3
+
+Each backend fetches the same generated result set (id, timestamp, label,
+amount) as list-of-dicts (the execute_oracle_query path) and as a DataFrame
+(the get_historical_runtime_data path).
+"""
+import os
+import sys
+import time
+import json
+import argparse
+from dotenv import load_dotenv
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+load_dotenv()
+
+from utils.oracle_connector import JdbcOracleBackend, OracleDbBackend
+
+QUERY = """
+SELECT LEVEL AS id,
+       SYSDATE - LEVEL / 1440 AS event_time,
+       'row ' || LEVEL AS label,
+       MOD(LEVEL * 7919, 100000) / 100 AS amount
+FROM dual
+CONNECT BY LEVEL <= {rows}
+"""
+
+def time_fetch(fetch, query, repeat):
+    """Run fetch(query) `repeat` times and return (best seconds, row count)."""
+    best = None
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fetch(query)
+        elapsed = time.perf_counter() - start
+        rows = len(result)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, rows
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Oracle fetch throughput: JDBC vs python-oracledb")
+    arg_parser.add_argument('--rows', type=int, default=100000)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--arraysizes', default="100,1000,5000", help="python-oracledb arraysizes to try")
+    arg_parser.add_argument('--skip-jdbc', action='store_true')
+    arg_parser.add_argument('--output', help="Write results as JSON")
+    args = arg_parser.parse_args()
+
+    query = QUERY.format(rows=args.rows)
+    cases = []
+
+    if not args.skip_jdbc:
+        jdbc = JdbcOracleBackend()
+        # JVM start-up is a one-time cost; keep it out of the measurement
+        jdbc.warm_up()
+        cases.append(("jdbc", "dicts", jdbc.fetch_dicts))
+        cases.append(("jdbc", "dataframe", jdbc.fetch_dataframe))
+
+    for arraysize in [int(a) for a in args.arraysizes.split(',')]:
+        backend = OracleDbBackend(arraysize=arraysize)
+        backend.warm_up()
+        cases.append((f"oracledb arraysize={arraysize}", "dicts", backend.fetch_dicts))
+        cases.append((f"oracledb arraysize={arraysize}", "dataframe", backend.fetch_dataframe))
+
+    results = []
+    print(f"{'backend':<28} {'result':<10} {'rows':>9} {'best s':>9} {'rows/s':>12}")
+    for backend_name, result_type, fetch in cases:
+        seconds, rows = time_fetch(fetch, query, args.repeat)
+        rows_per_second = rows / seconds if seconds else 0
+        results.append({
+            "backend": backend_name,
+            "result": result_type,
+            "rows": rows,
+            "best_seconds": round(seconds, 4),
+            "rows_per_second": round(rows_per_second)
+        })
+        print(f"{backend_name:<28} {result_type:<10} {rows:>9} {seconds:>9.3f} {rows_per_second:>12,.0f}")
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# backend/benchmarks/bench_serialization.py
+"""
+Compare JSON encoding and response compression of large function results.
+
+    python benchmarks/bench_serialization.py --variance-rows 10000
+
+Payloads:
+
+- 6g_status: a get_6g_status result for the 13 FR2052a tables, with the
+  numpy/pandas values the status code produces (rounded np.float64, np.int64
+  counts, Timestamps).
+- variance: an sls_details_variance result with --variance-rows variance rows
+  and a tenth as many missing pairs.
+
+Each payload is encoded the way the chat turn used to do it - json.dumps for
+the LLM message plus Flask's default jsonify - and with utils.serialization
+(one orjson pass for each). Compression reports the encoded size and time of
+gzip (RESPONSE_GZIP_LEVEL) and, when the brotli package is installed, brotli
+(RESPONSE_BROTLI_QUALITY).
+"""
+import os
+import sys
+import json
+import gzip
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from utils.serialization import dumps, dumps_str, brotli
+
+def make_6g_status(seed=3):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2025-04-03 18:00:00")
+    tables = []
+    for i in range(13):
+        status = ("COMPLETED", "RUNNING", "PENDING")[min(i // 5, 2)]
+        table = {"bpf_id": f"BPF{1000 + i}", "name": f"FR2052A_TABLE_{i:02d}", "status": status,
+                 "process_name": "FR2052A_DAILY" if status != "PENDING" else "",
+                 "start_time": start + pd.Timedelta(minutes=int(rng.integers(0, 300))) if status != "PENDING" else None,
+                 "end_time": None}
+        if status == "COMPLETED":
+            table["duration_minutes"] = np.int64(rng.integers(10, 90))
+        elif status == "RUNNING":
+            table.update({"elapsed_minutes": np.int64(rng.integers(5, 60)),
+                          "predicted_duration": np.round(np.float64(rng.normal(60, 10)), 1),
+                          "estimated_remaining_minutes": np.round(np.float64(rng.normal(20, 5)), 1),
+                          "estimated_completion_time": "2025-04-03 21:14:00",
+                          "prediction_confidence": "medium", "prediction_range": "48.2-71.9 mins",
+                          "cluster_adjustment": np.float64(1.08)})
+        else:
+            table.update({"historical_avg_duration": np.round(np.float64(rng.normal(45, 8)), 1),
+                          "historical_median_duration": np.round(np.float64(rng.normal(44, 8)), 1),
+                          "historical_range": "31.0-77.5 mins", "historical_runs": np.int64(30)})
+        tables.append(table)
+    return {"success": True, "cob_date": "04-03-2025", "process_name": "FR2052A", "process_alias": "6G",
+            "tables_completed": 5, "tables_running": 5, "tables_pending": 3, "total_tables": 13,
+            "completion_percentage": 38,
+            "cluster_health": {"memory_utilization": np.float64(71.52), "cpu_utilization": np.float64(64.1),
+                               "is_overloaded": np.bool_(False)},
+            "overall_statistics": {"avg_total_runtime": np.float64(612.4), "historical_days": 30},
+            "tables": tables}
+
+def make_variance(rows, seed=5):
+    rng = np.random.default_rng(seed)
+    amount1 = rng.normal(1e6, 2e5, rows).round(2)
+    amount2 = (amount1 * rng.uniform(1.1, 1.5, rows)).round(2)
+    variance_data = [{
+        "sls_line": f"I.A.{i % 9 + 1}.{i:05d}", "context_name": f"FR2052A_CONTEXT_{i % 100:03d}",
+        "context_key_date1": 1001, "context_key_date2": 1002,
+        "amount_date1": a1, "amount_date2": a2, "absolute_variance": a2 - a1,
+        "percentage_variance": (a2 - a1) / abs(a1) * 100, "pair_id": f"I.A.{i % 9 + 1}.{i:05d}|CTX{i % 100:03d}"
+    } for i, a1, a2 in zip(range(rows), amount1.tolist(), amount2.tolist())]
+    missing_pairs = [{
+        "sls_line": f"I.B.{i:05d}", "context_name": f"FR2052A_CONTEXT_{i % 100:03d}", "context_key": 1001,
+        "missing_from": "2025-04-03", "present_in": "2025-04-02", "amount": float(a)
+    } for i, a in enumerate(amount1[:rows // 10])]
+    return {"success": True, "date1": "2025-04-02", "date2": "2025-04-03",
+            "reporting": {"message": f"Analysis completed. Found {rows} pairs with significant variance (>=10%).",
+                          "variance_data": variance_data, "missing_pairs": missing_pairs}}
+
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, out
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="JSON encoding and compression of large function results")
+    arg_parser.add_argument('--variance-rows', type=int, default=10000)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--output', help="Write results as JSON")
+    args = arg_parser.parse_args()
+
+    flask_default = DefaultJSONProvider(Flask(__name__))
+    payloads = {"6g_status": make_6g_status(), "variance": make_variance(args.variance_rows)}
+
+    results = []
+    print(f"{'payload':<11} {'step':<22} {'best ms':>9} {'bytes':>11}")
+    for name, payload in payloads.items():
+        def stdlib():
+            # LLM message + Flask's default jsonify; the default provider cannot encode numpy ints/bools
+            message = json.dumps(payload, default=str)
+            return flask_default.dumps({"result": payload}, default=str).encode(), message
+
+        def fast():
+            message = dumps_str(payload)
+            return dumps({"result": payload}), message
+
+        steps = [("encode: json x2", stdlib), ("encode: orjson x2", fast)]
+        body = fast()[0]
+        steps.append((f"gzip level {Config.RESPONSE_GZIP_LEVEL}",
+                      lambda: (gzip.compress(body, compresslevel=Config.RESPONSE_GZIP_LEVEL),)))
+        if brotli is not None:
+            steps.append((f"brotli quality {Config.RESPONSE_BROTLI_QUALITY}",
+                          lambda: (brotli.compress(body, quality=Config.RESPONSE_BROTLI_QUALITY),)))
+
+        for step, fn in steps:
+            seconds, out = best_time(fn, args.repeat)
+            size = len(out[0])
+            results.append({"payload": name, "step": step, "best_ms": round(seconds * 1000, 3), "bytes": size})
+            print(f"{name:<11} {step:<22} {seconds * 1000:>9.2f} {size:>11,}")
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# backend/benchmarks/bench_variance_keys.py
+"""
+Compare peak memory and run time of the variance key handling on synthetic data.
+
+    python benchmarks/bench_variance_keys.py --rows 1000000
+
+Builds two COB dates of (sls_line, context) aggregates and runs:
+
+- strings: the previous approach - a concatenated 'sls_line|context_name'
+  pair_id column and Python set operations over it. The old per-pair boolean
+  scans are quadratic and do not finish at this size, so this baseline looks
+  rows up through an index instead; key handling is otherwise unchanged.
+- codes: analyze_variance_in_dataframe, which matches pairs on int64 codes
+  from one shared dictionary (object columns, as read from Impala).
+- codes+categorical: the same on category columns, as produced by
+  load_table_aggregates.
+
+Peak memory is measured with tracemalloc (numpy and pandas allocations are
+traced) and covers only the analysis, not building the input frame.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from functions.sls_details_variance import analyze_variance_in_dataframe
+
+DATE1 = "2025-04-02"
+DATE2 = "2025-04-03"
+
+def make_frame(rows, seed=7):
+    """Two dates of aggregates; ~2% of pairs exist on one date only, ~5% move by >= 10%."""
+    rng = np.random.default_rng(seed)
+    pairs_per_date = rows // 2
+    contexts = 100
+    lines = max(pairs_per_date // contexts, 1)
+    line_names = np.array([f"I.A.{i % 9 + 1}.{i:05d}" for i in range(lines)], dtype=object)
+    context_names = np.array([f"FR2052A_CONTEXT_{c:03d}" for c in range(contexts)], dtype=object)
+
+    pair_index = np.arange(lines * contexts)[:pairs_per_date]
+    amount1 = rng.normal(1e6, 2e5, len(pair_index)).round(2)
+    amount2 = amount1 * np.where(rng.random(len(pair_index)) < 0.05, 1.25, rng.uniform(0.97, 1.03, len(pair_index)))
+    keep1 = rng.random(len(pair_index)) > 0.01
+    keep2 = rng.random(len(pair_index)) > 0.01
+
+    frames = []
+    for cob_date, context_key, amounts, keep in ((DATE1, 1001, amount1, keep1), (DATE2, 1002, amount2, keep2)):
+        idx = pair_index[keep]
+        frames.append(pd.DataFrame({
+            "context_key": context_key,
+            "cob_date": cob_date,
+            "sls_line_number": line_names[idx // contexts],
+            "context_name": context_names[idx % contexts],
+            "ccf_flow_amt": amounts[keep]
+        }))
+    df = pd.concat(frames, ignore_index=True)
+    # pyodbc rows arrive as Python objects; keep object dtype like the Impala path
+    for column in ('cob_date', 'sls_line_number', 'context_name'):
+        df[column] = df[column].astype(object)
+    return df
+
+def analyze_with_string_keys(df):
+    """Previous key handling: string pair_id column plus Python set operations."""
+    df = df.copy()
+    df['pair_id'] = df['sls_line_number'] + '|' + df['context_name']
+    df1 = df[df['cob_date'] == DATE1].drop_duplicates('pair_id').set_index('pair_id')
+    df2 = df[df['cob_date'] == DATE2].drop_duplicates('pair_id').set_index('pair_id')
+    pairs_in_df1 = set(df1.index)
+    pairs_in_df2 = set(df2.index)
+    missing = len(pairs_in_df2 - pairs_in_df1) + len(pairs_in_df1 - pairs_in_df2)
+    common = list(pairs_in_df1 & pairs_in_df2)
+    amount1 = df1.loc[common, 'ccf_flow_amt'].to_numpy()
+    amount2 = df2.loc[common, 'ccf_flow_amt'].to_numpy()
+    pct = (amount2 - amount1) / np.abs(amount1) * 100
+    return {pair for pair, p in zip(common, pct) if abs(p) >= 10}, missing
+
+def analyze_with_codes(df):
+    result = analyze_variance_in_dataframe(df, 'sls_line_number', 'ccf_flow_amt', DATE1, DATE2, top_k=50)
+    return result["variance_page"]["total"], result["missing_pairs_page"]["total"]
+
+def measure(fn, df, repeat):
+    """Best wall time over `repeat` runs, then one traced run for the peak (tracing slows it down)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(df)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    result = fn(df)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Variance key handling: string pair ids vs int codes")
+    arg_parser.add_argument('--rows', type=int, default=1000000)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--output', help="Write results as JSON")
+    args = arg_parser.parse_args()
+
+    df = make_frame(args.rows)
+    categorical = df.copy()
+    for column in ('sls_line_number', 'context_name'):
+        categorical[column] = categorical[column].astype('category')
+
+    cases = [
+        ("strings", analyze_with_string_keys, df),
+        ("codes", analyze_with_codes, df),
+        ("codes+categorical", analyze_with_codes, categorical),
+    ]
+
+    results = []
+    outcomes = {}
+    print(f"{len(df):,} rows")
+    print(f"{'keys':<20} {'best s':>9} {'peak MiB':>10}")
+    for name, fn, frame in cases:
+        seconds, peak, outcome = measure(fn, frame, args.repeat)
+        outcomes[name] = outcome
+        results.append({"keys": name, "rows": len(df), "best_seconds": round(seconds, 4),
+                        "peak_mib": round(peak / 2 ** 20, 1)})
+        print(f"{name:<20} {seconds:>9.3f} {peak / 2 ** 20:>10.1f}")
+
+    # All variants must agree on what they found
+    string_variances, string_missing = outcomes["strings"]
+    assert outcomes["codes"] == outcomes["codes+categorical"] == (len(string_variances), string_missing)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    main()
@@ -12,3 +12,145 @@ class Config:
     IMPALA_COMMAND = "impala.sh"
     EOD_HOUR = 17  # 5 PM EST
     EOD_TIMEZONE = "America/New_York"
+
+    # Live 6G status feed
+    STATUS_WATCH_INTERVAL_SECONDS = int(os.environ.get('STATUS_WATCH_INTERVAL_SECONDS', 60))
+    STATUS_ETA_MOVE_MINUTES = int(os.environ.get('STATUS_ETA_MOVE_MINUTES', 5))
+    STATUS_SSE_KEEPALIVE_SECONDS = int(os.environ.get('STATUS_SSE_KEEPALIVE_SECONDS', 15))
+    STATUS_SUBSCRIBER_QUEUE_SIZE = int(os.environ.get('STATUS_SUBSCRIBER_QUEUE_SIZE', 100))
+    STATUS_WATCHER_IDLE_SECONDS = int(os.environ.get('STATUS_WATCHER_IDLE_SECONDS', 900))
+    STATUS_DELTA_POLLING = os.environ.get('STATUS_DELTA_POLLING', 'true').lower() == 'true'
+    STATUS_FULL_REFRESH_POLLS = int(os.environ.get('STATUS_FULL_REFRESH_POLLS', 30))
+    STATUS_DELTA_OVERLAP_SECONDS = int(os.environ.get('STATUS_DELTA_OVERLAP_SECONDS', 120))
+
+    # Oracle access ('oracledb' = python-oracledb thin mode, 'jdbc' = jaydebeapi fallback)
+    ORACLE_BACKEND = os.environ.get('ORACLE_BACKEND', 'oracledb')
+    ORACLE_FETCH_ARRAYSIZE = int(os.environ.get('ORACLE_FETCH_ARRAYSIZE', 1000))
+    ORACLE_POOL_MIN = int(os.environ.get('ORACLE_POOL_MIN', 1))
+    ORACLE_POOL_MAX = int(os.environ.get('ORACLE_POOL_MAX', 4))
+    ORACLE_USE_ARROW = os.environ.get('ORACLE_USE_ARROW', 'true').lower() == 'true'
+
+    # Start-up warm-up (runs before /health/ready reports ready)
+    WARMUP_ENABLED = os.environ.get('WARMUP_ENABLED', 'true').lower() == 'true'
+    WARMUP_STEPS = [step.strip() for step in
+                    os.environ.get('WARMUP_STEPS', 'config,pandas,oracle,openai_token,history').split(',')
+                    if step.strip()]
+    HISTORY_CACHE_SECONDS = int(os.environ.get('HISTORY_CACHE_SECONDS', 3600))
+
+    # Monte Carlo whole-batch ETA in get_6g_status (parallelism is estimated from history when possible)
+    BATCH_ETA_ENABLED = os.environ.get('BATCH_ETA_ENABLED', 'true').lower() == 'true'
+    BATCH_ETA_DRAWS = int(os.environ.get('BATCH_ETA_DRAWS', 5000))
+    BATCH_ETA_DEFAULT_PARALLELISM = int(os.environ.get('BATCH_ETA_DEFAULT_PARALLELISM', 4))
+
+    # Process pool for CPU-heavy stages (variance analysis, batch ETA); 0 runs them on the request thread
+    CPU_POOL_SIZE = int(os.environ.get('CPU_POOL_SIZE', 0))
+    CPU_POOL_START_METHOD = os.environ.get('CPU_POOL_START_METHOD', 'forkserver')
+
+    # Admission control: concurrent calls and wait-queue length per backend
+    ADMISSION_ENABLED = os.environ.get('ADMISSION_ENABLED', 'true').lower() == 'true'
+    ADMISSION_LIMITS = os.environ.get('ADMISSION_LIMITS', 'oracle=8:32,impala=4:16,yarn=2:8,openai=16:64,adjustments=4:16')
+    ADMISSION_DEFAULT_CONCURRENCY = int(os.environ.get('ADMISSION_DEFAULT_CONCURRENCY', 4))
+    ADMISSION_DEFAULT_QUEUE = int(os.environ.get('ADMISSION_DEFAULT_QUEUE', 16))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT_SECONDS', 30))
+
+    # Per-request time budget (chat requests) and per-dependency call timeouts, capped by the budget left
+    CHAT_DEADLINE_SECONDS = float(os.environ.get('CHAT_DEADLINE_SECONDS', 90))
+    OPENAI_TIMEOUT_SECONDS = float(os.environ.get('OPENAI_TIMEOUT_SECONDS', 60))
+    ORACLE_CALL_TIMEOUT_SECONDS = float(os.environ.get('ORACLE_CALL_TIMEOUT_SECONDS', 120))
+    IMPALA_QUERY_TIMEOUT_SECONDS = float(os.environ.get('IMPALA_QUERY_TIMEOUT_SECONDS', 600))
+    YARN_TIMEOUT_SECONDS = float(os.environ.get('YARN_TIMEOUT_SECONDS', 10))
+
+    # Circuit breakers per dependency: open after N consecutive failures, try again after the reset period
+    BREAKER_ENABLED = os.environ.get('BREAKER_ENABLED', 'true').lower() == 'true'
+    BREAKER_FAILURE_THRESHOLD = int(os.environ.get('BREAKER_FAILURE_THRESHOLD', 5))
+    BREAKER_RESET_SECONDS = float(os.environ.get('BREAKER_RESET_SECONDS', 30))
+
+    # Impala access for variance analysis
+    IMPALA_DSN = os.environ.get('IMPALA_DSN', 'DSN=IMPALA_LRI_DR')
+    IMPALA_CERT = os.environ.get('IMPALA_CERT', '/etc/security/certs/JPMCROOTCA.pem')
+    # 'stream' = chunked fetchmany + incremental aggregation, 'frame' = pd.read_sql_query
+    IMPALA_FETCH_MODE = os.environ.get('IMPALA_FETCH_MODE', 'stream')
+    IMPALA_CHUNK_SIZE = int(os.environ.get('IMPALA_CHUNK_SIZE', 50000))
+
+    # Local columnar cache of per-(sls_line, context) variance aggregates (needs pyarrow)
+    AGGREGATE_CACHE_ENABLED = os.environ.get('AGGREGATE_CACHE_ENABLED', 'true').lower() == 'true'
+    AGGREGATE_CACHE_DIR = os.environ.get('AGGREGATE_CACHE_DIR',
+                                         os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'aggregates'))
+
+    # Multi-date variance trend
+    VARIANCE_TREND_MAX_DATES = int(os.environ.get('VARIANCE_TREND_MAX_DATES', 45))
+
+    # Top-K variance output; the remainder is paged through a cursor store in SQLite shared by all workers
+    VARIANCE_TOP_K = int(os.environ.get('VARIANCE_TOP_K', 50))
+    RESULT_PAGE_SIZE = int(os.environ.get('RESULT_PAGE_SIZE', 50))
+    RESULT_PAGE_TTL_SECONDS = int(os.environ.get('RESULT_PAGE_TTL_SECONDS', 1800))
+    RESULT_PAGE_MAX_RESULTS = int(os.environ.get('RESULT_PAGE_MAX_RESULTS', 200))
+    RESULT_PAGE_DB_PATH = os.environ.get('RESULT_PAGE_DB_PATH',
+                                         os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'result_pages.sqlite3'))
+
+    # S3 listing (functions/s3_list.py)
+    S3_BUCKET = os.environ.get('S3_BUCKET', '')
+    S3_PREFIX = os.environ.get('S3_PREFIX', 'refined/reporting/')
+    S3_SAMPLE_LIMIT = int(os.environ.get('S3_SAMPLE_LIMIT', 5000))
+    S3_LIST_MAX_WORKERS = int(os.environ.get('S3_LIST_MAX_WORKERS', 16))
+    S3_SHARD_MAX_DEPTH = int(os.environ.get('S3_SHARD_MAX_DEPTH', 2))
+    S3_INVENTORY_DIR = os.environ.get('S3_INVENTORY_DIR',
+                                      os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 's3_inventory'))
+    S3_INVENTORY_MAX_AGE_SECONDS = int(os.environ.get('S3_INVENTORY_MAX_AGE_SECONDS', 3600))
+    S3_INVENTORY_RELIST_LATEST = int(os.environ.get('S3_INVENTORY_RELIST_LATEST', 2))
+    S3_INVENTORY_FULL_REFRESH_HOURS = int(os.environ.get('S3_INVENTORY_FULL_REFRESH_HOURS', 24))
+    S3_INVENTORY_WAIT_SECONDS = int(os.environ.get('S3_INVENTORY_WAIT_SECONDS', 20))
+    # S3 Inventory report (manifest.json or its folder, local or s3://); replaces listing when set
+    S3_INVENTORY_MANIFEST = os.environ.get('S3_INVENTORY_MANIFEST', '')
+    S3_INVENTORY_REPORT_ROOT = os.environ.get('S3_INVENTORY_REPORT_ROOT', '')
+    S3_INVENTORY_CHUNK_ROWS = int(os.environ.get('S3_INVENTORY_CHUNK_ROWS', 100000))
+
+    # Adjustments sync (functions/sync_adjustments.py)
+    ADJUSTMENTS_TOKEN_URL = os.environ.get('ADJUSTMENTS_TOKEN_URL',
+                                           'https://lri-limits-indicators-api.apps.prod.na-5y.gap.jpmchase.net/ida/getTokens')
+    ADJUSTMENTS_CALLBACK_URL = os.environ.get('ADJUSTMENTS_CALLBACK_URL',
+                                              'https://lri-adjustments-api.gaiacloud.jpmchase.net/api/v2/adjustments/dmatcallback')
+    ADJUSTMENTS_USER_SID = os.environ.get('ADJUSTMENTS_USER_SID', 'I792420')
+    ADJUSTMENTS_APP_ID = os.environ.get('ADJUSTMENTS_APP_ID', 'adj')
+    ADJUSTMENTS_BATCH_SIZE = int(os.environ.get('ADJUSTMENTS_BATCH_SIZE', 50))
+    ADJUSTMENTS_MAX_CONCURRENCY = int(os.environ.get('ADJUSTMENTS_MAX_CONCURRENCY', 4))
+    ADJUSTMENTS_MAX_RETRIES = int(os.environ.get('ADJUSTMENTS_MAX_RETRIES', 3))
+    ADJUSTMENTS_BACKOFF_SECONDS = float(os.environ.get('ADJUSTMENTS_BACKOFF_SECONDS', 0.5))
+    ADJUSTMENTS_TIMEOUT_SECONDS = float(os.environ.get('ADJUSTMENTS_TIMEOUT_SECONDS', 30))
+    ADJUSTMENTS_TOKEN_TTL_SECONDS = int(os.environ.get('ADJUSTMENTS_TOKEN_TTL_SECONDS', 900))
+
+    # Background jobs for long-running functions (services/job_queue.py)
+    JOB_QUEUE_ENABLED = os.environ.get('JOB_QUEUE_ENABLED', 'true').lower() == 'true'
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 4))
+    JOB_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', 100))
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+    JOB_RETENTION_HOURS = int(os.environ.get('JOB_RETENTION_HOURS', 72))
+    JOB_DB_PATH = os.environ.get('JOB_DB_PATH',
+                                 os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'jobs.sqlite3'))
+
+    # Server-side chat sessions keyed by conversation_id ('sqlite' = file shared by all workers,
+    # 'memory' = per-process LRU, only for a single-process server)
+    SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'sqlite')
+    SESSION_MAX_SESSIONS = int(os.environ.get('SESSION_MAX_SESSIONS', 1000))
+    SESSION_MAX_MESSAGES = int(os.environ.get('SESSION_MAX_MESSAGES', 40))
+    SESSION_TTL_SECONDS = int(os.environ.get('SESSION_TTL_SECONDS', 8 * 3600))
+    SESSION_DB_PATH = os.environ.get('SESSION_DB_PATH',
+                                     os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'sessions.sqlite3'))
+
+    # Cache of Azure OpenAI completions for identical requests (messages, function results, schemas, model)
+    COMPLETION_CACHE_ENABLED = os.environ.get('COMPLETION_CACHE_ENABLED', 'true').lower() == 'true'
+    COMPLETION_CACHE_TTL_SECONDS = int(os.environ.get('COMPLETION_CACHE_TTL_SECONDS', 600))
+    COMPLETION_CACHE_MAX_ENTRIES = int(os.environ.get('COMPLETION_CACHE_MAX_ENTRIES', 512))
+
+    # Response compression (negotiated from Accept-Encoding; 'br' needs the brotli package)
+    RESPONSE_COMPRESSION_ENABLED = os.environ.get('RESPONSE_COMPRESSION_ENABLED', 'true').lower() == 'true'
+    RESPONSE_COMPRESSION_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESSION_MIN_BYTES', 1024))
+    RESPONSE_GZIP_LEVEL = int(os.environ.get('RESPONSE_GZIP_LEVEL', 5))
+    RESPONSE_BROTLI_QUALITY = int(os.environ.get('RESPONSE_BROTLI_QUALITY', 4))
+
+    # Logging (utils/log.py): root level, 'text' or 'json', per-module overrides ('module=LEVEL,...')
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')
+    LOG_LEVELS = os.environ.get('LOG_LEVELS', 'urllib3=WARNING,azure=WARNING,openai=WARNING,httpx=WARNING')
+    LOG_PAYLOAD_MAX_CHARS = int(os.environ.get('LOG_PAYLOAD_MAX_CHARS', 2000))
+    LOG_SAMPLE_EVERY = int(os.environ.get('LOG_SAMPLE_EVERY', 100))
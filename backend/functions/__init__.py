@@ -4,3 +4,6 @@ from functions.time_remaining import *
 from functions.sls_details_variance import *
 from functions.get_6g_status import *
 from functions.sync_adjustments import *
+from functions.sls_variance_trend import *
+from functions.s3_list import *
+from functions.job_status import *
@@ -1,16 +1,28 @@
 # backend/functions/function_registry.py
 # Dictionary to store available functions
 _FUNCTION_REGISTRY = {}
+# Names of functions that run as background jobs instead of inside the chat request
+_LONG_RUNNING = set()
+# Names of functions that are safe to run again after being interrupted mid-way
+_IDEMPOTENT = set()
 
-def register_function(name, func):
+def register_function(name, func, long_running=False, idempotent=False):
     """
     Register a function in the registry.
     
     Args:
         name (str): Function name
         func (callable): Function implementation
+        long_running (bool): Submit calls to the job queue and answer with a job ID
+        idempotent (bool): Running it twice has no extra side effects, so a job
+            interrupted by a restart may be run again
     """
     _FUNCTION_REGISTRY[name] = func
+    for names, enabled in ((_LONG_RUNNING, long_running), (_IDEMPOTENT, idempotent)):
+        if enabled:
+            names.add(name)
+        else:
+            names.discard(name)
 
 def get_function(name):
     """
@@ -23,3 +35,27 @@ def get_function(name):
         callable: Function implementation or None if not found
     """
     return _FUNCTION_REGISTRY.get(name)
+
+def is_long_running(name):
+    """
+    Check whether a registered function runs as a background job.
+    
+    Args:
+        name (str): Function name
+        
+    Returns:
+        bool: True if the function was registered with long_running=True
+    """
+    return name in _LONG_RUNNING
+
+def is_idempotent(name):
+    """
+    Check whether a registered function may be re-run after an interruption.
+    
+    Args:
+        name (str): Function name
+        
+    Returns:
+        bool: True if the function was registered with idempotent=True
+    """
+    return name in _IDEMPOTENT
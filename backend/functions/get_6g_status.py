@@ -2,26 +2,46 @@
 import json
 import os
 import logging
-import jaydebeapi
 import traceback
 import pandas as pd
 import numpy as np
 import requests
+import time
+import threading
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from dateutil import parser
 from functions.function_registry import register_function
+from config import Config
+from utils.oracle_connector import get_oracle_backend
+from utils.log import summarize, sampled
+from services.cpu_pool import register_cpu_stage, run_cpu_stage
+from services.admission import admit
+from services.circuit_breaker import protect, call_with_fallback, get_breaker, CircuitOpen, UNAVAILABLE_ERRORS
+from services.deadline import timeout_for
 
 logger = logging.getLogger(__name__)
 
+# Parsed FR2052a configuration, re-read only when the file changes
+_config_cache = {"mtime": None, "config": None}
+
+# Historical runtime data keyed by (BPF IDs, days)
+_history_cache = {}
+_history_cache_lock = threading.Lock()
+
 # Load FR2052a configuration
 def load_config():
-    """Load FR2052a configuration from JSON file."""
+    """Load FR2052a configuration from JSON file (cached until the file is modified)."""
     try:
         config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
                                   'config', 'fr2052a_config.json')
-        with open(config_path, 'r') as config_file:
-            return json.load(config_file)
+        mtime = os.path.getmtime(config_path)
+        if _config_cache["config"] is None or _config_cache["mtime"] != mtime:
+            with open(config_path, 'r') as config_file:
+                _config_cache["config"] = json.load(config_file)
+                _config_cache["mtime"] = mtime
+        return _config_cache["config"]
     except Exception as e:
         logger.error(f"Error loading FR2052a configuration: {str(e)}")
         raise
@@ -108,15 +128,17 @@ def get_yarn_cluster_metrics():
         url = "https://bdtashr36n15.svr.us.jpmchase.net:8090/ws/v1/cluster/metrics"
         
         # Run curl command
-        result = subprocess.run(
-            ['curl', '-k', url],  # -k flag ignores SSL certificate verification
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if result.returncode != 0:
-            raise Exception(f"Curl failed with return code {result.returncode}")
+        with protect("yarn"), admit("yarn"):
+            timeout = timeout_for(Config.YARN_TIMEOUT_SECONDS)
+            result = subprocess.run(
+                ['curl', '-k', '--max-time', str(timeout), url],  # -k flag ignores SSL certificate verification
+                capture_output=True,
+                text=True,
+                timeout=timeout + 1
+            )
+            
+            if result.returncode != 0:
+                raise Exception(f"Curl failed with return code {result.returncode}")
         
         # Parse JSON response
         data = json.loads(result.stdout)
@@ -136,7 +158,7 @@ def get_yarn_cluster_metrics():
         # Check if cluster is overloaded
         is_overloaded = memory_utilization > 90 or cpu_utilization > 90
         
-        return {
+        yarn_metrics = {
             'memory_utilization': round(memory_utilization, 2),
             'cpu_utilization': round(cpu_utilization, 2),
             'is_overloaded': is_overloaded,
@@ -149,6 +171,19 @@ def get_yarn_cluster_metrics():
             'active_nodes': cluster_metrics.get('activeNodes', 0),
             'total_nodes': cluster_metrics.get('totalNodes', 0)
         }
+        get_breaker("yarn").remember("cluster_metrics", yarn_metrics)
+        return yarn_metrics
+    except CircuitOpen as e:
+        # Serve the last good reading while YARN is failing
+        yarn_metrics, age = get_breaker("yarn").last_good("cluster_metrics")
+        if yarn_metrics is not None:
+            return {**yarn_metrics, 'stale': True, 'snapshot_age_seconds': round(age)}
+        return {
+            'memory_utilization': 0,
+            'cpu_utilization': 0,
+            'is_overloaded': False,
+            'error': str(e)
+        }
     except subprocess.TimeoutExpired:
         logger.error("Timeout while fetching YARN metrics")
         return {
@@ -173,28 +208,37 @@ def get_yarn_cluster_metrics():
             'is_overloaded': False,
             'error': str(e)
         }
-def get_historical_runtime_data(bpf_ids, days=30):
-    """Get historical runtime data for the last N days."""
+def get_historical_runtime_data(bpf_ids, days=30, use_cache=True):
+    """
+    Get historical runtime data for the last N days.
+
+    Completed-run history only changes once per batch, so results are cached for
+    Config.HISTORY_CACHE_SECONDS. Empty results (query errors) are not cached.
+    Every caller gets its own copy, so it may modify the frame freely.
+    """
+    key = (tuple(sorted(bpf_ids)), days)
+    if use_cache:
+        with _history_cache_lock:
+            entry = _history_cache.get(key)
+        if entry and time.time() - entry[0] < Config.HISTORY_CACHE_SECONDS:
+            return entry[1].copy()
+    
+    df = query_historical_runtime_data(bpf_ids, days)
+    if not df.empty:
+        with _history_cache_lock:
+            _history_cache[key] = (time.time(), df.copy())
+    return df
+
+def query_historical_runtime_data(bpf_ids, days=30):
+    """Query historical runtime data for the last N days from Oracle."""
     try:
-        # Get database connection parameters
-        oracle_user = os.environ.get('ORACLE_USER')
-        oracle_password = os.environ.get('ORACLE_PASSWORD')
-        oracle_host = os.environ.get('ORACLE_HOST')
-        oracle_port = os.environ.get('ORACLE_PORT')
-        oracle_service_name = os.environ.get('ORACLE_SERVICE_NAME')
-        jdbc_driver_path = os.environ.get('JDBC_DRIVER_PATH', 'ojdbc8.jar')
-        jdbc_driver_class = "oracle.jdbc.driver.OracleDriver"
-        
-        # Create JDBC URL
-        jdbc_url = f"jdbc:oracle:thin:@{oracle_host}:{oracle_port}/{oracle_service_name}"
-        
         # Create BPF IDs string for SQL query
         bpf_ids_str = ", ".join([f"'{bpf_id}'" for bpf_id in bpf_ids])
         
         # SQL query for historical data
         query = f"""
         SELECT
-            bpf_id,
+            TO_CHAR(bpf_id) as bpf_id,
             bpf_name,
             cob_date,
             start_time,
@@ -234,32 +278,10 @@ def get_historical_runtime_data(bpf_ids, days=30):
         ORDER BY bpf_id, cob_date DESC
         """
         
-        # Connect to Oracle using jaydebeapi
-        connection = jaydebeapi.connect(
-            jdbc_driver_class,
-            jdbc_url,
-            [oracle_user, oracle_password],
-            jdbc_driver_path
-        )
-        
-        # Execute query
-        cursor = connection.cursor()
-        cursor.execute(query)
-        
-        # Fetch all data
-        data = cursor.fetchall()
-        
-        # Get column names from cursor description
-        column_names = [desc[0] for desc in cursor.description]
+        # Fetch straight into a DataFrame (Arrow when the backend supports it)
+        df = get_oracle_backend().fetch_dataframe(query)
         
-        # Close cursor and connection
-        cursor.close()
-        connection.close()
-        
-        # Convert to pandas DataFrame
-        df = pd.DataFrame(data, columns=column_names)
-        
-        # Convert data types
+        # Convert data types (BPF_ID is selected as text so Arrow never makes it a float)
         df['BPF_ID'] = df['BPF_ID'].astype(str)
         df['START_HOUR'] = df['START_HOUR'].astype(int)
         df['DAY_OF_WEEK'] = df['DAY_OF_WEEK'].astype(int)
@@ -280,6 +302,14 @@ def get_similar_days(day_of_week):
     else:  # Weekday
         return [2, 3, 4, 5, 6]
 
+def get_load_adjustment(table_bpf_id, cluster_metrics):
+    """Extra minutes a table is expected to need while the YARN cluster is overloaded."""
+    if not cluster_metrics.get('is_overloaded', False):
+        return 0
+    # Tables that typically run longer get more penalty
+    long_running_tables = ['6101', '6103', '6112', '6108']  # Inflow Asset, Inflow Secured, etc.
+    return 20 if table_bpf_id in long_running_tables else 10
+
 def predict_runtime_for_table(table_bpf_id, start_time, historical_data, cluster_metrics):
     """Predict runtime for a specific table using statistical approach."""
     try:
@@ -314,14 +344,7 @@ def predict_runtime_for_table(table_bpf_id, start_time, historical_data, cluster
         base_prediction = similar_runs['DURATION_MINUTES'].median()
         
         # Adjust for cluster load
-        adjustment = 0
-        if cluster_metrics.get('is_overloaded', False):
-            # Tables that typically run longer get more penalty
-            long_running_tables = ['6101', '6103', '6112', '6108']  # Inflow Asset, Inflow Secured, etc.
-            if table_bpf_id in long_running_tables:
-                adjustment = 20  # 20 minutes
-            else:
-                adjustment = 10  # 10 minutes
+        adjustment = get_load_adjustment(table_bpf_id, cluster_metrics)
         
         predicted_duration = base_prediction + adjustment
         
@@ -347,6 +370,130 @@ def predict_runtime_for_table(table_bpf_id, start_time, historical_data, cluster
             'adjustment_applied': 0
         }
 
+def estimate_parallelism(historical_data):
+    """
+    Typical number of 6G tables running at once: the median over COB dates of
+    the peak overlap of historical runs.
+    """
+    if historical_data.empty or 'START_TIME' not in historical_data:
+        return Config.BATCH_ETA_DEFAULT_PARALLELISM
+    peaks = []
+    for _, runs in historical_data.groupby('COB_DATE'):
+        starts = pd.to_datetime(runs['START_TIME']).to_numpy()
+        ends = pd.to_datetime(runs['END_TIME']).to_numpy()
+        # +1 at each start, -1 at each end; ends sort before starts at the same instant
+        times = np.concatenate([starts, ends])
+        steps = np.concatenate([np.ones(len(starts)), -np.ones(len(ends))])
+        order = np.lexsort((steps, times))
+        peaks.append(np.cumsum(steps[order]).max())
+    return max(int(np.median(peaks)), 1)
+
+def sample_remaining_minutes(durations, elapsed, draws, rng):
+    """
+    Draw remaining runtimes for one table from its empirical durations.
+
+    Running tables are conditioned on having already run `elapsed` minutes
+    (only longer historical runs are drawn). A table that has outlived every
+    historical run draws from the tail of its history instead: the excess of
+    the slowest 20% of runs over the 80th percentile.
+    """
+    if elapsed <= 0:
+        return rng.choice(durations, size=draws)
+    longer = durations[durations > elapsed]
+    if len(longer):
+        return rng.choice(longer, size=draws) - elapsed
+    tail = durations - np.quantile(durations, 0.8)
+    tail = tail[tail > 0]
+    if not len(tail):
+        tail = np.array([max(durations.max() * 0.1, 1.0)])
+    return rng.choice(tail, size=draws)
+
+def estimate_batch_eta(tables, historical_data, cluster_metrics, now=None, draws=None, parallelism=None, seed=None):
+    """
+    Monte Carlo estimate of when the whole 6G batch will be complete.
+
+    Every draw samples a runtime for each unfinished table from that table's
+    empirical history (same day type when there are at least 5 such runs),
+    conditioned on the elapsed time of running tables and shifted by the YARN
+    load adjustment. Running tables already hold a slot from now on, even when
+    more of them are running than `parallelism`; pending tables then start in
+    configuration order as soon as a slot frees up. All draws are simulated at once
+    with NumPy, one table at a time.
+
+    Args:
+        tables (list): Table entries of the status response (status, bpf_id, elapsed_minutes)
+        historical_data (pd.DataFrame): Historical runtime data
+        cluster_metrics (dict): Current YARN cluster metrics
+        now (datetime, optional): Reference time; defaults to now
+        draws (int, optional): Number of simulated batches; defaults to Config.BATCH_ETA_DRAWS
+        parallelism (int, optional): Concurrent tables; estimated from history when omitted
+        seed (int, optional): Random seed
+
+    Returns:
+        dict: P50/P90 completion times and remaining minutes, the table most
+              often finishing last and the simulation settings
+    """
+    now = now or datetime.now()
+    draws = draws or Config.BATCH_ETA_DRAWS
+    unfinished = [table for table in tables if table['status'] != 'COMPLETED']
+    if not unfinished:
+        return {"complete": True, "tables_remaining": 0}
+
+    rng = np.random.default_rng(seed)
+    parallelism = parallelism or estimate_parallelism(historical_data)
+    similar_days = get_similar_days(int(now.strftime('%w')) + 1)
+
+    def table_durations(bpf_id):
+        if historical_data.empty:
+            return np.array([20.0, 30.0, 40.0])  # same default as predict_runtime_for_table
+        history = historical_data[historical_data['BPF_ID'] == bpf_id]
+        similar = history[history['DAY_OF_WEEK'].isin(similar_days)]
+        history = similar if len(similar) >= 5 else history
+        durations = history['DURATION_MINUTES'].dropna().to_numpy(dtype=float)
+        return durations if len(durations) else np.array([20.0, 30.0, 40.0])
+
+    running = [table for table in unfinished if table['status'] == 'RUNNING']
+    pending = [table for table in unfinished if table['status'] != 'RUNNING']
+    finish = np.zeros((draws, len(unfinished)))
+
+    def sample(table, elapsed):
+        remaining = sample_remaining_minutes(table_durations(table['bpf_id']), elapsed, draws, rng)
+        return remaining + get_load_adjustment(table['bpf_id'], cluster_metrics)
+
+    # Minutes from now until each slot is free, per draw. Every running table
+    # started before now and holds its own slot until it finishes.
+    slots = np.zeros((draws, max(parallelism, len(running))))
+    for index, table in enumerate(running):
+        finish[:, index] = sample(table, table.get('elapsed_minutes') or 0)
+        slots[:, index] = finish[:, index]
+
+    for index, table in enumerate(pending, start=len(running)):
+        slot = np.argmin(slots, axis=1)
+        start = slots[np.arange(draws), slot]
+        finish[:, index] = start + sample(table, 0)
+        slots[np.arange(draws), slot] = finish[:, index]
+
+    batch_finish = finish.max(axis=1)
+    p50, p90 = np.percentile(batch_finish, [50, 90])
+    last = np.bincount(finish.argmax(axis=1), minlength=len(unfinished))
+    last_table = (running + pending)[int(last.argmax())]
+
+    return {
+        "complete": False,
+        "tables_remaining": len(unfinished),
+        "p50_remaining_minutes": round(float(p50), 1),
+        "p90_remaining_minutes": round(float(p90), 1),
+        "p50_completion_time": (now + timedelta(minutes=float(p50))).strftime('%Y-%m-%d %H:%M:%S'),
+        "p90_completion_time": (now + timedelta(minutes=float(p90))).strftime('%Y-%m-%d %H:%M:%S'),
+        "likely_last_table": {
+            "bpf_id": last_table['bpf_id'],
+            "name": last_table.get('name'),
+            "probability": round(float(last.max()) / draws, 2)
+        },
+        "parallelism": parallelism,
+        "draws": draws
+    }
+
 ####def generate_sql_query(config, cob_date, table_identifier=None, include_running=False):
 ####    """Generate SQL query based on configuration and parameters."""
 ####    try:
@@ -541,70 +688,246 @@ ORDER BY bpf_id, END_TIME DESC"""
     except Exception as e:
         logger.error(f"Error generating SQL query: {str(e)}")
         raise
+def generate_delta_sql_query(config, cob_date, since=None):
+    """
+    Generate the incremental status query for all tables.
+
+    Unlike generate_sql_query, the status / SLS-lock filter is not applied in SQL:
+    every run in the prelim-end window that started or ended at or after `since`
+    is returned, together with the window bounds, so the caller can apply the
+    same status condition to its cached rows. The MaxTimes LEFT JOIN guarantees
+    one row with the window bounds even when nothing changed.
+
+    Args:
+        config (dict): FR2052a configuration
+        cob_date (str): The COB date in MM-DD-YYYY format
+        since (str, optional): Watermark in 'YYYY-MM-DD HH:MM:SS'; None returns every run
+
+    Returns:
+        str: SQL query
+    """
+    try:
+        formatted_cob_date = format_date(cob_date)
+        
+        # Get process markers
+        prelim_marker = config['process_markers']['prelim_end']
+        sls_lock_marker = config['process_markers']['sls_lock_start']
+        sls_lock_run_types = ", ".join([f"'{run_type}'" for run_type in sls_lock_marker['run_type']])
+        
+        time_window_query = config['query_templates']['time_window'].format(
+            prelim_bpf_id=prelim_marker['bpf_id'],
+            prelim_process_id=prelim_marker['process_id'],
+            prelim_run_type=prelim_marker['run_type'],
+            sls_lock_bpf_id=sls_lock_marker['bpf_id'],
+            sls_lock_process_id=sls_lock_marker['process_id'],
+            sls_lock_run_types=sls_lock_run_types,
+            cob_date=formatted_cob_date
+        )
+        
+        # Only rows touched since the watermark
+        if since:
+            change_condition = f"""AND (START_TIME >= TO_DATE('{since}', 'YYYY-MM-DD HH24:MI:SS')
+         OR END_TIME >= TO_DATE('{since}', 'YYYY-MM-DD HH24:MI:SS'))"""
+        else:
+            change_condition = ""
+        
+        all_bpf_ids = ", ".join([f"'{table['bpf_id']}'" for table in config['tables']])
+        
+        query = f"""{time_window_query}
+SELECT m.max_end_time_prelim AS window_start, m.max_start_time_sls_lock AS window_end,
+       c.bpf_id, c.process_id, c.bpf_name, c.process_name, c.cob_date, c.status, c.start_time, c.end_time
+FROM MaxTimes m
+LEFT JOIN (
+  SELECT bpf_id, process_id, bpf_name, process_name, cob_date, status, start_time, end_time
+  FROM bpmdbo.v_bpf_run_instance_hist
+  WHERE bpf_id IN ({all_bpf_ids})
+    AND process_id = '10'
+    AND cob_date = TO_DATE('{formatted_cob_date}', 'DD-Mon-YYYY')
+    AND START_TIME >= (SELECT max_end_time_prelim FROM MaxTimes)
+    {change_condition}
+
+  UNION ALL
+
+  SELECT bpf_id, process_id, bpf_name, process_name, cob_date, status, start_time, end_time
+  FROM bpmdbo.v_bpf_run_instance
+  WHERE bpf_id IN ({all_bpf_ids})
+    AND process_id = '10'
+    AND cob_date = TO_DATE('{formatted_cob_date}', 'DD-Mon-YYYY')
+    AND START_TIME >= (SELECT max_end_time_prelim FROM MaxTimes)
+    {change_condition}
+) c ON 1 = 1"""
+        
+        return query
+    except Exception as e:
+        logger.error(f"Error generating delta SQL query: {str(e)}")
+        raise
 def execute_oracle_query(query):
     """Execute the Oracle query and return results."""
     try:
-        # Get database connection parameters from environment
-        oracle_user = os.environ.get('ORACLE_USER')
-        oracle_password = os.environ.get('ORACLE_PASSWORD')
-        oracle_host = os.environ.get('ORACLE_HOST')
-        oracle_port = os.environ.get('ORACLE_PORT')
-        oracle_service_name = os.environ.get('ORACLE_SERVICE_NAME')
-        
-        # Validate connection parameters
-        if not all([oracle_user, oracle_password, oracle_host, oracle_port, oracle_service_name]):
-            raise ValueError("Missing Oracle database connection parameters")
-        
-        # JDBC driver path and class
-        jdbc_driver_path = os.environ.get('JDBC_DRIVER_PATH', 'ojdbc8.jar')
-        jdbc_driver_class = "oracle.jdbc.driver.OracleDriver"
-        
-        # Create JDBC URL
-        jdbc_url = f"jdbc:oracle:thin:@{oracle_host}:{oracle_port}/{oracle_service_name}"
-        
-        logger.debug(f"JDBC URL: {jdbc_url}")
-        logger.debug(f"Executing Oracle query: {query}")
-        
-        # Connect to Oracle using jaydebeapi
-        connection = jaydebeapi.connect(
-            jdbc_driver_class,
-            jdbc_url,
-            [oracle_user, oracle_password],
-            jdbc_driver_path
-        )
+        # Backend (python-oracledb or JDBC) is selected by Config.ORACLE_BACKEND
+        backend = get_oracle_backend()
         
-        # Execute query
-        cursor = connection.cursor()
-        cursor.execute(query)
-        
-        # Fetch all data
-        data = cursor.fetchall()
-        
-        # Get column names from cursor description
-        column_names = [desc[0] for desc in cursor.description]
-        
-        # Close cursor and connection
-        cursor.close()
-        connection.close()
-        
-        # Convert to list of dictionaries
-        results = []
-        for row in data:
-            result_row = {}
-            for i, column in enumerate(column_names):
-                # Handle special data types (dates, etc.)
-                value = row[i]
-                if isinstance(value, (datetime,)):
-                    value = value.strftime('%Y-%m-%d %H:%M:%S')
-                result_row[column] = value
-            results.append(result_row)
-            
-        return results
+        logger.debug("Executing Oracle query via %s backend: %s", backend.name, summarize(query))
+        
+        return backend.fetch_dicts(query)
     except Exception as e:
         logger.error(f"Oracle error: {str(e)}")
         logger.error(traceback.format_exc())
         raise
 
+def _status_row_in_window(row, window_end):
+    """Apply the include_running status condition of generate_sql_query to a cached row."""
+    if row['STATUS'] == 'RUNNING':
+        return True
+    if row['STATUS'] == 'COMPLETED':
+        return window_end is None or (row['END_TIME'] is not None and str(row['END_TIME']) <= str(window_end))
+    return False
+
+def _order_status_rows(rows):
+    """Order rows like the status query: bpf_id, then END_TIME descending with NULLs first."""
+    ordered = sorted(rows, key=lambda r: (r['END_TIME'] is None, str(r['END_TIME'] or '')), reverse=True)
+    return sorted(ordered, key=lambda r: str(r['BPF_ID']))
+
+class IncrementalStatusEngine:
+    """
+    Keeps the per-COB-date BPF run state in memory and refreshes it with delta queries.
+
+    Each poll asks Oracle only for runs that started or ended since the last
+    watermark and merges them into the cached rows. The prelim-end / SLS-lock
+    window returned with every delta is re-applied to the cache, and a change
+    of the window start (a new prelim run) forces a full reload.
+    """
+
+    def __init__(self, execute_query=None, full_refresh_polls=None, overlap_seconds=None, max_dates=7):
+        self.execute_query = execute_query or execute_oracle_query
+        self.full_refresh_polls = full_refresh_polls or Config.STATUS_FULL_REFRESH_POLLS
+        self.overlap_seconds = Config.STATUS_DELTA_OVERLAP_SECONDS if overlap_seconds is None else overlap_seconds
+        self.max_dates = max_dates
+        self._states = OrderedDict()
+        self._date_locks = {}
+        self._lock = threading.Lock()
+
+    def _date_lock(self, cob_date):
+        with self._lock:
+            return self._date_locks.setdefault(cob_date, threading.Lock())
+
+    def _load(self, config, cob_date, since):
+        rows = self.execute_query(generate_delta_sql_query(config, cob_date, since))
+        if not rows:
+            return None, None, []
+        window_start = rows[0].get('WINDOW_START')
+        window_end = rows[0].get('WINDOW_END')
+        return window_start, window_end, [row for row in rows if row.get('BPF_ID') is not None]
+
+    def _since(self, watermark):
+        if not watermark:
+            return None
+        since = datetime.strptime(str(watermark)[:19], '%Y-%m-%d %H:%M:%S')
+        # Re-read a small overlap so rows committed late are not missed
+        return (since - timedelta(seconds=self.overlap_seconds)).strftime('%Y-%m-%d %H:%M:%S')
+
+    def fetch_rows(self, config, cob_date):
+        """
+        Get the current status rows for a COB date.
+
+        Args:
+            config (dict): FR2052a configuration
+            cob_date (str): The COB date in MM-DD-YYYY format
+
+        Returns:
+            list: Rows equivalent to generate_sql_query(..., include_running=True)
+        """
+        # Oracle round trips hold only this date's lock, so a slow query for one
+        # COB date does not stall polls for the others
+        with self._date_lock(cob_date):
+            with self._lock:
+                state = self._states.get(cob_date)
+            full_reload = state is None or state['polls'] >= self.full_refresh_polls
+
+            if not full_reload:
+                window_start, window_end, changed = self._load(config, cob_date, self._since(state['watermark']))
+                if str(window_start) != str(state['window_start']):
+                    logger.info(f"Prelim window moved for {cob_date}, reloading run state")
+                    full_reload = True
+                else:
+                    for row in changed:
+                        state['rows'][(str(row['BPF_ID']), row['PROCESS_ID'], row['START_TIME'])] = row
+                    state['window_end'] = window_end
+                    state['polls'] += 1
+                    logger.debug("Delta status poll for %s returned %d changed rows", cob_date, len(changed), extra=sampled())
+
+            if full_reload:
+                window_start, window_end, rows = self._load(config, cob_date, None)
+                state = {
+                    "rows": {(str(row['BPF_ID']), row['PROCESS_ID'], row['START_TIME']): row for row in rows},
+                    "window_start": window_start,
+                    "window_end": window_end,
+                    "watermark": None,
+                    "polls": 0
+                }
+                logger.debug("Full status load for %s returned %d rows", cob_date, len(rows))
+
+            # Advance the watermark to the latest START_TIME/END_TIME seen
+            timestamps = [str(t) for row in state['rows'].values()
+                          for t in (row['START_TIME'], row['END_TIME']) if t is not None]
+            if timestamps:
+                state['watermark'] = max(timestamps + ([str(state['watermark'])] if state['watermark'] else []))
+
+            with self._lock:
+                self._states[cob_date] = state
+                self._states.move_to_end(cob_date)
+                while len(self._states) > self.max_dates:
+                    # The evicted date's lock stays: another thread may hold it
+                    # right now, and a second lock would allow two loaders
+                    self._states.popitem(last=False)
+
+            visible = [row for row in state['rows'].values() if _status_row_in_window(row, state['window_end'])]
+            return _order_status_rows(visible)
+
+    def reset(self, cob_date=None):
+        """Drop cached state for one COB date, or for all dates."""
+        with self._lock:
+            if cob_date:
+                self._states.pop(cob_date, None)
+            else:
+                self._states.clear()
+
+_status_engine = None
+
+def get_status_engine():
+    """Get the shared incremental status engine."""
+    global _status_engine
+    if _status_engine is None:
+        _status_engine = IncrementalStatusEngine()
+    return _status_engine
+
+def fetch_status_rows(config, cob_date, table_identifier=None):
+    """
+    Get status rows (COMPLETED and RUNNING) for a COB date.
+
+    Uses the incremental engine when STATUS_DELTA_POLLING is enabled, otherwise
+    runs the full status query.
+
+    Args:
+        config (dict): FR2052a configuration
+        cob_date (str): The COB date in MM-DD-YYYY format
+        table_identifier (str, optional): Specific table name or BPF ID
+
+    Returns:
+        list: Status rows
+    """
+    if not Config.STATUS_DELTA_POLLING:
+        query = generate_sql_query(config, cob_date, table_identifier, include_running=True)
+        return execute_oracle_query(query)
+
+    rows = get_status_engine().fetch_rows(config, cob_date)
+    if table_identifier:
+        table = get_table_by_name_or_bpf(config, table_identifier)
+        if not table:
+            raise ValueError(f"Table not found: {table_identifier}")
+        rows = [row for row in rows if str(row['BPF_ID']) == table['bpf_id']]
+    return rows
+
 
 
 
@@ -779,6 +1102,169 @@ def execute_oracle_query(query):
 ###           "table_name": table_name
 ###       }
         
+def build_status_response(config, cob_date, results, historical_data, cluster_metrics):
+    """
+    Build the 6G status summary from status query rows.
+
+    Args:
+        config (dict): FR2052a configuration
+        cob_date (str): The COB date in MM-DD-YYYY format
+        results (list): Rows returned by the status query
+        historical_data (pd.DataFrame): Historical runtime data
+        cluster_metrics (dict): Current YARN cluster metrics
+
+    Returns:
+        dict: Status information for the 6G batch process
+    """
+    # Process results
+    tables_data = {}
+    tables_completed = 0
+    tables_running = 0
+    current_time = datetime.now()
+    
+    # First, process actual results from the database
+    for row in results:
+        bpf_id = str(row['BPF_ID'])
+        status = row['STATUS']
+        
+        # Find table name from BPF ID
+        table_info = next((t for t in config['tables'] if t['bpf_id'] == bpf_id), None)
+        if not table_info:
+            continue
+            
+        # Get start and end times
+        start_time = row['START_TIME']
+        end_time = row['END_TIME']
+        
+        # Parse start_time for predictions
+        if isinstance(start_time, str):
+            start_time_dt = datetime.strptime(start_time, '%Y-%m-%d %H:%M:%S')
+        else:
+            start_time_dt = start_time
+        
+        # Basic table data
+        table_data = {
+            "bpf_id": bpf_id,
+            "name": table_info['name'],
+            "status": status,
+            "process_name": row.get('PROCESS_NAME', ''),
+            "start_time": start_time,
+            "end_time": end_time
+        }
+        
+        if status == 'COMPLETED':
+            tables_completed += 1
+            # Calculate duration
+            if isinstance(start_time, str) and isinstance(end_time, str):
+                try:
+                    start_dt = datetime.strptime(start_time, '%Y-%m-%d %H:%M:%S')
+                    end_dt = datetime.strptime(end_time, '%Y-%m-%d %H:%M:%S')
+                    duration_minutes = round((end_dt - start_dt).total_seconds() / 60)
+                    table_data['duration_minutes'] = duration_minutes
+                except Exception as e:
+                    logger.warning(f"Could not calculate duration: {str(e)}")
+        
+        elif status == 'RUNNING':
+            tables_running += 1
+            # Calculate elapsed time
+            elapsed_minutes = round((current_time - start_time_dt).total_seconds() / 60)
+            table_data['elapsed_minutes'] = elapsed_minutes
+            
+            # Predict remaining time
+            if not historical_data.empty:
+                prediction = predict_runtime_for_table(
+                    bpf_id, start_time_dt, historical_data, cluster_metrics
+                )
+                
+                remaining_minutes = max(0, prediction['predicted_duration'] - elapsed_minutes)
+                estimated_completion = current_time + timedelta(minutes=remaining_minutes)
+                
+                table_data.update({
+                    'predicted_duration': round(prediction['predicted_duration'], 1),
+                    'estimated_remaining_minutes': round(remaining_minutes, 1),
+                    'estimated_completion_time': estimated_completion.strftime('%Y-%m-%d %H:%M:%S'),
+                    'prediction_confidence': prediction['confidence'],
+                    'prediction_range': f"{round(prediction['lower_bound'], 1)}-{round(prediction['upper_bound'], 1)} mins",
+                    'cluster_adjustment': prediction['adjustment_applied']
+                })
+        
+        # Store table data
+        tables_data[bpf_id] = table_data
+    
+    # Now, add information for tables that haven't started yet
+    for table_config in config['tables']:
+        bpf_id = table_config['bpf_id']
+        if bpf_id not in tables_data:
+            # This table hasn't started yet (PENDING)
+            table_data = {
+                "bpf_id": bpf_id,
+                "name": table_config['name'],
+                "status": "PENDING",
+                "process_name": "",
+                "start_time": None,
+                "end_time": None
+            }
+            
+            # Add historical statistics for pending tables
+            if not historical_data.empty:
+                table_history = historical_data[historical_data['BPF_ID'] == bpf_id]
+                if not table_history.empty:
+                    avg_duration = table_history['DURATION_MINUTES'].mean()
+                    median_duration = table_history['DURATION_MINUTES'].median()
+                    min_duration = table_history['DURATION_MINUTES'].min()
+                    max_duration = table_history['DURATION_MINUTES'].max()
+                    
+                    table_data.update({
+                        'historical_avg_duration': round(avg_duration, 1),
+                        'historical_median_duration': round(median_duration, 1),
+                        'historical_range': f"{round(min_duration, 1)}-{round(max_duration, 1)} mins",
+                        'historical_runs': len(table_history)
+                    })
+            
+            tables_data[bpf_id] = table_data
+    
+    # Calculate pending tables
+    tables_pending = len(config['tables']) - tables_completed - tables_running
+    
+    # Convert to list and sort by table ID
+    tables_list = list(tables_data.values())
+    tables_list.sort(key=lambda x: next((t['id'] for t in config['tables'] if t['bpf_id'] == x['bpf_id']), 999))
+    
+    # Add overall statistics
+    overall_stats = {}
+    if not historical_data.empty:
+        # Calculate average total runtime for all tables
+        daily_totals = historical_data.groupby('COB_DATE')['DURATION_MINUTES'].sum()
+        overall_stats = {
+            'avg_total_runtime': round(daily_totals.mean(), 1),
+            'median_total_runtime': round(daily_totals.median(), 1),
+            'min_total_runtime': round(daily_totals.min(), 1),
+            'max_total_runtime': round(daily_totals.max(), 1),
+            'historical_days': len(daily_totals)
+        }
+    
+    # Create summary
+    response = {
+        "success": True,
+        "cob_date": cob_date,
+        "process_name": config['process_name'],
+        "process_alias": config['process_alias'],
+        "tables_completed": tables_completed,
+        "tables_running": tables_running,
+        "tables_pending": tables_pending,
+        "total_tables": len(config['tables']),
+        "completion_percentage": round((tables_completed / len(config['tables'])) * 100),
+        "cluster_health": {
+            "memory_utilization": cluster_metrics.get('memory_utilization', 0),
+            "cpu_utilization": cluster_metrics.get('cpu_utilization', 0),
+            "is_overloaded": cluster_metrics.get('is_overloaded', False)
+        },
+        "overall_statistics": overall_stats,
+        "tables": tables_list
+    }
+    
+    return response
+
 def get_6g_status(cob_date, table_name=None):
     """
     Get the status of the FR2052a (6G) batch process for a specific date.
@@ -791,7 +1277,7 @@ def get_6g_status(cob_date, table_name=None):
         dict: Status information for the 6G batch process
     """
     try:
-        logger.info(f"Getting 6G status for COB date: {cob_date}, table: {table_name}")
+        logger.info("Getting 6G status for COB date: %s, table: %s", cob_date, table_name)
         
         # Load configuration
         config = load_config()
@@ -809,161 +1295,28 @@ def get_6g_status(cob_date, table_name=None):
             logger.warning(f"Failed to get YARN metrics: {str(e)}")
             cluster_metrics = {'is_overloaded': False, 'memory_utilization': 0, 'cpu_utilization': 0}
         
-        # Generate SQL query (include RUNNING tables)
-        query = generate_sql_query(config, cob_date, table_name, include_running=True)
+        # Get COMPLETED and RUNNING rows (incrementally when delta polling is on);
+        # the last good rows are served while the Oracle circuit is open
+        results, snapshot_age = call_with_fallback(
+            "oracle", ("status", cob_date, table_name), fetch_status_rows, config, cob_date, table_name)
         
-        # Execute query
-        results = execute_oracle_query(query)
+        # Build the status summary
+        response = build_status_response(config, cob_date, results, historical_data, cluster_metrics)
+        if snapshot_age is not None:
+            response["stale"] = True
+            response["snapshot_age_seconds"] = round(snapshot_age)
         
-        # Process results
-        tables_data = {}
-        tables_completed = 0
-        tables_running = 0
-        current_time = datetime.now()
-        
-        # First, process actual results from the database
-        for row in results:
-            bpf_id = str(row['BPF_ID'])
-            status = row['STATUS']
-            
-            # Find table name from BPF ID
-            table_info = next((t for t in config['tables'] if t['bpf_id'] == bpf_id), None)
-            if not table_info:
-                continue
-                
-            # Get start and end times
-            start_time = row['START_TIME']
-            end_time = row['END_TIME']
-            
-            # Parse start_time for predictions
-            if isinstance(start_time, str):
-                start_time_dt = datetime.strptime(start_time, '%Y-%m-%d %H:%M:%S')
-            else:
-                start_time_dt = start_time
-            
-            # Basic table data
-            table_data = {
-                "bpf_id": bpf_id,
-                "name": table_info['name'],
-                "status": status,
-                "process_name": row.get('PROCESS_NAME', ''),
-                "start_time": start_time,
-                "end_time": end_time
-            }
-            
-            if status == 'COMPLETED':
-                tables_completed += 1
-                # Calculate duration
-                if isinstance(start_time, str) and isinstance(end_time, str):
-                    try:
-                        start_dt = datetime.strptime(start_time, '%Y-%m-%d %H:%M:%S')
-                        end_dt = datetime.strptime(end_time, '%Y-%m-%d %H:%M:%S')
-                        duration_minutes = round((end_dt - start_dt).total_seconds() / 60)
-                        table_data['duration_minutes'] = duration_minutes
-                    except Exception as e:
-                        logger.warning(f"Could not calculate duration: {str(e)}")
-            
-            elif status == 'RUNNING':
-                tables_running += 1
-                # Calculate elapsed time
-                elapsed_minutes = round((current_time - start_time_dt).total_seconds() / 60)
-                table_data['elapsed_minutes'] = elapsed_minutes
-                
-                # Predict remaining time
-                if not historical_data.empty:
-                    prediction = predict_runtime_for_table(
-                        bpf_id, start_time_dt, historical_data, cluster_metrics
-                    )
-                    
-                    remaining_minutes = max(0, prediction['predicted_duration'] - elapsed_minutes)
-                    estimated_completion = current_time + timedelta(minutes=remaining_minutes)
-                    
-                    table_data.update({
-                        'predicted_duration': round(prediction['predicted_duration'], 1),
-                        'estimated_remaining_minutes': round(remaining_minutes, 1),
-                        'estimated_completion_time': estimated_completion.strftime('%Y-%m-%d %H:%M:%S'),
-                        'prediction_confidence': prediction['confidence'],
-                        'prediction_range': f"{round(prediction['lower_bound'], 1)}-{round(prediction['upper_bound'], 1)} mins",
-                        'cluster_adjustment': prediction['adjustment_applied']
-                    })
-            
-            # Store table data
-            tables_data[bpf_id] = table_data
-        
-        # Now, add information for tables that haven't started yet
-        for table_config in config['tables']:
-            bpf_id = table_config['bpf_id']
-            if bpf_id not in tables_data:
-                # This table hasn't started yet (PENDING)
-                table_data = {
-                    "bpf_id": bpf_id,
-                    "name": table_config['name'],
-                    "status": "PENDING",
-                    "process_name": "",
-                    "start_time": None,
-                    "end_time": None
-                }
-                
-                # Add historical statistics for pending tables
-                if not historical_data.empty:
-                    table_history = historical_data[historical_data['BPF_ID'] == bpf_id]
-                    if not table_history.empty:
-                        avg_duration = table_history['DURATION_MINUTES'].mean()
-                        median_duration = table_history['DURATION_MINUTES'].median()
-                        min_duration = table_history['DURATION_MINUTES'].min()
-                        max_duration = table_history['DURATION_MINUTES'].max()
-                        
-                        table_data.update({
-                            'historical_avg_duration': round(avg_duration, 1),
-                            'historical_median_duration': round(median_duration, 1),
-                            'historical_range': f"{round(min_duration, 1)}-{round(max_duration, 1)} mins",
-                            'historical_runs': len(table_history)
-                        })
-                
-                tables_data[bpf_id] = table_data
-        
-        # Calculate pending tables
-        tables_pending = len(config['tables']) - tables_completed - tables_running
-        
-        # Convert to list and sort by table ID
-        tables_list = list(tables_data.values())
-        tables_list.sort(key=lambda x: next((t['id'] for t in config['tables'] if t['bpf_id'] == x['bpf_id']), 999))
-        
-        # Add overall statistics
-        overall_stats = {}
-        if not historical_data.empty:
-            # Calculate average total runtime for all tables
-            daily_totals = historical_data.groupby('COB_DATE')['DURATION_MINUTES'].sum()
-            overall_stats = {
-                'avg_total_runtime': round(daily_totals.mean(), 1),
-                'median_total_runtime': round(daily_totals.median(), 1),
-                'min_total_runtime': round(daily_totals.min(), 1),
-                'max_total_runtime': round(daily_totals.max(), 1),
-                'historical_days': len(daily_totals)
-            }
-        
-        # Create summary
-        response = {
-            "success": True,
-            "cob_date": cob_date,
-            "process_name": config['process_name'],
-            "process_alias": config['process_alias'],
-            "tables_completed": tables_completed,
-            "tables_running": tables_running,
-            "tables_pending": tables_pending,
-            "total_tables": len(config['tables']),
-            "completion_percentage": round((tables_completed / len(config['tables'])) * 100),
-            "cluster_health": {
-                "memory_utilization": cluster_metrics.get('memory_utilization', 0),
-                "cpu_utilization": cluster_metrics.get('cpu_utilization', 0),
-                "is_overloaded": cluster_metrics.get('is_overloaded', False)
-            },
-            "overall_statistics": overall_stats,
-            "tables": tables_list
-        }
+        # Whole-batch ETA (only meaningful when every table was queried)
+        if Config.BATCH_ETA_ENABLED and not table_name:
+            try:
+                response["batch_eta"] = run_cpu_stage("batch_eta", response["tables"], historical_data, cluster_metrics)
+            except Exception as e:
+                logger.warning(f"Failed to estimate batch ETA: {str(e)}")
         
         return response
         
+    except UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         logger.error(f"Error in get_6g_status: {str(e)}")
         logger.error(traceback.format_exc())
@@ -975,4 +1328,5 @@ def get_6g_status(cob_date, table_name=None):
         }        
 
 # Register the function
-register_function("get_6g_status", get_6g_status)
\ No newline at end of file
+register_function("get_6g_status", get_6g_status)
+register_cpu_stage("batch_eta", estimate_batch_eta)
\ No newline at end of file
@@ -0,0 +1,39 @@
+# backend/functions/job_status.py
+import logging
+import traceback
+from functions.function_registry import register_function
+from services.job_queue import get_job_queue
+
+logger = logging.getLogger(__name__)
+
+def job_status(job_id):
+    """
+    Get the status of a background job and, once it has finished, its result.
+    
+    Args:
+        job_id (str): Job ID returned when a long-running function was started
+        
+    Returns:
+        dict: The job's status, timestamps and result (None while it is pending)
+    """
+    try:
+        job = get_job_queue().get_job(job_id.strip(), include_result=True)
+        if job is None:
+            return {
+                "success": False,
+                "error": f"Unknown job ID: {job_id}"
+            }
+        return {
+            "success": True,
+            **job
+        }
+    except Exception as e:
+        logger.error(f"Error in job_status: {str(e)}")
+        logger.error(traceback.format_exc())
+        return {
+            "success": False,
+            "error": f"An unexpected error occurred: {str(e)}"
+        }
+
+# Register the function
+register_function("job_status", job_status)
@@ -1,50 +1,693 @@
-import boto3
+# backend/functions/s3_list.py
+import os
+import json
+import time
 import random
+import gzip
+import hashlib
+import logging
+import argparse
+import threading
+import tempfile
+import traceback
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from urllib.parse import unquote_plus
+from concurrent.futures import ThreadPoolExecutor
+from functions.function_registry import register_function
+from utils.result_pages import take_top_k
+from config import Config
 
-bucket_name = "<bucket_id>"
-prefix = "refined/reporting/"
-sample_limit = 5000  # How many real files to sample
-
-s3 = boto3.client('s3')
-paginator = s3.get_paginator('list_objects_v2')
-
-sample_sizes = []
-total_file_count = 0
-
-print(f"Scanning all objects under s3://{bucket_name}/{prefix}")
-
-for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
-    for obj in page.get('Contents', []):
-        key = obj['Key']
-        size = obj['Size']
-
-        # Skip folder-like placeholders
-        if key.endswith('/') or size == 0:
-            continue
-
-        # Count every real file
-        total_file_count += 1
-
-        # Sampling (randomized or first N)
-        if len(sample_sizes) < sample_limit:
-            sample_sizes.append(size)
-        else:
-            # Reservoir sampling for better randomness
-            i = random.randint(0, total_file_count - 1)
-            if i < sample_limit:
-                sample_sizes[i] = size
-
-# Estimate
-if sample_sizes:
-    avg_sample_size = sum(sample_sizes) / len(sample_sizes)
-    estimated_total_bytes = avg_sample_size * total_file_count
-    estimated_total_tb = estimated_total_bytes / (1024 ** 4)
-
-    print("\n=== Results ===")
-    print(f"Sample size: {len(sample_sizes)}")
-    print(f"Total real file count: {total_file_count}")
-    print(f"Avg file size (sample): {avg_sample_size:.2f} bytes")
-    print(f"Estimated total size: {estimated_total_bytes:.2f} bytes ({estimated_total_tb:.3f} TB)")
-else:
-    print("No real files found.")
+logger = logging.getLogger(__name__)
 
+def get_s3_client():
+    """Create a boto3 S3 client (boto3 is only needed when S3 is actually used)."""
+    import boto3
+    return boto3.client('s3')
+
+def iter_list_pages(s3, bucket, prefix, delimiter=None, start_after=None):
+    """
+    Yield list_objects_v2 response pages, following continuation tokens.
+
+    Args:
+        s3: boto3 S3 client (or anything with the same list_objects_v2)
+        bucket (str): Bucket name
+        prefix (str): Key prefix
+        delimiter (str, optional): '/' to group keys into CommonPrefixes
+        start_after (str, optional): Only list keys after this key
+    """
+    kwargs = {"Bucket": bucket, "Prefix": prefix}
+    if delimiter:
+        kwargs["Delimiter"] = delimiter
+    if start_after:
+        kwargs["StartAfter"] = start_after
+    while True:
+        page = s3.list_objects_v2(**kwargs)
+        yield page
+        if not page.get('IsTruncated'):
+            break
+        kwargs["ContinuationToken"] = page['NextContinuationToken']
+
+def new_listing_stats():
+    return {"count": 0, "total_bytes": 0, "sample": []}
+
+def add_object(stats, size, sample_limit, rng):
+    """Count one real file and keep a reservoir sample of sizes."""
+    stats["count"] += 1
+    stats["total_bytes"] += size
+    if len(stats["sample"]) < sample_limit:
+        stats["sample"].append(size)
+    else:
+        # Reservoir sampling for better randomness
+        i = rng.randint(0, stats["count"] - 1)
+        if i < sample_limit:
+            stats["sample"][i] = size
+
+def is_real_file(obj):
+    """Skip folder-like placeholders."""
+    return not obj['Key'].endswith('/') and obj['Size'] > 0
+
+def scan_prefix(s3, bucket, prefix, sample_limit, seed=None):
+    """
+    List every object under a prefix and return its listing stats.
+
+    Returns:
+        dict: count, total_bytes and a reservoir sample of at most sample_limit sizes
+    """
+    rng = random.Random(seed)
+    stats = new_listing_stats()
+    for page in iter_list_pages(s3, bucket, prefix):
+        for obj in page.get('Contents', []):
+            if is_real_file(obj):
+                add_object(stats, obj['Size'], sample_limit, rng)
+    return stats
+
+def discover_shards(s3, bucket, prefix, min_shards, max_depth, sample_limit, seed=None):
+    """
+    Split a prefix into sub-prefixes with Delimiter='/'.
+
+    Levels are expanded until there are at least min_shards prefixes or
+    max_depth is reached. Objects sitting directly at an expanded level are
+    counted here, so the shards plus these stats cover every key exactly once.
+
+    Returns:
+        tuple: (list of shard prefixes, listing stats of the objects found while discovering)
+    """
+    rng = random.Random(seed)
+    direct = new_listing_stats()
+    shards = [prefix]
+    for _ in range(max_depth):
+        if len(shards) >= min_shards:
+            break
+        expanded = []
+        for shard in shards:
+            for page in iter_list_pages(s3, bucket, shard, delimiter='/'):
+                expanded.extend(common['Prefix'] for common in page.get('CommonPrefixes', []))
+                for obj in page.get('Contents', []):
+                    if is_real_file(obj):
+                        add_object(direct, obj['Size'], sample_limit, rng)
+        shards = expanded
+        if not shards:
+            break
+    return shards, direct
+
+def merge_listing_stats(parts, sample_limit, seed=None):
+    """
+    Merge per-shard listing stats into one.
+
+    Counts and bytes add up. Each shard's reservoir is a uniform sample of its
+    own objects, so the merged sample draws how many sizes come from each shard
+    with a multivariate hypergeometric over the shard counts, then picks that
+    many from the shard's reservoir - a uniform sample of all objects.
+    """
+    merged = new_listing_stats()
+    parts = [part for part in parts if part["count"]]
+    if not parts:
+        return merged
+    merged["count"] = sum(part["count"] for part in parts)
+    merged["total_bytes"] = sum(part["total_bytes"] for part in parts)
+    if merged["count"] <= sample_limit:
+        merged["sample"] = [size for part in parts for size in part["sample"]]
+        return merged
+
+    rng = np.random.default_rng(seed)
+    draws = rng.multivariate_hypergeometric([part["count"] for part in parts], sample_limit)
+    for part, draw in zip(parts, draws):
+        picked = rng.choice(len(part["sample"]), size=int(draw), replace=False)
+        merged["sample"].extend(part["sample"][i] for i in picked)
+    return merged
+
+def list_s3_stats(bucket=None, prefix=None, max_workers=None, sample_limit=None, s3=None, seed=None):
+    """
+    Count the files under an S3 prefix and estimate their size from a reservoir sample.
+
+    Sub-prefixes are discovered with Delimiter='/' and listed concurrently on a
+    thread pool of max_workers, instead of one serial paginator over everything.
+
+    Args:
+        bucket (str, optional): Bucket name; defaults to Config.S3_BUCKET
+        prefix (str, optional): Key prefix; defaults to Config.S3_PREFIX
+        max_workers (int, optional): Concurrent shard listings; defaults to Config.S3_LIST_MAX_WORKERS
+        sample_limit (int, optional): Reservoir sample size; defaults to Config.S3_SAMPLE_LIMIT
+        s3 (optional): S3 client; one is created when not given
+        seed (int, optional): Seed for reproducible sampling
+
+    Returns:
+        dict: File count, exact and estimated total size, sample statistics and listing timings
+    """
+    bucket = bucket or Config.S3_BUCKET
+    prefix = Config.S3_PREFIX if prefix is None else prefix
+    max_workers = max_workers or Config.S3_LIST_MAX_WORKERS
+    sample_limit = sample_limit or Config.S3_SAMPLE_LIMIT
+    s3 = s3 or get_s3_client()
+    start = time.perf_counter()
+
+    if max_workers > 1:
+        shards, direct = discover_shards(s3, bucket, prefix, max_workers * 4,
+                                         Config.S3_SHARD_MAX_DEPTH, sample_limit, seed)
+    else:
+        shards, direct = [prefix], new_listing_stats()
+
+    logger.info(f"Listing s3://{bucket}/{prefix} in {len(shards)} shard(s) with {max_workers} worker(s)")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        parts = list(executor.map(
+            lambda item: scan_prefix(s3, bucket, item[1], sample_limit,
+                                     None if seed is None else seed + item[0] + 1),
+            enumerate(shards)))
+
+    stats = merge_listing_stats([direct] + parts, sample_limit, seed)
+    return summarize_listing(bucket, prefix, stats, shards=len(shards),
+                             seconds=time.perf_counter() - start)
+
+def summarize_listing(bucket, prefix, stats, **extra):
+    """Turn listing stats into the result dict (with the sample-based size estimate)."""
+    result = {
+        "bucket": bucket,
+        "prefix": prefix,
+        "total_file_count": stats["count"],
+        "total_bytes": stats["total_bytes"],
+        "sample_size": len(stats["sample"]),
+        "avg_sample_size": None,
+        "estimated_total_bytes": None,
+        "estimated_total_tb": None
+    }
+    if stats["sample"]:
+        avg_sample_size = sum(stats["sample"]) / len(stats["sample"])
+        estimated_total_bytes = avg_sample_size * stats["count"]
+        result.update({
+            "avg_sample_size": avg_sample_size,
+            "estimated_total_bytes": estimated_total_bytes,
+            "estimated_total_tb": estimated_total_bytes / (1024 ** 4)
+        })
+    for key, value in extra.items():
+        result[key] = round(value, 3) if isinstance(value, float) else value
+    return result
+
+# Persisted inventory snapshots: exact per-partition stats, refreshed incrementally
+
+_refresh_lock = threading.Lock()
+_refresh_threads = {}
+
+def snapshot_path(bucket, prefix):
+    name = hashlib.sha1(f"{bucket}/{prefix}".encode()).hexdigest()[:16]
+    return os.path.join(Config.S3_INVENTORY_DIR, f"{name}.json")
+
+def load_snapshot(bucket, prefix):
+    """Load the persisted inventory snapshot of a prefix, or None."""
+    path = snapshot_path(bucket, prefix)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as snapshot_file:
+            return json.load(snapshot_file)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable inventory snapshot {path}: {str(e)}")
+        return None
+
+def save_snapshot(snapshot):
+    path = snapshot_path(snapshot["bucket"], snapshot["prefix"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as snapshot_file:
+        json.dump(snapshot, snapshot_file, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def _last_modified(obj):
+    value = obj.get('LastModified')
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value or '')
+
+def scan_partition(s3, bucket, partition, delimiter=None):
+    """Exact count, bytes and max LastModified of the files under one partition prefix."""
+    stats = {"count": 0, "total_bytes": 0, "max_last_modified": None}
+    for page in iter_list_pages(s3, bucket, partition, delimiter=delimiter):
+        for obj in page.get('Contents', []):
+            if is_real_file(obj):
+                stats["count"] += 1
+                stats["total_bytes"] += obj['Size']
+                last_modified = _last_modified(obj)
+                if stats["max_last_modified"] is None or last_modified > stats["max_last_modified"]:
+                    stats["max_last_modified"] = last_modified
+    return stats
+
+def discover_partitions(s3, bucket, prefix, start_after=None):
+    """Partition prefixes directly under prefix (from start_after on, if given)."""
+    partitions = []
+    for page in iter_list_pages(s3, bucket, prefix, delimiter='/', start_after=start_after):
+        partitions.extend(common['Prefix'] for common in page.get('CommonPrefixes', []))
+    return partitions
+
+def refresh_inventory(bucket=None, prefix=None, full_refresh=False, max_workers=None, s3=None):
+    """
+    Bring the inventory snapshot of a prefix up to date and persist it.
+
+    A full refresh lists every partition (and drops deleted ones). Otherwise only
+    partitions after the last known one are discovered (StartAfter on the
+    partition keys), and those plus the latest S3_INVENTORY_RELIST_LATEST known
+    partitions are re-listed; older partitions are taken from the snapshot.
+    Files directly under the prefix are only re-counted by a full refresh.
+    With S3_INVENTORY_MANIFEST set, the snapshot is rebuilt from the latest
+    S3 Inventory report instead of listing.
+
+    Returns:
+        dict: The updated snapshot
+    """
+    bucket = bucket or Config.S3_BUCKET
+    prefix = Config.S3_PREFIX if prefix is None else prefix
+    if Config.S3_INVENTORY_MANIFEST:
+        return refresh_inventory_from_report(bucket, prefix, Config.S3_INVENTORY_MANIFEST, max_workers, s3)
+    max_workers = max_workers or Config.S3_LIST_MAX_WORKERS
+    s3 = s3 or get_s3_client()
+    start = time.perf_counter()
+
+    snapshot = None if full_refresh else load_snapshot(bucket, prefix)
+    if snapshot and time.time() - snapshot.get("full_refresh_at", 0) > Config.S3_INVENTORY_FULL_REFRESH_HOURS * 3600:
+        snapshot = None
+
+    if snapshot is None:
+        mode = "full"
+        partitions = discover_partitions(s3, bucket, prefix)
+        known = {}
+        to_list = [prefix] + partitions
+    else:
+        mode = "incremental"
+        known = snapshot["partitions"]
+        ordered = sorted(name for name in known if name != prefix)
+        new_partitions = discover_partitions(s3, bucket, prefix, start_after=ordered[-1] if ordered else None)
+        to_list = sorted(set(new_partitions) | set(ordered[-Config.S3_INVENTORY_RELIST_LATEST:]))
+
+    logger.info(f"Inventory refresh ({mode}) of s3://{bucket}/{prefix}: listing {len(to_list)} partition(s)")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # The prefix itself only counts the files directly under it
+        listed = dict(zip(to_list, executor.map(
+            lambda partition: scan_partition(s3, bucket, partition, '/' if partition == prefix else None),
+            to_list)))
+
+    now = time.time()
+    partitions = dict(known)
+    for name, stats in listed.items():
+        stats["listed_at"] = now
+        partitions[name] = stats
+
+    snapshot = {
+        "bucket": bucket,
+        "prefix": prefix,
+        "partitions": partitions,
+        "updated_at": now,
+        "full_refresh_at": now if mode == "full" else snapshot["full_refresh_at"],
+        "last_refresh": {
+            "mode": mode,
+            "partitions_listed": len(to_list),
+            "new_partitions": len([name for name in listed if name not in known]),
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+    }
+    save_snapshot(snapshot)
+    return snapshot
+
+# S3 Inventory reports: manifest.json plus gzipped CSV or Parquet data files
+
+# Normalized inventory field name -> column name used while aggregating
+INVENTORY_FIELDS = {
+    "key": "key",
+    "size": "size",
+    "lastmodifieddate": "last_modified",
+    "islatest": "is_latest",
+    "isdeletemarker": "is_delete_marker"
+}
+
+def _inventory_field(name):
+    return INVENTORY_FIELDS.get(name.strip().lower().replace('_', ''))
+
+def _split_s3_url(url):
+    bucket, _, key = url[len("s3://"):].partition('/')
+    return bucket, key
+
+def find_latest_manifest(location, s3=None):
+    """
+    Resolve a manifest location to one manifest.json.
+
+    Accepts a manifest.json path or the inventory configuration's folder (the
+    one holding the dated YYYY-MM-DDTHH-MMZ/ folders), locally or as s3://...,
+    in which case the most recent dated manifest is used.
+    """
+    if location.endswith("manifest.json"):
+        return location
+    if location.startswith("s3://"):
+        s3 = s3 or get_s3_client()
+        bucket, prefix = _split_s3_url(location.rstrip('/') + '/')
+        dated = [p for p in discover_partitions(s3, bucket, prefix) if p.rstrip('/').split('/')[-1][:1].isdigit()]
+        if not dated:
+            raise FileNotFoundError(f"No inventory reports under {location}")
+        return f"s3://{bucket}/{max(dated)}manifest.json"
+    dated = sorted(name for name in os.listdir(location)
+                   if os.path.exists(os.path.join(location, name, "manifest.json")))
+    if not dated:
+        raise FileNotFoundError(f"No inventory reports under {location}")
+    return os.path.join(location, dated[-1], "manifest.json")
+
+def load_manifest(manifest_location, s3=None):
+    if manifest_location.startswith("s3://"):
+        s3 = s3 or get_s3_client()
+        bucket, key = _split_s3_url(manifest_location)
+        return json.loads(s3.get_object(Bucket=bucket, Key=key)['Body'].read())
+    with open(manifest_location) as manifest_file:
+        return json.load(manifest_file)
+
+def open_inventory_file(manifest, manifest_location, file_key, s3=None, seekable=False):
+    """
+    Open one inventory data file as a binary stream.
+
+    Local reports are looked up under S3_INVENTORY_REPORT_ROOT (a local copy of
+    the destination bucket) or in the data/ folder of the inventory configuration
+    next to the manifest. S3 bodies are streamed;
+    a seekable copy (for Parquet) is spooled to a temporary file.
+    """
+    if manifest_location.startswith("s3://"):
+        s3 = s3 or get_s3_client()
+        bucket = manifest["destinationBucket"].split(':::')[-1]
+        body = s3.get_object(Bucket=bucket, Key=file_key)['Body']
+        if not seekable:
+            return body
+        spooled = tempfile.TemporaryFile()
+        for block in iter(lambda: body.read(1 << 20), b''):
+            spooled.write(block)
+        spooled.seek(0)
+        return spooled
+
+    # S3 writes <config>/<date>/manifest.json and <config>/data/<file>
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_location))
+    file_name = os.path.basename(file_key)
+    candidates = [os.path.join(Config.S3_INVENTORY_REPORT_ROOT, file_key)] if Config.S3_INVENTORY_REPORT_ROOT else []
+    candidates += [os.path.join(os.path.dirname(manifest_dir), "data", file_name),
+                   os.path.join(manifest_dir, "data", file_name)]
+    for path in candidates:
+        if os.path.exists(path):
+            return open(path, 'rb')
+    raise FileNotFoundError(f"Inventory data file not found: {file_key}")
+
+def iter_inventory_chunks(manifest, manifest_location, file_key, s3=None, chunk_rows=None):
+    """
+    Yield one inventory data file as DataFrames of at most chunk_rows rows.
+
+    Columns are normalized to key, size, last_modified (and is_latest /
+    is_delete_marker when present). CSV keys are URL-decoded.
+    """
+    chunk_rows = chunk_rows or Config.S3_INVENTORY_CHUNK_ROWS
+    file_format = manifest.get("fileFormat", "CSV").upper()
+
+    if file_format == "CSV":
+        names = [name.strip() for name in manifest["fileSchema"].split(',')]
+        wanted = {name: _inventory_field(name) for name in names if _inventory_field(name)}
+        with open_inventory_file(manifest, manifest_location, file_key, s3) as raw:
+            with gzip.GzipFile(fileobj=raw) as stream:
+                for chunk in pd.read_csv(stream, header=None, names=names, usecols=list(wanted),
+                                         dtype=str, keep_default_na=False, chunksize=chunk_rows):
+                    chunk = chunk.rename(columns=wanted)
+                    encoded = chunk['key'].str.contains('[%+]', regex=True)
+                    if encoded.any():
+                        chunk.loc[encoded, 'key'] = chunk.loc[encoded, 'key'].map(unquote_plus)
+                    yield chunk
+    elif file_format == "PARQUET":
+        import pyarrow.parquet as pq
+        with open_inventory_file(manifest, manifest_location, file_key, s3, seekable=True) as raw:
+            parquet_file = pq.ParquetFile(raw)
+            wanted = {name: _inventory_field(name) for name in parquet_file.schema_arrow.names
+                      if _inventory_field(name)}
+            for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=list(wanted)):
+                yield batch.to_pandas().rename(columns=wanted)
+    else:
+        raise ValueError(f"Unsupported inventory file format: {file_format}")
+
+def aggregate_inventory_chunk(chunk, prefix, partitions):
+    """Fold one chunk of inventory rows into per-partition count, bytes and max LastModified."""
+    keys = chunk['key'].astype(str)
+    sizes = pd.to_numeric(chunk['size'], errors='coerce').fillna(0)
+    mask = keys.str.startswith(prefix) & ~keys.str.endswith('/') & (sizes > 0)
+    # Versioned buckets: count only current versions
+    if 'is_latest' in chunk:
+        mask &= chunk['is_latest'].astype(str).str.lower() == 'true'
+    if 'is_delete_marker' in chunk:
+        mask &= chunk['is_delete_marker'].astype(str).str.lower() != 'true'
+    if not mask.any():
+        return
+
+    sub_prefix = keys[mask].str.slice(len(prefix)).str.extract(r'^([^/]*/)', expand=False)
+    frame = pd.DataFrame({
+        "partition": (prefix + sub_prefix).fillna(prefix),
+        "size": sizes[mask].astype('int64'),
+        "last_modified": pd.to_datetime(chunk.loc[mask, 'last_modified'], utc=True, errors='coerce')
+        if 'last_modified' in chunk else pd.NaT
+    })
+    grouped = frame.groupby('partition').agg(count=('size', 'size'), total_bytes=('size', 'sum'),
+                                             max_last_modified=('last_modified', 'max'))
+    for name, row in grouped.iterrows():
+        stats = partitions.setdefault(name, {"count": 0, "total_bytes": 0, "max_last_modified": None})
+        stats["count"] += int(row['count'])
+        stats["total_bytes"] += int(row['total_bytes'])
+        if pd.notna(row['max_last_modified']):
+            last_modified = row['max_last_modified'].isoformat()
+            if stats["max_last_modified"] is None or last_modified > stats["max_last_modified"]:
+                stats["max_last_modified"] = last_modified
+
+def merge_partition_stats(parts):
+    merged = {}
+    for partitions in parts:
+        for name, stats in partitions.items():
+            target = merged.setdefault(name, {"count": 0, "total_bytes": 0, "max_last_modified": None})
+            target["count"] += stats["count"]
+            target["total_bytes"] += stats["total_bytes"]
+            if stats["max_last_modified"] and (target["max_last_modified"] is None
+                                               or stats["max_last_modified"] > target["max_last_modified"]):
+                target["max_last_modified"] = stats["max_last_modified"]
+    return merged
+
+def read_inventory_report(manifest_location, prefix=None, max_workers=None, s3=None):
+    """
+    Compute per-partition count and size statistics from an S3 Inventory report.
+
+    Each data file is decompressed and aggregated chunk by chunk (memory is
+    bounded by one chunk per worker plus the per-partition totals), and data
+    files are processed concurrently on max_workers threads.
+
+    Args:
+        manifest_location (str): manifest.json or inventory folder, local path or s3://...
+        prefix (str, optional): Only count keys under this prefix; defaults to Config.S3_PREFIX
+        max_workers (int, optional): Data files read concurrently
+        s3 (optional): S3 client for s3:// reports
+
+    Returns:
+        dict: manifest details, rows scanned and per-partition stats
+    """
+    prefix = Config.S3_PREFIX if prefix is None else prefix
+    max_workers = max_workers or Config.S3_LIST_MAX_WORKERS
+    start = time.perf_counter()
+    manifest_location = find_latest_manifest(manifest_location, s3)
+    manifest = load_manifest(manifest_location, s3)
+    file_keys = [entry["key"] for entry in manifest.get("files", [])]
+
+    def read_file(file_key):
+        partitions = {}
+        rows = 0
+        for chunk in iter_inventory_chunks(manifest, manifest_location, file_key, s3):
+            rows += len(chunk)
+            aggregate_inventory_chunk(chunk, prefix, partitions)
+        return partitions, rows
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(read_file, file_keys))
+
+    logger.info(f"Read {len(file_keys)} inventory file(s) of {manifest_location} "
+                f"in {time.perf_counter() - start:.1f}s")
+    return {
+        "manifest": manifest_location,
+        "source_bucket": manifest.get("sourceBucket"),
+        "creation_timestamp": manifest.get("creationTimestamp"),
+        "file_format": manifest.get("fileFormat", "CSV"),
+        "files": len(file_keys),
+        "rows_scanned": sum(rows for _, rows in results),
+        "partitions": merge_partition_stats([partitions for partitions, _ in results]),
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+def refresh_inventory_from_report(bucket, prefix, manifest_location, max_workers=None, s3=None):
+    """Rebuild the inventory snapshot of a prefix from the latest S3 Inventory report."""
+    report = read_inventory_report(manifest_location, prefix, max_workers, s3)
+    now = time.time()
+    for stats in report["partitions"].values():
+        stats["listed_at"] = now
+    snapshot = {
+        "bucket": bucket,
+        "prefix": prefix,
+        "partitions": report["partitions"],
+        "updated_at": now,
+        "full_refresh_at": now,
+        "last_refresh": {
+            "mode": "inventory_report",
+            "manifest": report["manifest"],
+            "creation_timestamp": report["creation_timestamp"],
+            "files": report["files"],
+            "rows_scanned": report["rows_scanned"],
+            "seconds": report["seconds"]
+        }
+    }
+    save_snapshot(snapshot)
+    return snapshot
+
+def start_inventory_refresh(bucket, prefix, full_refresh=False):
+    """Refresh a snapshot in a background thread (one refresh per prefix at a time)."""
+    key = (bucket, prefix)
+    with _refresh_lock:
+        thread = _refresh_threads.get(key)
+        if thread and thread.is_alive():
+            return thread
+
+        def run():
+            try:
+                refresh_inventory(bucket, prefix, full_refresh)
+            except Exception as e:
+                logger.error(f"Inventory refresh of s3://{bucket}/{prefix} failed: {str(e)}")
+                logger.error(traceback.format_exc())
+
+        thread = threading.Thread(target=run, name=f"s3-inventory-{prefix}", daemon=True)
+        _refresh_threads[key] = thread
+        thread.start()
+        return thread
+
+def summarize_inventory(snapshot, top_k=None):
+    """Totals and the largest partitions of a snapshot (the rest is paginated)."""
+    partitions = [{"prefix": name, **stats} for name, stats in snapshot["partitions"].items()]
+    total_bytes = sum(partition["total_bytes"] for partition in partitions)
+    partitions, partitions_page = take_top_k(
+        partitions, [partition["total_bytes"] for partition in partitions],
+        Config.VARIANCE_TOP_K if top_k is None else int(top_k), kind="s3_partitions")
+    return {
+        "bucket": snapshot["bucket"],
+        "prefix": snapshot["prefix"],
+        "snapshot_updated_at": datetime.fromtimestamp(snapshot["updated_at"]).strftime('%Y-%m-%d %H:%M:%S'),
+        "last_refresh": snapshot["last_refresh"],
+        "total_file_count": sum(stats["count"] for stats in snapshot["partitions"].values()),
+        "total_bytes": total_bytes,
+        "total_tb": total_bytes / (1024 ** 4),
+        "partition_count": len(snapshot["partitions"]),
+        "partitions": partitions,
+        "partitions_page": partitions_page
+    }
+
+def s3_inventory(prefix=None, full_refresh=False, top_k=None):
+    """
+    Report exact file counts and sizes per partition under an S3 prefix.
+
+    Answers from the persisted snapshot. A snapshot older than
+    S3_INVENTORY_MAX_AGE_SECONDS (or full_refresh) triggers a background
+    refresh; only the very first build is waited for, up to S3_INVENTORY_WAIT_SECONDS.
+    
+    Args:
+        prefix (str, optional): Key prefix; defaults to Config.S3_PREFIX
+        full_refresh (bool, optional): Re-list every partition instead of only new/recent ones
+        top_k (int, optional): Largest partitions to return; the rest is paginated (variance_page)
+        
+    Returns:
+        dict: Totals, per-partition stats and snapshot freshness
+    """
+    try:
+        bucket = Config.S3_BUCKET
+        prefix = Config.S3_PREFIX if prefix is None else prefix
+        if isinstance(full_refresh, str):
+            full_refresh = full_refresh.strip().lower() in ("true", "yes", "1")
+
+        snapshot = load_snapshot(bucket, prefix)
+        refresh = None
+        if full_refresh or snapshot is None or time.time() - snapshot["updated_at"] > Config.S3_INVENTORY_MAX_AGE_SECONDS:
+            refresh = start_inventory_refresh(bucket, prefix, full_refresh)
+            if snapshot is None:
+                refresh.join(timeout=Config.S3_INVENTORY_WAIT_SECONDS)
+                snapshot = load_snapshot(bucket, prefix)
+
+        if snapshot is None:
+            return {
+                "success": True,
+                "bucket": bucket,
+                "prefix": prefix,
+                "refresh_in_progress": True,
+                "message": "The first inventory of this prefix is still being built. Ask again in a few minutes."
+            }
+
+        return {
+            "success": True,
+            **summarize_inventory(snapshot, top_k),
+            "refresh_in_progress": bool(refresh and refresh.is_alive())
+        }
+
+    except Exception as e:
+        logger.error(f"Error in s3_inventory: {str(e)}")
+        logger.error(traceback.format_exc())
+        return {
+            "success": False,
+            "error": str(e),
+            "prefix": prefix
+        }
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Count and size the objects under an S3 prefix")
+    arg_parser.add_argument('--bucket', default=Config.S3_BUCKET)
+    arg_parser.add_argument('--prefix', default=Config.S3_PREFIX)
+    arg_parser.add_argument('--sample-limit', type=int, default=Config.S3_SAMPLE_LIMIT,
+                            help="How many real files to sample")
+    arg_parser.add_argument('--max-workers', type=int, default=Config.S3_LIST_MAX_WORKERS,
+                            help="Concurrent prefix listings or inventory files (1 = single paginator)")
+    arg_parser.add_argument('--inventory-manifest',
+                            help="Read an S3 Inventory report (manifest.json or its folder, local or s3://) instead of listing")
+    args = arg_parser.parse_args()
+
+    if args.inventory_manifest:
+        report = read_inventory_report(args.inventory_manifest, args.prefix, args.max_workers)
+        total_count = sum(stats["count"] for stats in report["partitions"].values())
+        total_bytes = sum(stats["total_bytes"] for stats in report["partitions"].values())
+        print(f"\n=== Inventory report {report['manifest']} ({report['creation_timestamp']}) ===")
+        for name, stats in sorted(report["partitions"].items()):
+            print(f"{name:<60} {stats['count']:>10} files {stats['total_bytes']:>18} bytes")
+        print(f"Total real file count: {total_count}")
+        print(f"Total size: {total_bytes} bytes ({total_bytes / (1024 ** 4):.3f} TB)")
+        print(f"Scanned {report['rows_scanned']} rows in {report['files']} file(s) in {report['seconds']} s")
+        return
+
+    print(f"Scanning all objects under s3://{args.bucket}/{args.prefix}")
+    result = list_s3_stats(args.bucket, args.prefix, args.max_workers, args.sample_limit)
+
+    if result["sample_size"]:
+        print("\n=== Results ===")
+        print(f"Sample size: {result['sample_size']}")
+        print(f"Total real file count: {result['total_file_count']}")
+        print(f"Avg file size (sample): {result['avg_sample_size']:.2f} bytes")
+        print(f"Estimated total size: {result['estimated_total_bytes']:.2f} bytes ({result['estimated_total_tb']:.3f} TB)")
+        print(f"Exact total size: {result['total_bytes']} bytes")
+        print(f"Listed {result['shards']} shard(s) in {result['seconds']} s")
+    else:
+        print("No real files found.")
+
+# Register the function
+register_function("s3_inventory", s3_inventory)
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,23 @@
 # backend/functions/sls_details_variance.py
+import numpy as np
 import pandas as pd
-import pyodbc
 import os
+import hashlib
 import traceback
 import logging
 from datetime import datetime
 from functions.function_registry import register_function
 from config import Config
+from utils.impala_connector import fetch_aggregated, iter_query_chunks
+from utils.aggregate_cache import get_aggregate_cache
+from utils.result_pages import take_top_k, get_result_page_store
+from utils.log import summarize
+from services.cpu_pool import register_cpu_stage, run_cpu_stage
+from services.circuit_breaker import UNAVAILABLE_ERRORS
 
 logger = logging.getLogger(__name__)
 
-def sls_details_variance(date1, date2, product_identifiers=None):
+def sls_details_variance(date1, date2, product_identifiers=None, top_k=None, sort_by="percentage"):
     """
     Perform comprehensive variance analysis for SLS details between two dates.
     
@@ -18,6 +25,9 @@ def sls_details_variance(date1, date2, product_identifiers=None):
         date1 (str): First date in format YYYY-MM-DD
         date2 (str): Second date in format YYYY-MM-DD
         product_identifiers (str, optional): Comma-separated list of product identifiers (e.g., 'OS-09,OS-10')
+        top_k (int, optional): Variance rows returned per table; defaults to Config.VARIANCE_TOP_K.
+            The rest is available through the returned cursors (variance_page)
+        sort_by (str, optional): Rank by 'percentage' or 'absolute' variance
         
     Returns:
         dict: Comprehensive variance information including analysis from multiple tables
@@ -29,13 +39,17 @@ def sls_details_variance(date1, date2, product_identifiers=None):
         date1_formatted = date1_obj.strftime('%Y-%m-%d')
         date2_formatted = date2_obj.strftime('%Y-%m-%d')
         
+        top_k = Config.VARIANCE_TOP_K if top_k is None else int(top_k)
+        if sort_by not in ("percentage", "absolute"):
+            raise ValueError(f"sort_by must be 'percentage' or 'absolute', got '{sort_by}'")
+        
         # Parse product identifiers if provided
         product_ids = []
         if product_identifiers:
             product_ids = [pid.strip() for pid in product_identifiers.split(',')]
         
         # Step 1: Check variance in reporting table
-        reporting_variance = analyze_reporting_table(date1_formatted, date2_formatted, product_ids)
+        reporting_variance = analyze_reporting_table(date1_formatted, date2_formatted, product_ids, top_k, sort_by)
         
         # If no significant variance found in reporting, return early
         if not reporting_variance['sls_lines_with_variance']:
@@ -52,10 +66,10 @@ def sls_details_variance(date1, date2, product_identifiers=None):
         
         # Step 2: Check variance in base data for SLS lines with significant variance
         sls_lines_with_variance = reporting_variance['sls_lines_with_variance']
-        base_data_variance = analyze_base_data_table(date1_formatted, date2_formatted, sls_lines_with_variance)
+        base_data_variance = analyze_base_data_table(date1_formatted, date2_formatted, sls_lines_with_variance, top_k, sort_by)
         
         # Step 3: Check variance in SLS details table for the same SLS lines
-        sls_details_variance = analyze_sls_details_table(date1_formatted, date2_formatted, sls_lines_with_variance)
+        sls_details_variance = analyze_sls_details_table(date1_formatted, date2_formatted, sls_lines_with_variance, top_k, sort_by)
         
         # Compile all results
         return {
@@ -68,6 +82,8 @@ def sls_details_variance(date1, date2, product_identifiers=None):
             "sls_details_analysis": sls_details_variance
         }
         
+    except UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         logger.error(f"Error in sls_details_variance: {str(e)}")
         logger.error(traceback.format_exc())
@@ -79,7 +95,180 @@ def sls_details_variance(date1, date2, product_identifiers=None):
             "product_identifiers": product_identifiers
         }
 
-def analyze_reporting_table(date1, date2, product_ids):
+# Per-table settings of the variance queries. Each query returns one aggregate
+# per (context_key, cob_date, sls_line, context_name) for the given FINAL context keys.
+VARIANCE_TABLES = {
+    "reporting": {
+        "table": "lri_base.us_reg_2052a_reporting",
+        "service_names": ['FR2052A_REPORT'],
+        "date_column": "cob_date",
+        "sls_line_column": "sls_line_number",
+        "amount_expression": "SUM(sls.ccf_flow_amt)",
+        "snapshot_filter": ""
+    },
+    "base_data": {
+        "table": "lri_base.us_reg_base_data",
+        "service_names": ['FR2052A_REPORT', 'SLS_REP.FR2052A_BASE_SUPPLY'],
+        "date_column": "cob_date",
+        "sls_line_column": "lri_position_str_sls_line_no",
+        "amount_expression": "SUM(sls.ccf_flow_amt)",
+        "snapshot_filter": "AND sls.snapshot_label IN ('FINAL')"
+    },
+    "sls_details": {
+        "table": "lri_base.sls_details_prdl",
+        "service_names": ['SLS_REP_IMPALA'],
+        "date_column": "lri_position_str_cob_date",
+        "sls_line_column": "lri_position_str_sls_line_no",
+        "amount_expression": "SUM(sls.ccf_flow_amt_base)",
+        "snapshot_filter": "AND sls.snapshot_label IN ('FINAL')"
+    }
+}
+
+def _sql_list(values):
+    """Format values for an SQL IN (...) list, quoting everything but numbers."""
+    return ", ".join([str(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else f"'{v}'"
+                      for v in values])
+
+def get_final_context_keys(dates, service_names):
+    """
+    Look up the FINAL EOD context keys of each COB date.
+    
+    Args:
+        dates (list): COB dates in format YYYY-MM-DD
+        service_names (list): Services whose snapshots to include
+        
+    Returns:
+        dict: COB date -> list of context keys (empty when the date has no FINAL snapshot)
+    """
+    query = f"""
+    SELECT DISTINCT rcl.cob_date, rcl.context_key
+    FROM lri_base.result_context_list rcl
+    WHERE rcl.cob_date IN ({_sql_list(dates)})
+    AND rcl.run_type = 'EOD'
+    AND rcl.snapshot_label = 'FINAL'
+    AND rcl.service_name IN ({_sql_list(service_names)})
+    """
+    context_keys = {date: [] for date in dates}
+    for chunk in iter_query_chunks(query):
+        for cob_date, context_key in zip(chunk['cob_date'], chunk['context_key']):
+            context_keys.setdefault(str(cob_date), []).append(context_key)
+    return context_keys
+
+def build_aggregate_query(spec, context_keys, sls_lines=None, extra_filter=""):
+    """Build the per-(sls_line, context) aggregate query of one variance table."""
+    sls_line_filter = ""
+    if sls_lines is not None:
+        sls_line_filter = f"AND sls.{spec['sls_line_column']} IN ({_sql_list(sorted(sls_lines))})"
+    return f"""
+    SELECT sls.context_key, sls.{spec['date_column']}, sls.{spec['sls_line_column']},
+           rcl.context_name, {spec['amount_expression']} AS ccf_flow_amt
+    FROM {spec['table']} sls
+    LEFT JOIN lri_base.result_context_list rcl ON sls.context_key = rcl.context_key
+    WHERE sls.context_key IN ({_sql_list(context_keys)})
+    {sls_line_filter}
+    {extra_filter}
+    {spec['snapshot_filter']}
+    GROUP BY 1, 2, 3, 4
+    """
+
+def load_table_aggregates(table_name, dates, sls_lines=None, extra_filter="", namespace="all"):
+    """
+    Load the per-(sls_line, context) aggregates of a table for the given COB dates.
+    
+    Aggregates are cached per FINAL context key (utils.aggregate_cache), so only
+    context keys (and SLS lines) that have not been seen before are queried on Impala.
+    
+    Args:
+        table_name (str): Key of VARIANCE_TABLES
+        dates (list): COB dates in format YYYY-MM-DD
+        sls_lines (list, optional): Restrict to these SLS lines; None loads all lines
+        extra_filter (str, optional): Additional SQL filter (e.g. on product_identifier)
+        namespace (str, optional): Cache namespace identifying extra_filter
+        
+    Returns:
+        tuple: (pd.DataFrame of aggregates, dict of fetch statistics)
+    """
+    spec = VARIANCE_TABLES[table_name]
+    sls_line_column = spec['sls_line_column']
+    columns = ['context_key', spec['date_column'], sls_line_column, 'context_name', 'ccf_flow_amt']
+    requested_lines = None if sls_lines is None else set(sls_lines)
+    cache = get_aggregate_cache()
+    
+    frames = []
+    cached_dates = set()
+    pending = {}
+    for cob_date, context_keys in get_final_context_keys(dates, spec['service_names']).items():
+        for context_key in context_keys:
+            arrow_table, covered = cache.get(table_name, cob_date, context_key, namespace)
+            if arrow_table is None:
+                pending[context_key] = (cob_date, None, set())
+            elif covered == '*' or (requested_lines is not None and requested_lines <= covered):
+                frames.append(arrow_table.to_pandas())
+                cached_dates.add(cob_date)
+            else:
+                pending[context_key] = (cob_date, arrow_table.to_pandas(), covered)
+    
+    fetch_stats = {
+        "cached_dates": sorted(cached_dates - {cob_date for cob_date, _, _ in pending.values()}),
+        "queried_dates": sorted({cob_date for cob_date, _, _ in pending.values()})
+    }
+    
+    if pending:
+        # Only fetch the SLS lines that some pending entry does not cover yet
+        fetch_lines = None
+        if requested_lines is not None:
+            fetch_lines = set()
+            for _, _, covered in pending.values():
+                fetch_lines |= requested_lines - covered
+        
+        query = build_aggregate_query(spec, list(pending), fetch_lines, extra_filter)
+        logger.debug("Executing %s aggregate query: %s", table_name, summarize(query))
+        
+        # Stream the grouped result from Impala in chunks (or read it whole in 'frame' mode)
+        fetched, query_stats = fetch_aggregated(
+            query,
+            key_columns=columns[:4],
+            sum_columns=['ccf_flow_amt']
+        )
+        fetch_stats.update(query_stats)
+        fetched_by_key = {key: group for key, group in fetched.groupby('context_key', sort=False)}
+        
+        for context_key, (cob_date, cached_df, covered) in pending.items():
+            entry = fetched_by_key.get(context_key, fetched.iloc[0:0])[columns]
+            if cached_df is not None:
+                entry = pd.concat([cached_df, entry[~entry[sls_line_column].isin(covered)]], ignore_index=True)
+            new_covered = '*' if fetch_lines is None else covered | fetch_lines
+            try:
+                cache.put(table_name, cob_date, context_key, entry, new_covered, namespace)
+            except Exception as e:
+                logger.warning(f"Could not cache {table_name} aggregates for {cob_date}: {str(e)}")
+            frames.append(entry)
+    
+    if not frames:
+        return pd.DataFrame(columns=columns), fetch_stats
+    
+    df = pd.concat(frames, ignore_index=True)
+    if requested_lines is not None:
+        df = df[df[sls_line_column].isin(requested_lines)].reset_index(drop=True)
+    # One shared dictionary per key column across all dates; rows hold small int codes
+    for column in (sls_line_column, 'context_name'):
+        df[column] = df[column].astype('category')
+    return df, fetch_stats
+
+def build_product_filter(product_ids):
+    """
+    Build the reporting table's product_identifier filter and its cache namespace.
+    
+    Returns:
+        tuple: (SQL filter, cache namespace); ("", "all") when no products are given
+    """
+    if not product_ids:
+        return "", "all"
+    product_filter = f"AND sls.product_identifier IN ({_sql_list(product_ids)})"
+    namespace = "products-" + hashlib.sha1(",".join(sorted(product_ids)).encode()).hexdigest()[:12]
+    return product_filter, namespace
+
+def analyze_reporting_table(date1, date2, product_ids, top_k=None, sort_by="percentage"):
     """
     Analyze the reporting table to find SLS lines with significant variance.
     
@@ -87,68 +276,34 @@ def analyze_reporting_table(date1, date2, product_ids):
         date1 (str): First date in format YYYY-MM-DD
         date2 (str): Second date in format YYYY-MM-DD
         product_ids (list): List of product identifiers to check
+        top_k (int, optional): Variance rows to return (the rest is paginated)
+        sort_by (str, optional): Rank by 'percentage' or 'absolute' variance
         
     Returns:
         dict: Analysis results from the reporting table
     """
     try:
         # Build the product_identifier filter if product_ids are provided
-        product_filter = ""
-        if product_ids:
-            product_filter = f"AND product_identifier IN ({', '.join([f\"'{pid}'\" for pid in product_ids])})"
-        
-        # Construct query for reporting table
-        query = f"""
-        SELECT sls.context_key, sls.cob_date, sls_line_number, basedata_context_key, sls.snapshot_label, 
-               rcl.context_name, COUNT(*) AS count,
-               SUM(ccf_flow_amt) AS ccf_flow_amt,
-               SUM(xml_collateral_value_usd) AS xml_collateral_value_usd,
-               SUM(xml_market_value_usd) AS xml_market_value_usd,
-               SUM(xml_maturity_value_usd) AS xml_maturity_value_usd
-        FROM lri_base.us_reg_2052a_reporting sls
-        LEFT JOIN lri_base.result_context_list rcl ON sls.context_key = rcl.context_key
-        WHERE sls.context_key IN (
-            SELECT rcl.context_key FROM lri_base.result_context_list rcl
-            WHERE rcl.cob_date IN ('{date1}', '{date2}')
-            AND rcl.run_type = 'EOD'
-            AND rcl.snapshot_label = 'FINAL'
-            AND rcl.service_name IN ('FR2052A_REPORT')
-        )
-        {product_filter}
-        GROUP BY 1, 2, 3, 4, 5, 6
-        ORDER BY 3, 2, 1
-        """
-        
-        logger.debug(f"Executing reporting table query: {query}")
-        
-        # Connect to Impala using pyodbc
-        conn_string = "DSN=IMPALA_LRI_DR"
-        cert = '/etc/security/certs/JPMCROOTCA.pem'
-        
-        conn = pyodbc.connect(
-            conn_string, 
-            ssl=1, 
-            AllowSelfSignedServerCert=1, 
-            TrustedCerts=cert, 
-            autocommit=True
-        )
+        product_filter, namespace = build_product_filter(product_ids)
         
-        # Execute query and get results as DataFrame
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df, fetch_stats = load_table_aggregates("reporting", [date1, date2],
+                                                extra_filter=product_filter, namespace=namespace)
         
-        logger.debug(f"Query returned {len(df)} rows")
+        logger.debug("Reporting table aggregates: %d rows", len(df))
         
         # Perform variance analysis
-        analysis_results = analyze_variance_in_dataframe(
+        analysis_results = run_variance_analysis(
             df, 
             'sls_line_number', 
             'ccf_flow_amt', 
             date1, 
             date2, 
             context_key_column='context_key',
-            context_name_column='context_name'
+            context_name_column='context_name',
+            top_k=top_k,
+            sort_by=sort_by
         )
+        analysis_results["fetch_stats"] = fetch_stats
         
         return analysis_results
         
@@ -157,7 +312,7 @@ def analyze_reporting_table(date1, date2, product_ids):
         logger.error(traceback.format_exc())
         raise
 
-def analyze_base_data_table(date1, date2, sls_lines):
+def analyze_base_data_table(date1, date2, sls_lines, top_k=None, sort_by="percentage"):
     """
     Analyze the base data table for SLS lines with significant variance.
     
@@ -165,6 +320,8 @@ def analyze_base_data_table(date1, date2, sls_lines):
         date1 (str): First date in format YYYY-MM-DD
         date2 (str): Second date in format YYYY-MM-DD
         sls_lines (list): List of SLS line numbers to check
+        top_k (int, optional): Variance rows to return (the rest is paginated)
+        sort_by (str, optional): Rank by 'percentage' or 'absolute' variance
         
     Returns:
         dict: Analysis results from the base data table
@@ -178,59 +335,23 @@ def analyze_base_data_table(date1, date2, sls_lines):
                 "missing_pairs": []
             }
         
-        # Build the SLS line filter
-        sls_line_filter = f"AND sls.lri_position_str_sls_line_no IN ({', '.join([f\"'{line}'\" for line in sls_lines])})"
-        
-        # Construct query for base data table
-        query = f"""
-        SELECT sls.context_key, sls.cob_date, sls.lri_position_str_sls_line_no, 
-               sls.sls_context_key, sls.snapshot_label, rcl.context_name, 
-               COUNT(*) AS count, SUM(ccf_flow_amt) AS ccf_flow_amt
-        FROM lri_base.us_reg_base_data sls
-        LEFT JOIN lri_base.result_context_list rcl ON sls.context_key = rcl.context_key
-        WHERE sls.context_key IN (
-            SELECT rcl.context_key FROM lri_base.result_context_list rcl
-            WHERE rcl.cob_date IN ('{date1}', '{date2}')
-            AND rcl.run_type = 'EOD'
-            AND rcl.snapshot_label = 'FINAL'
-            AND rcl.service_name IN ('FR2052A_REPORT', 'SLS_REP.FR2052A_BASE_SUPPLY')
-        )
-        {sls_line_filter}
-        AND sls.snapshot_label IN ('FINAL')
-        GROUP BY 1, 2, 3, 4, 5, 6
-        ORDER BY 3, 2, 1
-        """
-        
-        logger.debug(f"Executing base data table query: {query}")
-        
-        # Connect to Impala using pyodbc
-        conn_string = "DSN=IMPALA_LRI_DR"
-        cert = '/etc/security/certs/JPMCROOTCA.pem'
-        
-        conn = pyodbc.connect(
-            conn_string, 
-            ssl=1, 
-            AllowSelfSignedServerCert=1, 
-            TrustedCerts=cert, 
-            autocommit=True
-        )
-        
-        # Execute query and get results as DataFrame
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df, fetch_stats = load_table_aggregates("base_data", [date1, date2], sls_lines=sls_lines)
         
-        logger.debug(f"Base data query returned {len(df)} rows")
+        logger.debug("Base data aggregates: %d rows", len(df))
         
         # Perform variance analysis
-        analysis_results = analyze_variance_in_dataframe(
+        analysis_results = run_variance_analysis(
             df, 
             'lri_position_str_sls_line_no', 
             'ccf_flow_amt', 
             date1, 
             date2, 
             context_key_column='context_key',
-            context_name_column='context_name'
+            context_name_column='context_name',
+            top_k=top_k,
+            sort_by=sort_by
         )
+        analysis_results["fetch_stats"] = fetch_stats
         
         return analysis_results
         
@@ -239,7 +360,7 @@ def analyze_base_data_table(date1, date2, sls_lines):
         logger.error(traceback.format_exc())
         raise
 
-def analyze_sls_details_table(date1, date2, sls_lines):
+def analyze_sls_details_table(date1, date2, sls_lines, top_k=None, sort_by="percentage"):
     """
     Analyze the SLS details table for SLS lines with significant variance.
     
@@ -247,6 +368,8 @@ def analyze_sls_details_table(date1, date2, sls_lines):
         date1 (str): First date in format YYYY-MM-DD
         date2 (str): Second date in format YYYY-MM-DD
         sls_lines (list): List of SLS line numbers to check
+        top_k (int, optional): Variance rows to return (the rest is paginated)
+        sort_by (str, optional): Rank by 'percentage' or 'absolute' variance
         
     Returns:
         dict: Analysis results from the SLS details table
@@ -260,63 +383,27 @@ def analyze_sls_details_table(date1, date2, sls_lines):
                 "missing_pairs": []
             }
         
-        # Build the SLS line filter
-        sls_line_filter = f"AND sls.lri_position_str_sls_line_no IN ({', '.join([f\"'{line}'\" for line in sls_lines])})"
-        
-        # Construct query for SLS details table
-        query = f"""
-        SELECT sls.context_key, sls.lri_position_str_cob_date, sls.lri_position_str_sls_line_no, 
-               sls.snapshot_label, rcl.context_name, COUNT(*) AS count,
-               SUM(ccf_flow_amt_base) AS ccf_flow_amt
-        FROM lri_base.sls_details_prdl sls
-        LEFT JOIN lri_base.result_context_list rcl ON sls.context_key = rcl.context_key
-        WHERE sls.context_key IN (
-            SELECT rcl.context_key FROM lri_base.result_context_list rcl
-            WHERE rcl.cob_date IN ('{date1}', '{date2}')
-            AND rcl.run_type = 'EOD'
-            AND rcl.snapshot_label = 'FINAL'
-            AND rcl.service_name IN ('SLS_REP_IMPALA')
-        )
-        {sls_line_filter}
-        AND sls.snapshot_label IN ('FINAL')
-        GROUP BY 1, 2, 3, 4, 5
-        ORDER BY 3, 2, 1
-        """
-        
-        logger.debug(f"Executing SLS details table query: {query}")
-        
-        # Connect to Impala using pyodbc
-        conn_string = "DSN=IMPALA_LRI_DR"
-        cert = '/etc/security/certs/JPMCROOTCA.pem'
-        
-        conn = pyodbc.connect(
-            conn_string, 
-            ssl=1, 
-            AllowSelfSignedServerCert=1, 
-            TrustedCerts=cert, 
-            autocommit=True
-        )
+        df, fetch_stats = load_table_aggregates("sls_details", [date1, date2], sls_lines=sls_lines)
         
-        # Execute query and get results as DataFrame
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        
-        logger.debug(f"SLS details query returned {len(df)} rows")
+        logger.debug("SLS details aggregates: %d rows", len(df))
         
         # Convert date column to match expected format
         if 'lri_position_str_cob_date' in df.columns:
             df['cob_date'] = df['lri_position_str_cob_date']
         
         # Perform variance analysis
-        analysis_results = analyze_variance_in_dataframe(
+        analysis_results = run_variance_analysis(
             df, 
             'lri_position_str_sls_line_no', 
             'ccf_flow_amt', 
             date1, 
             date2, 
             context_key_column='context_key',
-            context_name_column='context_name'
+            context_name_column='context_name',
+            top_k=top_k,
+            sort_by=sort_by
         )
+        analysis_results["fetch_stats"] = fetch_stats
         
         return analysis_results
         
@@ -325,7 +412,7 @@ def analyze_sls_details_table(date1, date2, sls_lines):
         logger.error(traceback.format_exc())
         raise
 
-def analyze_variance_in_dataframe(df, sls_line_column, amount_column, date1, date2, context_key_column='context_key', context_name_column='context_name'):
+def analyze_variance_in_dataframe(df, sls_line_column, amount_column, date1, date2, context_key_column='context_key', context_name_column='context_name', top_k=None, sort_by="percentage", rank=True):
     """
     Generic function to analyze variance in a DataFrame.
     
@@ -337,6 +424,11 @@ def analyze_variance_in_dataframe(df, sls_line_column, amount_column, date1, dat
         date2 (str): Second date
         context_key_column (str): Column name for context key
         context_name_column (str): Column name for context name
+        top_k (int, optional): Return only the top_k variance rows and missing pairs;
+            the rest is stored for cursor-based pagination
+        sort_by (str, optional): Rank variance rows by 'percentage' or 'absolute' variance
+        rank (bool, optional): Apply top_k/pagination; False returns every row unranked
+            (used in CPU pool workers, whose page store the caller cannot reach)
         
     Returns:
         dict: Analysis results
@@ -350,19 +442,16 @@ def analyze_variance_in_dataframe(df, sls_line_column, amount_column, date1, dat
                 "missing_pairs": []
             }
         
-        # Create a unique pair identifier for SLS line and context name
-        df['pair_id'] = df[sls_line_column] + '|' + df[context_name_column]
-        
         # Split data by date
-        df1 = df[df['cob_date'] == date1].copy()
-        df2 = df[df['cob_date'] == date2].copy()
+        in_date1 = (df['cob_date'] == date1).to_numpy(dtype=bool)
+        in_date2 = (df['cob_date'] == date2).to_numpy(dtype=bool)
         
         # Check if we have data for both dates
-        if df1.empty or df2.empty:
+        if not in_date1.any() or not in_date2.any():
             missing_dates = []
-            if df1.empty:
+            if not in_date1.any():
                 missing_dates.append(date1)
-            if df2.empty:
+            if not in_date2.any():
                 missing_dates.append(date2)
                 
             return {
@@ -372,103 +461,145 @@ def analyze_variance_in_dataframe(df, sls_line_column, amount_column, date1, dat
                 "missing_pairs": []
             }
         
-        # Find unique SLS lines
-        all_sls_lines = set(df[sls_line_column].dropna().unique())
-        
-        # Find all unique pairs
-        all_pairs = set(df['pair_id'].dropna().unique())
-        pairs_in_df1 = set(df1['pair_id'].dropna().unique())
-        pairs_in_df2 = set(df2['pair_id'].dropna().unique())
-        
-        # Identify missing pairs
-        missing_from_df1 = pairs_in_df2 - pairs_in_df1
-        missing_from_df2 = pairs_in_df1 - pairs_in_df2
+        # Integer-code SLS lines and context names with one dictionary shared by both
+        # dates, so pairs are matched on int64 codes instead of concatenated strings
+        line_codes, sls_line_values = pd.factorize(df[sls_line_column])
+        name_codes, context_name_values = pd.factorize(df[context_name_column])
+        valid = (line_codes >= 0) & (name_codes >= 0)
+        pair_codes = line_codes.astype(np.int64) * max(len(context_name_values), 1) + name_codes
+        
+        # First row of each pair per date (positions into df)
+        rows1 = np.flatnonzero(in_date1 & valid)
+        rows2 = np.flatnonzero(in_date2 & valid)
+        pairs1, first1 = np.unique(pair_codes[rows1], return_index=True)
+        pairs2, first2 = np.unique(pair_codes[rows2], return_index=True)
+        rows1 = rows1[first1]
+        rows2 = rows2[first2]
+        
+        # Identify missing pairs and pairs present in both dates
+        _, common1, common2 = np.intersect1d(pairs1, pairs2, assume_unique=True, return_indices=True)
+        only1 = rows1[~np.isin(pairs1, pairs2, assume_unique=True)]
+        only2 = rows2[~np.isin(pairs2, pairs1, assume_unique=True)]
+        
+        # Rows are decoded through the shared dictionaries only when they are reported
+        line_lookup = np.asarray(sls_line_values, dtype=object)
+        name_lookup = np.asarray(context_name_values, dtype=object)
+        context_keys = df[context_key_column].to_numpy()
+        amounts = df[amount_column].to_numpy(dtype=float)
         
         # Prepare missing pairs data
         missing_pairs = []
-        
-        for pair in missing_from_df1:
-            pair_data = df2[df2['pair_id'] == pair].iloc[0]
-            missing_pairs.append({
-                "sls_line": pair_data[sls_line_column],
-                "context_name": pair_data[context_name_column],
-                "context_key": pair_data[context_key_column],
-                "missing_from": date1,
-                "present_in": date2,
-                "amount": float(pair_data[amount_column]) if pd.notna(pair_data[amount_column]) else None
-            })
-            
-        for pair in missing_from_df2:
-            pair_data = df1[df1['pair_id'] == pair].iloc[0]
-            missing_pairs.append({
-                "sls_line": pair_data[sls_line_column],
-                "context_name": pair_data[context_name_column],
-                "context_key": pair_data[context_key_column],
-                "missing_from": date2,
-                "present_in": date1,
-                "amount": float(pair_data[amount_column]) if pd.notna(pair_data[amount_column]) else None
-            })
-        
-        # Analyze variance for pairs present in both dates
-        common_pairs = pairs_in_df1.intersection(pairs_in_df2)
-        variance_data = []
-        sls_lines_with_variance = set()
-        
-        for pair in common_pairs:
-            row1 = df1[df1['pair_id'] == pair].iloc[0]
-            row2 = df2[df2['pair_id'] == pair].iloc[0]
-            
-            # Skip pairs with null amounts
-            if pd.isna(row1[amount_column]) or pd.isna(row2[amount_column]):
-                continue
-                
-            amount1 = float(row1[amount_column])
-            amount2 = float(row2[amount_column])
-            
-            # Calculate absolute and percentage variance
-            absolute_variance = amount2 - amount1
-            
-            # Avoid division by zero
-            if amount1 == 0:
-                if amount2 == 0:
-                    pct_variance = 0
-                else:
-                    pct_variance = float('inf')
-            else:
-                pct_variance = (absolute_variance / abs(amount1)) * 100
-            
-            # Check if variance exceeds threshold (10%)
-            if abs(pct_variance) >= 10:
-                sls_line = row1[sls_line_column]
-                sls_lines_with_variance.add(sls_line)
-                
-                variance_data.append({
+        for rows, missing_from, present_in in ((only2, date1, date2), (only1, date2, date1)):
+            for sls_line, context_name, context_key, amount in zip(
+                    line_lookup[line_codes[rows]].tolist(), name_lookup[name_codes[rows]].tolist(),
+                    context_keys[rows].tolist(), amounts[rows].tolist()):
+                missing_pairs.append({
                     "sls_line": sls_line,
-                    "context_name": row1[context_name_column],
-                    "context_key_date1": row1[context_key_column],
-                    "context_key_date2": row2[context_key_column],
-                    "amount_date1": amount1,
-                    "amount_date2": amount2,
-                    "absolute_variance": absolute_variance,
-                    "percentage_variance": pct_variance,
-                    "pair_id": pair
+                    "context_name": context_name,
+                    "context_key": context_key,
+                    "missing_from": missing_from,
+                    "present_in": present_in,
+                    "amount": None if np.isnan(amount) else amount
                 })
         
-        # Sort variance data by absolute variance
-        variance_data.sort(key=lambda x: abs(x['percentage_variance']), reverse=True)
-        
-        return {
+        # Analyze variance for pairs present in both dates (vectorized)
+        rows1 = rows1[common1]
+        rows2 = rows2[common2]
+        amount1 = amounts[rows1]
+        amount2 = amounts[rows2]
+        
+        # Skip pairs with null amounts
+        both = ~np.isnan(amount1) & ~np.isnan(amount2)
+        rows1, rows2, amount1, amount2 = rows1[both], rows2[both], amount1[both], amount2[both]
+        
+        # Calculate absolute and percentage variance (0 -> 0 is no change, 0 -> x is infinite)
+        absolute_variance = amount2 - amount1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_variance = np.where(amount1 == 0,
+                                    np.where(amount2 == 0, 0.0, np.inf),
+                                    absolute_variance / np.abs(amount1) * 100)
+        
+        # Check if variance exceeds threshold (10%)
+        significant = np.abs(pct_variance) >= 10
+        rows1, rows2 = rows1[significant], rows2[significant]
+        
+        variance_data = [{
+            "sls_line": sls_line,
+            "context_name": context_name,
+            "context_key_date1": key1,
+            "context_key_date2": key2,
+            "amount_date1": value1,
+            "amount_date2": value2,
+            "absolute_variance": absolute,
+            "percentage_variance": pct,
+            "pair_id": f"{sls_line}|{context_name}"
+        } for sls_line, context_name, key1, key2, value1, value2, absolute, pct in zip(
+            line_lookup[line_codes[rows1]].tolist(), name_lookup[name_codes[rows1]].tolist(),
+            context_keys[rows1].tolist(), context_keys[rows2].tolist(),
+            amount1[significant].tolist(), amount2[significant].tolist(),
+            absolute_variance[significant].tolist(), pct_variance[significant].tolist())]
+        
+        sls_lines_with_variance = line_lookup[np.unique(line_codes[rows1])]
+        
+        result = {
             "message": f"Analysis completed. Found {len(variance_data)} pairs with significant variance (>=10%).",
-            "sls_lines_analyzed": list(all_sls_lines),
-            "sls_lines_with_variance": list(sls_lines_with_variance),
+            "sls_lines_analyzed": sls_line_values.tolist(),
+            "sls_lines_with_variance": sls_lines_with_variance.tolist(),
             "variance_data": variance_data,
             "missing_pairs": missing_pairs
         }
+        return rank_variance_result(result, top_k, sort_by) if rank else result
         
     except Exception as e:
         logger.error(f"Error in analyze_variance_in_dataframe: {str(e)}")
         logger.error(traceback.format_exc())
         raise
 
-# Register the function
-register_function("sls_details_variance", sls_details_variance)
+def rank_variance_result(result, top_k=None, sort_by="percentage"):
+    """
+    Keep the largest variances and missing pairs (partial selection); the rest
+    is stored for cursor-based pagination.
+    
+    Args:
+        result (dict): Unranked result of analyze_variance_in_dataframe
+        top_k (int, optional): Rows to keep per list
+        sort_by (str, optional): Rank variance rows by 'percentage' or 'absolute' variance
+        
+    Returns:
+        dict: The result with top-K lists and variance_page/missing_pairs_page blocks
+    """
+    score_key = 'percentage_variance' if sort_by == "percentage" else 'absolute_variance'
+    variance_data, missing_pairs = result["variance_data"], result["missing_pairs"]
+    result["variance_data"], result["variance_page"] = take_top_k(
+        variance_data, [abs(item[score_key]) for item in variance_data], top_k, kind="variance_data")
+    result["missing_pairs"], result["missing_pairs_page"] = take_top_k(
+        missing_pairs, [abs(item['amount'] or 0) for item in missing_pairs], top_k, kind="missing_pairs")
+    return result
+
+def run_variance_analysis(df, sls_line_column, amount_column, date1, date2, top_k=None, sort_by="percentage", **columns):
+    """
+    Run analyze_variance_in_dataframe as a CPU stage (in the process pool when
+    CPU_POOL_SIZE > 0, otherwise inline) and rank the result here, where the
+    result page store lives.
+    """
+    result = run_cpu_stage("variance_analysis", df, sls_line_column, amount_column, date1, date2,
+                           rank=False, **columns)
+    return rank_variance_result(result, top_k, sort_by)
+
+def variance_page(cursor, page_size=None):
+    """
+    Get the next page of variance rows or missing pairs left out of a top-K result.
+    
+    Args:
+        cursor (str): next_cursor from a variance_page / missing_pairs_page block
+        page_size (int, optional): Rows per page; defaults to Config.RESULT_PAGE_SIZE
+        
+    Returns:
+        dict: items, offset, total and next_cursor
+    """
+    return get_result_page_store().get_page(cursor, page_size)
+
+# Register the functions
+register_function("sls_details_variance", sls_details_variance, long_running=True, idempotent=True)
+register_function("variance_page", variance_page)
+register_cpu_stage("variance_analysis", analyze_variance_in_dataframe)
@@ -0,0 +1,193 @@
+# backend/functions/sls_variance_trend.py
+import numpy as np
+import pandas as pd
+import traceback
+import logging
+from datetime import datetime
+from functions.function_registry import register_function
+from functions.sls_details_variance import VARIANCE_TABLES, load_table_aggregates, build_product_filter
+from utils.result_pages import take_top_k
+from services.circuit_breaker import UNAVAILABLE_ERRORS
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def sls_variance_trend(dates=None, start_date=None, end_date=None, table="reporting",
+                       product_identifiers=None, threshold_pct=10, top_k=None):
+    """
+    Track variance of SLS lines across a window of COB dates.
+
+    All dates are loaded in one grouped Impala pass (dates already in the
+    aggregate cache are not queried at all) and compared day over day.
+
+    Args:
+        dates (str, optional): Comma-separated dates in format YYYY-MM-DD
+        start_date (str, optional): First date of a range in format YYYY-MM-DD (business days)
+        end_date (str, optional): Last date of a range in format YYYY-MM-DD
+        table (str, optional): 'reporting', 'base_data' or 'sls_details'
+        product_identifiers (str, optional): Comma-separated product identifiers (reporting table only)
+        threshold_pct (float, optional): Day-over-day variance threshold in percent
+        top_k (int, optional): Series returned; defaults to Config.VARIANCE_TOP_K.
+            The rest is available through series_page.next_cursor (variance_page)
+
+    Returns:
+        dict: Lines whose variance crosses the threshold anywhere in the window, with their series
+    """
+    try:
+        date_list = parse_trend_dates(dates, start_date, end_date)
+        if table not in VARIANCE_TABLES:
+            raise ValueError(f"Unknown table '{table}'. Use one of: {', '.join(VARIANCE_TABLES)}")
+        threshold_pct = float(threshold_pct)
+        top_k = Config.VARIANCE_TOP_K if top_k is None else int(top_k)
+
+        product_ids = []
+        if product_identifiers:
+            product_ids = [pid.strip() for pid in product_identifiers.split(',') if pid.strip()]
+        product_filter, namespace = build_product_filter(product_ids if table == "reporting" else [])
+
+        df, fetch_stats = load_table_aggregates(table, date_list, extra_filter=product_filter, namespace=namespace)
+
+        spec = VARIANCE_TABLES[table]
+        trend = compute_variance_trend(df, date_list, spec['date_column'], spec['sls_line_column'],
+                                       'ccf_flow_amt', threshold_pct, top_k)
+
+        return {
+            "success": True,
+            "table": table,
+            "dates": date_list,
+            "threshold_pct": threshold_pct,
+            "product_identifiers": product_ids,
+            **trend,
+            "fetch_stats": fetch_stats
+        }
+
+    except UNAVAILABLE_ERRORS:
+        raise
+    except Exception as e:
+        logger.error(f"Error in sls_variance_trend: {str(e)}")
+        logger.error(traceback.format_exc())
+        return {
+            "success": False,
+            "error": str(e),
+            "dates": dates,
+            "start_date": start_date,
+            "end_date": end_date,
+            "table": table
+        }
+
+def parse_trend_dates(dates=None, start_date=None, end_date=None):
+    """
+    Resolve the trend window to a sorted list of YYYY-MM-DD dates.
+
+    An explicit date list wins; otherwise every business day from start_date
+    to end_date is used.
+    """
+    if dates:
+        date_list = sorted({datetime.strptime(d.strip(), '%Y-%m-%d').strftime('%Y-%m-%d')
+                            for d in dates.split(',') if d.strip()})
+    elif start_date and end_date:
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        if end < start:
+            start, end = end, start
+        date_list = [d.strftime('%Y-%m-%d') for d in pd.bdate_range(start, end)]
+    else:
+        raise ValueError("Provide either a list of dates or a start_date and end_date")
+
+    if len(date_list) < 2:
+        raise ValueError("A trend needs at least two dates")
+    if len(date_list) > Config.VARIANCE_TREND_MAX_DATES:
+        raise ValueError(f"A trend can span at most {Config.VARIANCE_TREND_MAX_DATES} dates, got {len(date_list)}")
+    return date_list
+
+def compute_variance_trend(df, dates, date_column, sls_line_column, amount_column, threshold_pct, top_k=None):
+    """
+    Build the (sls_line, context) x date matrix and find day-over-day variance breaches.
+
+    Args:
+        df (pd.DataFrame): Aggregates with date, SLS line, context_name and amount columns
+        dates (list): Ordered dates forming the matrix columns
+        date_column (str): Column holding the COB date
+        sls_line_column (str): Column holding the SLS line
+        amount_column (str): Column holding the amount
+        threshold_pct (float): Variance threshold in percent
+        top_k (int, optional): Series to return; the rest is stored for pagination
+
+    Returns:
+        dict: sls_lines_with_variance, series (sorted by largest |variance|), series_page and summary counts
+    """
+    empty = {
+        "pairs_analyzed": 0,
+        "sls_lines_with_variance": [],
+        "series": [],
+        "series_page": {"total": 0, "returned": 0, "next_cursor": None},
+        "dates_without_data": list(dates)
+    }
+    if df.empty:
+        return empty
+
+    date_codes = pd.Index(dates).get_indexer(df[date_column].astype(str))
+    df = df[date_codes >= 0]
+    date_codes = date_codes[date_codes >= 0]
+    if df.empty:
+        return empty
+
+    pair_codes, pairs = pd.factorize(pd.MultiIndex.from_arrays([df[sls_line_column], df['context_name']]))
+    amounts = df[amount_column].to_numpy(dtype=float)
+    present = ~np.isnan(amounts) & (pair_codes >= 0)
+
+    # Sum into the matrix (a context can hold several context keys on one date)
+    shape = (len(pairs), len(dates))
+    matrix = np.zeros(shape)
+    counts = np.zeros(shape, dtype=np.int64)
+    np.add.at(matrix, (pair_codes[present], date_codes[present]), amounts[present])
+    np.add.at(counts, (pair_codes[present], date_codes[present]), 1)
+    matrix[counts == 0] = np.nan
+
+    previous = matrix[:, :-1]
+    current = matrix[:, 1:]
+    absolute = current - previous
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct = absolute / np.abs(previous) * 100
+    # Same convention as the two-date comparison: 0 -> 0 is no change, 0 -> x is infinite
+    pct = np.where((previous == 0) & ~np.isnan(current), np.where(current == 0, 0.0, np.inf), pct)
+
+    breaches = np.abs(pct) >= threshold_pct  # NaN (missing on either date) never breaches
+    max_abs_pct = np.where(breaches, np.abs(pct), -1.0).max(axis=1)
+    flagged = np.flatnonzero(breaches.any(axis=1))
+
+    def as_list(values):
+        return [None if np.isnan(v) else float(v) for v in values]
+
+    series = []
+    for row in flagged:
+        sls_line, context_name = pairs[row]
+        breach_steps = np.flatnonzero(breaches[row])
+        series.append({
+            "sls_line": sls_line,
+            "context_name": context_name,
+            "amounts": as_list(matrix[row]),
+            "percentage_changes": as_list(pct[row]),
+            "breaches": [{
+                "from_date": dates[step],
+                "to_date": dates[step + 1],
+                "absolute_variance": float(absolute[row, step]),
+                "percentage_variance": float(pct[row, step])
+            } for step in breach_steps],
+            "max_abs_percentage_variance": float(max_abs_pct[row])
+        })
+
+    sls_lines_with_variance = list(dict.fromkeys(item["sls_line"] for item in series))
+    # Largest variances first (partial selection); the rest is paginated
+    series, series_page = take_top_k(series, max_abs_pct[flagged], top_k, kind="trend_series")
+
+    return {
+        "pairs_analyzed": len(pairs),
+        "sls_lines_with_variance": sls_lines_with_variance,
+        "series": series,
+        "series_page": series_page,
+        "dates_without_data": [dates[i] for i in np.flatnonzero(counts.sum(axis=0) == 0)]
+    }
+
+# Register the function
+register_function("sls_variance_trend", sls_variance_trend, long_running=True, idempotent=True)
@@ -1,25 +1,172 @@
 # backend/functions/sync_adjustments.py
 import logging
 import requests
-import json
+import time
+import random
+import threading
 import traceback
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from functions.function_registry import register_function
+from config import Config
+from utils.log import summarize
+from services.admission import admit
+from services.circuit_breaker import protect, UNAVAILABLE_ERRORS
+from services.deadline import timeout_for, remaining
 
 logger = logging.getLogger(__name__)
 
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+_TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+# Shared HTTP session (keep-alive connection pool) and cached IDA token
+_session = None
+_session_lock = threading.Lock()
+_token_lock = threading.Lock()
+_cached_token = None
+_token_expires_at = 0
+
+def get_session():
+    """Get the shared requests.Session, sized for the configured batch concurrency."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            pool_size = max(Config.ADJUSTMENTS_MAX_CONCURRENCY, 1)
+            adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def get_access_token(force_refresh=False):
+    """
+    Get an IDA access token, reusing the cached one until shortly before it expires.
+    
+    The lifetime comes from the token response's expires_in when present,
+    otherwise Config.ADJUSTMENTS_TOKEN_TTL_SECONDS.
+    """
+    global _cached_token, _token_expires_at
+    with _token_lock:
+        if not force_refresh and _cached_token and time.time() < _token_expires_at:
+            return _cached_token
+        
+        logger.debug(f"Fetching access token from: {Config.ADJUSTMENTS_TOKEN_URL}")
+        token_response = request_with_retry("GET", Config.ADJUSTMENTS_TOKEN_URL, params={
+            "userSid": Config.ADJUSTMENTS_USER_SID,
+            "appId": Config.ADJUSTMENTS_APP_ID
+        })
+        token_response.raise_for_status()
+        
+        token_data = token_response.json()
+        access_token = token_data.get('access_token')
+        if not access_token:
+            raise ValueError("No access_token found in response")
+        
+        lifetime = float(token_data.get('expires_in') or Config.ADJUSTMENTS_TOKEN_TTL_SECONDS)
+        _cached_token = access_token
+        _token_expires_at = time.time() + max(lifetime - _TOKEN_REFRESH_MARGIN_SECONDS, 0)
+        logger.debug("Access token retrieved successfully")
+        return _cached_token
+
+def clear_token_cache():
+    global _cached_token, _token_expires_at
+    with _token_lock:
+        _cached_token = None
+        _token_expires_at = 0
+
+def request_with_retry(method, url, **kwargs):
+    """
+    Send a request on the shared session, retrying connection errors, timeouts,
+    429 and 5xx responses with exponential backoff and jitter.
+    
+    Each attempt's timeout and backoff are capped by the request deadline, and
+    5xx responses count against the adjustments circuit breaker.
+    
+    Returns:
+        requests.Response: The last response (callers check the status)
+    """
+    attempts = max(Config.ADJUSTMENTS_MAX_RETRIES, 0) + 1
+    for attempt in range(1, attempts + 1):
+        try:
+            try:
+                with protect("adjustments"), admit("adjustments"):
+                    response = get_session().request(
+                        method, url, timeout=timeout_for(Config.ADJUSTMENTS_TIMEOUT_SECONDS), **kwargs)
+                    if response.status_code >= 500:
+                        raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+            except requests.HTTPError as e:
+                response = e.response
+            if response.status_code not in RETRY_STATUS_CODES or attempt == attempts:
+                response.attempts = attempt
+                return response
+            reason = f"HTTP {response.status_code}"
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == attempts:
+                raise
+            reason = str(e)
+        delay = Config.ADJUSTMENTS_BACKOFF_SECONDS * (2 ** (attempt - 1)) * (0.5 + random.random())
+        left = remaining()
+        if left is not None:
+            delay = min(delay, left)
+        logger.warning(f"{method} {url} failed ({reason}); retry {attempt}/{attempts - 1} in {delay:.2f}s")
+        time.sleep(delay)
+
+def sync_batch(batch_index, dmat_ids, adjustment_type):
+    """
+    Send one batch of DMAT IDs to the adjustments callback.
+    
+    A 401/403 refreshes the token once and resends the batch.
+    
+    Returns:
+        dict: Per-batch result (batch, dmat_ids, success, status_code, attempts, error)
+    """
+    payload = {
+        "dmatIdList": dmat_ids,
+        "lriIdList": [],
+        "cobDateList": [],
+        "reportType": adjustment_type,
+        "actionType": "UPDATE"
+    }
+    result = {"batch": batch_index, "dmat_ids": dmat_ids, "success": False, "status_code": None, "attempts": 0}
+    try:
+        for force_refresh in (False, True):
+            headers = {
+                "Cache-Control": "no-cache",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "Cookie": get_access_token(force_refresh)
+            }
+            logger.debug("Triggering adjustment sync batch %d at: %s", batch_index, Config.ADJUSTMENTS_CALLBACK_URL)
+            logger.debug("Payload: %s", summarize(payload))
+            response = request_with_retry("POST", Config.ADJUSTMENTS_CALLBACK_URL, json=payload, headers=headers)
+            result["attempts"] += response.attempts
+            result["status_code"] = response.status_code
+            if response.status_code not in (401, 403):
+                break
+        response.raise_for_status()
+        result["success"] = True
+    except Exception as e:
+        logger.error(f"Error triggering adjustment sync batch {batch_index}: {str(e)}")
+        result["error"] = str(e)
+    return result
+
 def sync_adjustments(adjustment_type, dmat_ids):
     """
     Clear or sync stuck adjustments for specified DMAT IDs.
     
+    IDs are sent in batches of Config.ADJUSTMENTS_BATCH_SIZE, at most
+    Config.ADJUSTMENTS_MAX_CONCURRENCY at a time.
+    
     Args:
         adjustment_type (str): Type of adjustment - either "MDU" or "MSDU"
         dmat_ids (str): Comma-separated list of DMAT IDs to sync
         
     Returns:
-        dict: Status of the sync operation
+        dict: Status of the sync operation with per-batch results and the DMAT IDs that failed
     """
     try:
-        logger.info(f"Starting sync adjustments for type: {adjustment_type}, DMAT IDs: {dmat_ids}")
+        logger.info("Starting sync adjustments for type: %s, DMAT IDs: %s", adjustment_type, summarize(dmat_ids, 500))
         
         # Validate adjustment type
         if adjustment_type not in ["MDU", "MSDU"]:
@@ -48,26 +195,14 @@ def sync_adjustments(adjustment_type, dmat_ids):
                 "error": "No valid DMAT IDs provided."
             }
         
-        # Step 1: Get access token
+        # Drop duplicates, keep the order given
+        dmat_id_list = list(dict.fromkeys(dmat_id_list))
+        
+        # Step 1: Get access token (cached until it expires)
         try:
-            token_url = "https://lri-limits-indicators-api.apps.prod.na-5y.gap.jpmchase.net/ida/getTokens"
-            token_params = {
-                "userSid": "I792420",  # You might want to make this configurable
-                "appId": "adj"
-            }
-            
-            logger.debug(f"Fetching access token from: {token_url}")
-            token_response = requests.get(token_url, params=token_params)
-            token_response.raise_for_status()
-            
-            token_data = token_response.json()
-            access_token = token_data.get('access_token')
-            
-            if not access_token:
-                raise ValueError("No access_token found in response")
-                
-            logger.debug("Access token retrieved successfully")
-            
+            get_access_token()
+        except UNAVAILABLE_ERRORS:
+            raise
         except Exception as e:
             logger.error(f"Error getting access token: {str(e)}")
             return {
@@ -75,48 +210,40 @@ def sync_adjustments(adjustment_type, dmat_ids):
                 "error": f"Failed to retrieve access token: {str(e)}"
             }
         
-        # Step 2: Trigger adjustment sync
-        try:
-            callback_url = "https://lri-adjustments-api.gaiacloud.jpmchase.net/api/v2/adjustments/dmatcallback"
-            
-            headers = {
-                "Cache-Control": "no-cache",
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "Cookie": access_token
-            }
-            
-            payload = {
-                "dmatIdList": dmat_id_list,
-                "lriIdList": [],
-                "cobDateList": [],
-                "reportType": adjustment_type,
-                "actionType": "UPDATE"
-            }
-            
-            logger.debug(f"Triggering adjustment sync at: {callback_url}")
-            logger.debug(f"Payload: {json.dumps(payload)}")
-            
-            sync_response = requests.post(callback_url, json=payload, headers=headers)
-            sync_response.raise_for_status()
-            
+        # Step 2: Trigger adjustment sync in batches with bounded concurrency
+        batch_size = max(Config.ADJUSTMENTS_BATCH_SIZE, 1)
+        batches = [dmat_id_list[i:i + batch_size] for i in range(0, len(dmat_id_list), batch_size)]
+        logger.info(f"Syncing {len(dmat_id_list)} DMAT IDs in {len(batches)} batch(es) of up to {batch_size}")
+        
+        with ThreadPoolExecutor(max_workers=max(Config.ADJUSTMENTS_MAX_CONCURRENCY, 1)) as executor:
+            # Each batch runs in a copy of this context so the request deadline applies to it
+            futures = [executor.submit(contextvars.copy_context().run, sync_batch, index, batch, adjustment_type)
+                       for index, batch in enumerate(batches)]
+            batch_results = [future.result() for future in futures]
+        
+        synced_ids = [dmat_id for result in batch_results if result["success"] for dmat_id in result["dmat_ids"]]
+        failed_ids = [dmat_id for result in batch_results if not result["success"] for dmat_id in result["dmat_ids"]]
+        
+        if not failed_ids:
             logger.info("Adjustment sync triggered successfully")
-            
-            return {
-                "success": True,
-                "message": f"Sync successfully performed for {adjustment_type} adjustments on DMAT IDs: {', '.join(dmat_id_list)}",
-                "dmat_ids": dmat_id_list,
-                "adjustment_type": adjustment_type
-            }
-            
-        except Exception as e:
-            logger.error(f"Error triggering adjustment sync: {str(e)}")
-            logger.error(traceback.format_exc())
-            return {
-                "success": False,
-                "error": f"Failed to trigger adjustment sync: {str(e)}"
-            }
+            message = f"Sync successfully performed for {adjustment_type} adjustments on DMAT IDs: {', '.join(dmat_id_list)}"
+        else:
+            logger.warning(f"Adjustment sync failed for {len(failed_ids)} of {len(dmat_id_list)} DMAT IDs")
+            message = (f"Sync performed for {len(synced_ids)} of {len(dmat_id_list)} {adjustment_type} DMAT IDs. "
+                       f"Failed DMAT IDs (retry these): {', '.join(failed_ids)}")
+        
+        return {
+            "success": not failed_ids,
+            "message": message,
+            "dmat_ids": dmat_id_list,
+            "adjustment_type": adjustment_type,
+            "synced_dmat_ids": synced_ids,
+            "failed_dmat_ids": failed_ids,
+            "batches": batch_results
+        }
         
+    except UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         logger.error(f"Error in sync_adjustments: {str(e)}")
         logger.error(traceback.format_exc())
@@ -126,4 +253,4 @@ def sync_adjustments(adjustment_type, dmat_ids):
         }
 
 # Register the function
-register_function("sync_adjustments", sync_adjustments)
+register_function("sync_adjustments", sync_adjustments, long_running=True)
@@ -0,0 +1,223 @@
+# backend/loadtest/run_load_test.py
+"""
+Load generator for /api/chat.
+
+Replays a weighted mix of chat prompts at a target request rate while ramping
+concurrency, then reports latency percentiles, error rates and throughput per
+step. Results are written as sorted, indented JSON so two runs can be diffed.
+
+Usage:
+    python loadtest/run_load_test.py --stand-in --rps 20 --concurrency 1,5,10,25
+    python loadtest/run_load_test.py --url http://localhost:5000 --output results.json
+    python loadtest/run_load_test.py --stand-in --baseline results_prev.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from datetime import datetime
+import numpy as np
+import requests
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.log import configure_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'prompt_mix.json')
+
+def load_prompt_mix(path):
+    """Load the prompt mix configuration from JSON."""
+    with open(path, 'r') as mix_file:
+        return json.load(mix_file)
+
+def start_stand_in_server(latency_ms=None, port=0):
+    """
+    Start the Flask app in-process with stand-in backends.
+
+    Returns:
+        tuple: (base_url, server) - call server.shutdown() when done
+    """
+    from werkzeug.serving import make_server
+    from loadtest.stand_ins import install_stand_ins
+    from app import app
+
+    install_stand_ins(latency_ms)
+
+    server = make_server('127.0.0.1', port, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    return f"http://127.0.0.1:{server.server_port}", server
+
+def percentile(values, q):
+    """Return the q-th percentile of values in milliseconds, or None when empty."""
+    if not values:
+        return None
+    return round(float(np.percentile(values, q)), 1)
+
+def summarize_samples(samples, elapsed_seconds):
+    """Summarize a list of (category, latency_ms, ok) samples."""
+    latencies = [latency for _, latency, _ in samples]
+    errors = sum(1 for _, _, ok in samples if not ok)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0,
+        "throughput_rps": round(len(samples) / elapsed_seconds, 2) if elapsed_seconds > 0 else 0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99)
+    }
+
+def run_step(base_url, mix, concurrency, rps, duration, timeout):
+    """
+    Run one load step at a fixed concurrency.
+
+    Requests are scheduled at a fixed rate (open loop), so when the server falls
+    behind the in-flight count rises up to `concurrency` instead of the offered
+    load silently dropping.
+    """
+    prompts = mix['prompts']
+    weights = [prompt.get('weight', 1) for prompt in prompts]
+    interval = 1.0 / rps if rps > 0 else 0
+
+    samples = []
+    samples_lock = threading.Lock()
+    slot_lock = threading.Lock()
+    next_slot = [0]
+    start = time.perf_counter()
+    stop_at = start + duration
+
+    def worker():
+        session = requests.Session()
+        rng = random.Random()
+        while True:
+            with slot_lock:
+                slot = next_slot[0]
+                next_slot[0] += 1
+            scheduled = start + slot * interval
+            # Late slots are dropped once the step is over so a saturated
+            # server shows up as lower throughput rather than a longer step
+            if scheduled >= stop_at or time.perf_counter() >= stop_at:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            prompt = rng.choices(prompts, weights=weights)[0]
+            message = rng.choice(prompt['messages'])
+
+            request_start = time.perf_counter()
+            try:
+                response = session.post(
+                    f"{base_url}/api/chat",
+                    json={"message": message, "history": []},
+                    timeout=timeout
+                )
+                ok = response.status_code == 200 and 'error' not in response.json()
+            except Exception as e:
+                logger.debug(f"Request failed: {str(e)}")
+                ok = False
+            latency_ms = (time.perf_counter() - request_start) * 1000
+
+            with samples_lock:
+                samples.append((prompt['category'], latency_ms, ok))
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    step = summarize_samples(samples, elapsed)
+    step["concurrency"] = concurrency
+    step["target_rps"] = rps
+    step["categories"] = {
+        category: summarize_samples([s for s in samples if s[0] == category], elapsed)
+        for category in sorted({prompt['category'] for prompt in prompts})
+    }
+    return step
+
+def compare_with_baseline(results, baseline):
+    """Print per-step p95 latency and throughput deltas against a previous run."""
+    baseline_steps = {step['concurrency']: step for step in baseline.get('steps', [])}
+    print("\n=== Compared with baseline ===")
+    print(f"{'conc':>6} {'p95 ms':>18} {'throughput rps':>22} {'error rate':>20}")
+    for step in results['steps']:
+        previous = baseline_steps.get(step['concurrency'])
+        if not previous:
+            continue
+
+        def delta(key):
+            old, new = previous.get(key), step.get(key)
+            if old is None or new is None:
+                return f"{new}"
+            return f"{old} -> {new}"
+
+        print(f"{step['concurrency']:>6} {delta('p95_ms'):>18} {delta('throughput_rps'):>22} {delta('error_rate'):>20}")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Load test /api/chat with a configurable prompt mix")
+    arg_parser.add_argument('--url', help="Base URL of a running backend (default: start one with stand-ins)")
+    arg_parser.add_argument('--stand-in', action='store_true', help="Run the app in-process with stand-in backends")
+    arg_parser.add_argument('--mix', default=DEFAULT_MIX_PATH, help="Prompt mix JSON file")
+    arg_parser.add_argument('--rps', type=float, default=10, help="Target requests per second for each step")
+    arg_parser.add_argument('--concurrency', default="1,5,10,25,50", help="Comma-separated concurrency ramp")
+    arg_parser.add_argument('--duration', type=float, default=30, help="Seconds per step")
+    arg_parser.add_argument('--timeout', type=float, default=120, help="Per-request timeout in seconds")
+    arg_parser.add_argument('--output', default="load_test_results.json", help="Where to write the JSON results")
+    arg_parser.add_argument('--baseline', help="Previous results JSON to compare against")
+    args = arg_parser.parse_args()
+
+    configure_logging()
+
+    mix = load_prompt_mix(args.mix)
+    concurrency_steps = [int(c) for c in args.concurrency.split(',') if c.strip()]
+
+    server = None
+    base_url = args.url
+    if args.stand_in or not base_url:
+        base_url, server = start_stand_in_server(mix.get('stand_in_latency_ms'))
+        logger.info(f"Stand-in backend listening on {base_url}")
+
+    results = {
+        "started_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "target": "stand-in" if server else base_url,
+        "config": {
+            "mix": os.path.basename(args.mix),
+            "rps": args.rps,
+            "duration_seconds": args.duration,
+            "concurrency_steps": concurrency_steps
+        },
+        "steps": []
+    }
+
+    try:
+        print(f"{'conc':>6} {'reqs':>6} {'err%':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for concurrency in concurrency_steps:
+            step = run_step(base_url, mix, concurrency, args.rps, args.duration, args.timeout)
+            results["steps"].append(step)
+            print(f"{concurrency:>6} {step['requests']:>6} {step['error_rate'] * 100:>6.1f} "
+                  f"{step['throughput_rps']:>8} {step['p50_ms']!s:>9} {step['p95_ms']!s:>9} {step['p99_ms']!s:>9}")
+    finally:
+        if server:
+            server.shutdown()
+
+    with open(args.output, 'w') as output_file:
+        json.dump(results, output_file, indent=2, sort_keys=True)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as baseline_file:
+            compare_with_baseline(results, json.load(baseline_file))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# backend/loadtest/stand_ins.py
+import random
+import re
+import time
+import json
+import logging
+from types import SimpleNamespace
+from functions.function_registry import register_function, is_long_running, is_idempotent
+
+logger = logging.getLogger(__name__)
+
+# Default latency ranges (milliseconds) used when the prompt mix does not override them
+DEFAULT_LATENCY_MS = {
+    "openai": [300, 900],
+    "get_6g_status": [400, 1500],
+    "sls_details_variance": [1500, 4000],
+    "sync_adjustments": [200, 600]
+}
+
+_latency_ms = dict(DEFAULT_LATENCY_MS)
+
+def _simulate_latency(backend):
+    """Sleep for a random duration within the configured range for a backend."""
+    low, high = _latency_ms.get(backend, [0, 0])
+    time.sleep(random.uniform(low, high) / 1000.0)
+
+def _pick_function_call(message):
+    """Mimic the model's function selection with simple keyword rules."""
+    text = message.lower()
+
+    if 'status' in text or '6g' in text:
+        match = re.search(r'\d{2}-\d{2}-\d{4}', message)
+        args = {"cob_date": match.group(0) if match else "04-03-2025"}
+        if 'inflow asset' in text:
+            args["table_name"] = "Inflow Asset"
+        return "get_6g_status", args
+
+    if 'variance' in text:
+        dates = re.findall(r'\d{4}-\d{2}-\d{2}', message)
+        args = {
+            "date1": dates[0] if len(dates) > 0 else "2025-04-02",
+            "date2": dates[1] if len(dates) > 1 else "2025-04-03"
+        }
+        products = re.search(r'for ([A-Z]{2}-\d{2}(?:,[A-Z]{2}-\d{2})*)', message)
+        if products:
+            args["product_identifiers"] = products.group(1)
+        return "sls_details_variance", args
+
+    if 'sync' in text or 'adjustment' in text:
+        ids = re.findall(r'\d{7}', message)
+        adjustment_type = "MSDU" if 'msdu' in text else "MDU"
+        return "sync_adjustments", {"adjustment_type": adjustment_type, "dmat_ids": ",".join(ids)}
+
+    if 'time' in text or 'hours' in text:
+        return "time_remaining", {}
+
+    return None, None
+
+def stand_in_openai_response(message, history=None, function_result=None, **kwargs):
+    """
+    Stand-in for get_openai_response that never leaves the process.
+
+    Returns an object shaped like the OpenAI message (content / function_call).
+    """
+    _simulate_latency("openai")
+
+    if function_result:
+        content = f"Stand-in summary of {function_result.get('name', '')}: " \
+                  f"{json.dumps(function_result.get('result', {}), default=str)[:200]}"
+        return SimpleNamespace(content=content, function_call=None)
+
+    function_name, args = _pick_function_call(message)
+    if not function_name:
+        return SimpleNamespace(content="Stand-in reply.", function_call=None)
+
+    return SimpleNamespace(
+        content=None,
+        function_call=SimpleNamespace(name=function_name, arguments=json.dumps(args))
+    )
+
+def stand_in_get_6g_status(cob_date, table_name=None):
+    """Stand-in for get_6g_status returning a 13-table payload."""
+    _simulate_latency("get_6g_status")
+    tables = []
+    for i in range(13):
+        status = "COMPLETED" if i < 8 else ("RUNNING" if i < 10 else "PENDING")
+        tables.append({
+            "bpf_id": str(6101 + i),
+            "name": f"Table {i + 1}",
+            "status": status,
+            "start_time": "2025-04-03 18:00:00" if status != "PENDING" else None,
+            "end_time": "2025-04-03 18:45:00" if status == "COMPLETED" else None
+        })
+    return {
+        "success": True,
+        "cob_date": cob_date,
+        "tables_completed": 8,
+        "tables_running": 2,
+        "tables_pending": 3,
+        "total_tables": 13,
+        "tables": tables
+    }
+
+def stand_in_sls_details_variance(date1, date2, product_identifiers=None):
+    """Stand-in for sls_details_variance returning a small variance payload."""
+    _simulate_latency("sls_details_variance")
+    variance_data = [{
+        "sls_line": f"O.D.{i}",
+        "context_name": "US_BANK",
+        "amount_date1": 1000.0 + i,
+        "amount_date2": 1200.0 + i,
+        "absolute_variance": 200.0,
+        "percentage_variance": 20.0
+    } for i in range(20)]
+    return {
+        "success": True,
+        "date1": date1,
+        "date2": date2,
+        "reporting_table_analysis": {"variance_data": variance_data, "missing_pairs": []}
+    }
+
+def stand_in_sync_adjustments(adjustment_type, dmat_ids):
+    """Stand-in for sync_adjustments that pretends the callback succeeded."""
+    _simulate_latency("sync_adjustments")
+    dmat_id_list = [dmat_id.strip() for dmat_id in dmat_ids.split(',') if dmat_id.strip()]
+    return {
+        "success": True,
+        "dmat_ids": dmat_id_list,
+        "adjustment_type": adjustment_type
+    }
+
+def _replace_function(name, stand_in):
+    # Keep the real function's flags so long-running calls still go through the job queue
+    register_function(name, stand_in, long_running=is_long_running(name), idempotent=is_idempotent(name))
+
+def install_stand_ins(latency_ms=None):
+    """
+    Replace the OpenAI client and the database-backed functions with stand-ins.
+
+    Args:
+        latency_ms (dict, optional): Per-backend [min, max] latency overrides in milliseconds
+    """
+    import functions  # noqa: F401 (registers the real functions and their flags)
+    import api.chat_routes as chat_routes
+
+    if latency_ms:
+        _latency_ms.update(latency_ms)
+
+    chat_routes.get_openai_response = stand_in_openai_response
+    _replace_function("get_6g_status", stand_in_get_6g_status)
+    _replace_function("sls_details_variance", stand_in_sls_details_variance)
+    _replace_function("sync_adjustments", stand_in_sync_adjustments)
+
+    logger.info(f"Stand-in backends installed with latencies: {_latency_ms}")
@@ -0,0 +1,144 @@
+# backend/services/admission.py
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from config import Config
+from services import metrics
+from services.deadline import remaining
+
+logger = logging.getLogger(__name__)
+
+class AdmissionRejected(Exception):
+    """Raised when a backend's wait queue is full or the wait timed out (mapped to HTTP 503)."""
+
+    def __init__(self, backend, message, retry_after=None):
+        super().__init__(message)
+        self.backend = backend
+        self.retry_after = retry_after
+
+class BackendLimiter:
+    """
+    Concurrency limit with a bounded FIFO wait queue for one backend.
+
+    At most max_concurrent calls run at once; up to max_queue more wait in
+    arrival order for at most queue_timeout seconds. Anything beyond that is
+    rejected immediately, so a saturated backend answers "busy" instead of
+    piling up sessions and stretching every request's latency.
+    """
+
+    def __init__(self, name, max_concurrent, max_queue, queue_timeout=None):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = Config.ADMISSION_QUEUE_TIMEOUT_SECONDS if queue_timeout is None else queue_timeout
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters = deque()
+
+    def _acquire(self):
+        with self._lock:
+            if self._active < self.max_concurrent and not self._waiters:
+                self._active += 1
+                return
+            if len(self._waiters) >= self.max_queue:
+                metrics.increment(f"admission.{self.name}.rejected")
+                raise AdmissionRejected(
+                    self.name,
+                    f"The {self.name} backend is busy ({self._active} running, {len(self._waiters)} waiting); "
+                    f"please try again shortly.",
+                    retry_after=max(int(self.queue_timeout), 1))
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+
+        # Never wait past the request's deadline
+        left = remaining()
+        wait_seconds = self.queue_timeout if left is None else min(self.queue_timeout, left)
+        if waiter.wait(wait_seconds):
+            return  # the releasing thread handed its slot over
+        with self._lock:
+            if waiter.is_set():
+                return  # handed over just as the wait timed out
+            self._waiters.remove(waiter)
+        metrics.increment(f"admission.{self.name}.timed_out")
+        raise AdmissionRejected(
+            self.name,
+            f"Timed out after {round(wait_seconds, 1)}s waiting for the {self.name} backend; please try again shortly.",
+            retry_after=max(int(self.queue_timeout), 1))
+
+    def _release(self):
+        with self._lock:
+            if self._waiters:
+                # Hand the slot straight to the oldest waiter (active count unchanged)
+                self._waiters.popleft().set()
+            else:
+                self._active -= 1
+
+    @contextmanager
+    def admit(self):
+        """Hold one of the backend's slots for the duration of the block."""
+        start = time.perf_counter()
+        self._acquire()
+        metrics.increment(f"admission.{self.name}.admitted")
+        metrics.observe(f"admission.{self.name}.queue_ms", (time.perf_counter() - start) * 1000)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "active": self._active,
+                "waiting": len(self._waiters),
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue
+            }
+
+def parse_limits(spec):
+    """Parse 'backend=max_concurrent:max_queue,...' into {backend: (max_concurrent, max_queue)}."""
+    limits = {}
+    for item in (spec or "").split(','):
+        name, _, values = item.partition('=')
+        if not name.strip() or not values.strip():
+            continue
+        max_concurrent, _, max_queue = values.partition(':')
+        limits[name.strip()] = (int(max_concurrent), int(max_queue or 0))
+    return limits
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(backend):
+    """Get the limiter for a backend ('oracle', 'impala', 'yarn', 'openai', 'adjustments')."""
+    with _limiters_lock:
+        limiter = _limiters.get(backend)
+        if limiter is None:
+            max_concurrent, max_queue = parse_limits(Config.ADMISSION_LIMITS).get(
+                backend, (Config.ADMISSION_DEFAULT_CONCURRENCY, Config.ADMISSION_DEFAULT_QUEUE))
+            limiter = _limiters[backend] = BackendLimiter(backend, max_concurrent, max_queue)
+        return limiter
+
+@contextmanager
+def admit(backend):
+    """
+    Run the enclosed outbound call under the backend's concurrency limit.
+
+        with admit("impala"):
+            cursor.execute(query)
+
+    Raises:
+        AdmissionRejected: The wait queue is full or the wait timed out
+    """
+    if not Config.ADMISSION_ENABLED:
+        yield
+        return
+    with get_limiter(backend).admit():
+        yield
+
+def get_admission_report():
+    """Current slots in use and queue depth per backend."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.snapshot() for limiter in limiters}
@@ -1,11 +1,40 @@
 # backend/services/azure_openai.py
 # Add this at the top
+import os
+import json
+import time
+import hashlib
 import logging
+import threading
 import traceback
+from collections import OrderedDict
+from openai import AzureOpenAI
+from azure.identity import CertificateCredential
+from config import Config
+from utils.serialization import dumps_str
+from utils.log import summarize
+from services import metrics
+from services.admission import admit
+from services.circuit_breaker import protect
+from services.deadline import timeout_for
 
 logger = logging.getLogger(__name__)
 
+# Cached bearer token; refreshed shortly before it expires
+_token_lock = threading.Lock()
+_cached_token = None
+_TOKEN_REFRESH_MARGIN_SECONDS = 300
+
 def get_access_token():
+    """Get a bearer token for Azure OpenAI, reusing the cached one until it is close to expiry."""
+    global _cached_token
+    with _token_lock:
+        if _cached_token and _cached_token.expires_on - time.time() > _TOKEN_REFRESH_MARGIN_SECONDS:
+            return _cached_token.token
+        _cached_token = _fetch_access_token()
+        return _cached_token.token
+
+def _fetch_access_token():
     try:
         logger.debug("Getting access token...")
         dir_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
@@ -33,7 +62,7 @@ def get_access_token():
             logging_enable=True  # Enable Azure SDK logging
         )
         
-        access_token = credential.get_token(scope).token
+        access_token = credential.get_token(scope)
         logger.debug("Access token obtained successfully")
         
         return access_token
@@ -42,16 +71,266 @@ def get_access_token():
         logger.error(traceback.format_exc())
         raise
 
-def get_openai_response(message, history=None, function_result=None):
+MODEL = "gpt-4o-2024-08-06"
+
+SYSTEM_MESSAGE = {"role": "system", "content": "You are LROT, an AI assistant that can help with various tasks."}
+
+# Function schemas offered to the model. Kept as one module-level constant so the
+# request prefix is byte-identical on every call (Azure prompt caching).
+FUNCTIONS = [
+    {
+        "name": "sls_details_variance",
+        "description": "Calculate comprehensive variance or drops for 6G (2052a)data between two dates",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "date1": {"type": "string", "description": "First date in format YYYY-MM-DD"},
+                "date2": {"type": "string", "description": "Second date in format YYYY-MM-DD"},
+                "product_identifiers": {"type": "string", "description": "Optional: Comma-separated list of product identifiers (e.g., 'OS-09,OS-10')"},
+                "top_k": {"type": "integer", "description": "Optional: Number of largest variances to return per table (default 50); the rest can be fetched with variance_page"},
+                "sort_by": {"type": "string", "description": "Optional: Rank variances by 'percentage' (default) or 'absolute' variance"}
+            },
+            "required": ["date1", "date2"]
+        }
+    },
+    {
+        "name": "sls_details_variance",
+        "description": "Calculate variance for SLS details between two dates",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "date1": {"type": "string", "description": "First date in format YYYY-MM-DD"},
+                "date2": {"type": "string", "description": "Second date in format YYYY-MM-DD"}
+            },
+            "required": ["date1", "date2"]
+        }
+    },
+    {
+        "name": "sls_variance_trend",
+        "description": "Track how 6G (2052a) SLS line amounts drift across several dates (a week, a month) and list the lines whose day-over-day variance crosses the threshold anywhere in the window, with their series",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "dates": {"type": "string", "description": "Optional: Comma-separated dates in format YYYY-MM-DD"},
+                "start_date": {"type": "string", "description": "Optional: First date of a range in format YYYY-MM-DD (business days are used)"},
+                "end_date": {"type": "string", "description": "Optional: Last date of a range in format YYYY-MM-DD"},
+                "table": {"type": "string", "description": "Optional: 'reporting' (default), 'base_data' or 'sls_details'"},
+                "product_identifiers": {"type": "string", "description": "Optional: Comma-separated list of product identifiers (reporting table only)"},
+                "threshold_pct": {"type": "number", "description": "Optional: Day-over-day variance threshold in percent (default 10)"},
+                "top_k": {"type": "integer", "description": "Optional: Number of series to return (default 50); the rest can be fetched with variance_page"}
+            }
+        }
+    },
+    {
+        "name": "variance_page",
+        "description": "Fetch the next page of variance rows, missing pairs or trend series that were left out of a previous variance result",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "cursor": {"type": "string", "description": "The next_cursor value from the previous result or page"},
+                "page_size": {"type": "integer", "description": "Optional: Rows per page (default 50)"}
+            },
+            "required": ["cursor"]
+        }
+    },
+    {
+        "name": "s3_inventory",
+        "description": "Get exact file counts and sizes of the S3 reporting data, in total and per partition (e.g. per COB date)",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "prefix": {"type": "string", "description": "Optional: S3 key prefix (default 'refined/reporting/')"},
+                "full_refresh": {"type": "boolean", "description": "Optional: Re-list every partition instead of only new and recent ones"},
+                "top_k": {"type": "integer", "description": "Optional: Number of largest partitions to return (default 50); the rest can be fetched with variance_page"}
+            }
+        }
+    },
+    {
+        "name": "job_status",
+        "description": "Get the status and, once finished, the result of a background job started by a long-running function (variance analysis, variance trend, adjustment sync)",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "job_id": {"type": "string", "description": "The job_id returned when the function was started"}
+            },
+            "required": ["job_id"]
+        }
+    },
+    {
+        "name": "time_remaining",
+        "description": "Get current time and time remaining until EOD (5PM EST)",
+        "parameters": {
+            "type": "object",
+            "properties": {}
+        }
+    },
+    {
+        "name": "get_6g_status",
+        "description": "Get the status of the FR2052a (6G) batch process for a specific date, including P50/P90 estimates of when all tables will be done",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "cob_date": {"type": "string", "description": "The COB date in MM-DD-YYYY format"},
+                "table_name": {"type": "string", "description": "Optional: Specific table name or BPF ID to check"}
+            },
+            "required": ["cob_date"]
+        }
+    },
+    {
+        "name": "sync_adjustments",
+        "description": "Clear or sync stuck adjustments for specified DMAT IDs",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "adjustment_type": {"type": "string", "description": "Type of adjustment - either 'MDU' or 'MSDU'"},
+                "dmat_ids": {"type": "string", "description": "Comma-separated list of DMAT IDs to sync (e.g., '2015305,2015306')"}
+            },
+            "required": ["adjustment_type", "dmat_ids"]
+        }
+    }
+]
+
+def build_messages(message, history=None, function_result=None, session_messages=None):
     """
-    Get a response from Azure OpenAI API.
+    Build the message list for a chat completion.
+
+    Args:
+        message (str): The new user message
+        history (list, optional): Client-sent history of {"user", "assistant"} entries
+        function_result (dict, optional): {"name", "result"} of the function the model called
+        session_messages (list, optional): Stored conversation messages; replaces history
+
+    Returns:
+        list: System message, prior turns, the user message and the function result
+    """
+    messages = [SYSTEM_MESSAGE]
+    
+    if session_messages is not None:
+        # Stored verbatim, so the prefix matches the previous turn's request byte for byte
+        messages.extend(session_messages)
+    else:
+        # Add chat history
+        for entry in history or []:
+            messages.append({"role": "user", "content": entry.get("user", "")})
+            if "assistant" in entry:
+                messages.append({"role": "assistant", "content": entry.get("assistant", "")})
+    
+    # Add current message
+    messages.append({"role": "user", "content": message})
+    
+    # If we have a function result, add it
+    if function_result:
+        messages.append({
+            "role": "function", 
+            "name": function_result.get("name", ""),
+            "content": dumps_str(function_result.get("result", {}))
+        })
+    return messages
+
+def completion_cache_key(messages, functions=None, model=MODEL):
+    """
+    Hash a completion request: model, function schemas and the message list.
+
+    User and assistant text is whitespace-normalized so trivially different
+    phrasings share an entry; function results (part of the message list) are
+    hashed exactly as sent.
+    """
+    normalized = []
+    for entry in messages:
+        entry = dict(entry)
+        if entry.get("role") in ("user", "assistant") and isinstance(entry.get("content"), str):
+            entry["content"] = " ".join(entry["content"].split())
+        normalized.append(entry)
+    payload = json.dumps({"model": model, "functions": FUNCTIONS if functions is None else functions,
+                          "messages": normalized}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class CompletionCache:
+    """
+    LRU cache of chat completion messages with a TTL.
+
+    Identical requests (same normalized messages, function results, schemas
+    and model) are answered from here instead of calling Azure OpenAI again.
     """
-    logger.debug(f"Getting OpenAI response for message: {message}")
+
+    def __init__(self, max_entries=None, ttl_seconds=None):
+        self.max_entries = Config.COMPLETION_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.ttl_seconds = Config.COMPLETION_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._entries = OrderedDict()  # key -> (stored_at, message)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                metrics.increment("completion_cache.misses")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            metrics.increment("completion_cache.hits")
+            return entry[1]
+
+    def put(self, key, message):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.time(), message)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+_completion_cache = CompletionCache()
+
+def get_completion_cache():
+    """Get the shared completion cache."""
+    return _completion_cache
+
+def get_openai_response(message, history=None, function_result=None, session_messages=None, use_cache=True):
+    """
+    Get a response from Azure OpenAI API.
     
-    if history is None:
-        history = []
+    Prior turns come from session_messages (server-side session) when given,
+    otherwise from the client-sent history. Identical requests are answered
+    from the completion cache unless use_cache is False (or
+    COMPLETION_CACHE_ENABLED is off).
+    """
+    logger.debug("Getting OpenAI response for message: %s", summarize(message))
     
     try:
+        # Construct messages for API
+        logger.debug("Constructing messages for API request...")
+        messages = build_messages(message, history, function_result, session_messages)
+        
+        cache_key = None
+        if use_cache and Config.COMPLETION_CACHE_ENABLED:
+            cache_key = completion_cache_key(messages)
+            cached = _completion_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Completion cache hit %s", cache_key[:12])
+                return cached
+        elif Config.COMPLETION_CACHE_ENABLED:
+            metrics.increment("completion_cache.bypassed")
+        
         # Get access token
         token = get_access_token()
         
@@ -61,7 +340,7 @@ def get_openai_response(message, history=None, function_result=None):
             raise ValueError("AZURE_OPENAI_ENDPOINT environment variable is not set")
             
         azure_endpoint = os.environ.get("AZURE_OPENAI_ENDPOINT")
-        logger.debug(f"Azure OpenAI Endpoint: {azure_endpoint}")
+        logger.debug("Azure OpenAI Endpoint: %s", azure_endpoint)
         
         # Initialize Azure OpenAI client
         logger.debug("Initializing OpenAI client...")
@@ -75,88 +354,6 @@ def get_openai_response(message, history=None, function_result=None):
             }
         )
         
-        # Construct messages for API
-        logger.debug("Constructing messages for API request...")
-        messages = [{"role": "system", "content": "You are LROT, an AI assistant that can help with various tasks."}]
-        
-        # Add chat history
-        for entry in history:
-            messages.append({"role": "user", "content": entry.get("user", "")})
-            if "assistant" in entry:
-                messages.append({"role": "assistant", "content": entry.get("assistant", "")})
-        
-        # Add current message
-        messages.append({"role": "user", "content": message})
-        
-        # If we have a function result, add it
-        if function_result:
-            messages.append({
-                "role": "function", 
-                "name": function_result.get("name", ""),
-                "content": json.dumps(function_result.get("result", {}))
-            })
-        
-        # Define available functions
-        # Define available functions
-        functions = [
-        {   
-            "name": "sls_details_variance",
-            "description": "Calculate comprehensive variance or drops for 6G (2052a)data between two dates",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "date1": {"type": "string", "description": "First date in format YYYY-MM-DD"},
-                    "date2": {"type": "string", "description": "Second date in format YYYY-MM-DD"},
-                    "product_identifiers": {"type": "string", "description": "Optional: Comma-separated list of product identifiers (e.g., 'OS-09,OS-10')"}
-                },
-                "required": ["date1", "date2"]
-            }
-        },
-            {
-                "name": "sls_details_variance",
-                "description": "Calculate variance for SLS details between two dates",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "date1": {"type": "string", "description": "First date in format YYYY-MM-DD"},
-                        "date2": {"type": "string", "description": "Second date in format YYYY-MM-DD"}
-                    },
-                    "required": ["date1", "date2"]
-                }
-            },
-            {
-                "name": "time_remaining",
-                "description": "Get current time and time remaining until EOD (5PM EST)",
-                "parameters": {
-                    "type": "object",
-                    "properties": {}
-                }
-            },
-            {
-                "name": "get_6g_status",
-                "description": "Get the status of the FR2052a (6G) batch process for a specific date",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "cob_date": {"type": "string", "description": "The COB date in MM-DD-YYYY format"},
-                        "table_name": {"type": "string", "description": "Optional: Specific table name or BPF ID to check"}
-                    },
-                    "required": ["cob_date"]
-                }
-            },
-            {
-                "name": "sync_adjustments",
-                "description": "Clear or sync stuck adjustments for specified DMAT IDs",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "adjustment_type": {"type": "string", "description": "Type of adjustment - either 'MDU' or 'MSDU'"},
-                        "dmat_ids": {"type": "string", "description": "Comma-separated list of DMAT IDs to sync (e.g., '2015305,2015306')"}
-                    },
-                    "required": ["adjustment_type", "dmat_ids"]
-                }
-            }            
-        ]
 #        functions = [
 #            {
 #                "name": "sls_details_variance",
@@ -182,16 +379,21 @@ def get_openai_response(message, history=None, function_result=None):
 
         # Call Azure OpenAI API
         logger.debug("Calling OpenAI API...")
-        response = client.chat.completions.create(
-            model="gpt-4o-2024-08-06",
-            messages=messages,
-            functions=functions,
-            function_call="auto"
-        )
+        with protect("openai"), admit("openai"):
+            response = client.chat.completions.create(
+                model=MODEL,
+                messages=messages,
+                functions=FUNCTIONS,
+                function_call="auto",
+                timeout=timeout_for(Config.OPENAI_TIMEOUT_SECONDS)
+            )
         
-        logger.debug(f"OpenAI API response received: {response}")
+        logger.debug("OpenAI API response received: %s", summarize(response))
         
-        return response.choices[0].message
+        reply = response.choices[0].message
+        if cache_key is not None:
+            _completion_cache.put(cache_key, reply)
+        return reply
         
     except Exception as e:
         logger.error(f"Error in get_openai_response: {str(e)}")
@@ -0,0 +1,220 @@
+# backend/services/circuit_breaker.py
+import time
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from config import Config
+from services import metrics
+from services.admission import AdmissionRejected
+from services.deadline import DeadlineExceeded, cut_short_by_deadline
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Raised before the dependency was contacted; they say nothing about its health
+_NOT_DEPENDENCY_FAILURES = (AdmissionRejected, DeadlineExceeded)
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a dependency whose breaker is open (mapped to HTTP 503)."""
+
+    def __init__(self, dependency, retry_after):
+        super().__init__(f"The {dependency} backend is unavailable (circuit open); "
+                         f"retrying in {int(retry_after) + 1}s.")
+        self.backend = dependency
+        self.retry_after = int(retry_after) + 1
+
+# Errors that mean "try again later" rather than "this call is broken". Function
+# handlers re-raise them instead of folding them into an error result, so the
+# API can answer 503 (with Retry-After) or 504.
+UNAVAILABLE_ERRORS = (AdmissionRejected, CircuitOpen, DeadlineExceeded)
+
+class CircuitBreaker:
+    """
+    Per-dependency circuit breaker with a last-known-good snapshot store.
+
+    After failure_threshold consecutive failures the breaker opens and calls
+    fail fast with CircuitOpen for reset_seconds. Then one trial call is let
+    through (half-open): success closes the breaker, failure re-opens it.
+
+    Callers that can tolerate stale data remember() each good result and fall
+    back to last_good() while the breaker is open.
+    """
+
+    def __init__(self, name, failure_threshold=None, reset_seconds=None, max_snapshots=32):
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.BREAKER_FAILURE_THRESHOLD
+        self.reset_seconds = Config.BREAKER_RESET_SECONDS if reset_seconds is None else reset_seconds
+        self.max_snapshots = max_snapshots
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._last_error = None
+        self._snapshots = OrderedDict()
+
+    def before_call(self):
+        """Check the breaker before contacting the dependency; raises CircuitOpen to fail fast."""
+        with self._lock:
+            if self._state == OPEN:
+                waited = time.monotonic() - self._opened_at
+                if waited < self.reset_seconds:
+                    metrics.increment(f"breaker.{self.name}.short_circuited")
+                    raise CircuitOpen(self.name, self.reset_seconds - waited)
+                self._state = HALF_OPEN
+                logger.info("Circuit for %s is half-open; letting a trial call through", self.name)
+            if self._state == HALF_OPEN:
+                if self._trial_in_flight:
+                    metrics.increment(f"breaker.{self.name}.short_circuited")
+                    raise CircuitOpen(self.name, 0)
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("Circuit for %s closed", self.name)
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self, error):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            self._last_error = str(error)
+            metrics.increment(f"breaker.{self.name}.failures")
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.warning("Circuit for %s opened after %d failures: %s", self.name, self._failures, error)
+                    metrics.increment(f"breaker.{self.name}.opened")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def record_skipped(self):
+        """The call never reached the dependency; free the half-open trial slot."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    @contextmanager
+    def protect(self):
+        """Run the enclosed call through the breaker, recording its outcome."""
+        self.before_call()
+        try:
+            yield
+        except _NOT_DEPENDENCY_FAILURES:
+            self.record_skipped()
+            raise
+        except Exception as e:
+            if cut_short_by_deadline():
+                # The request's budget ran out, not the dependency's own timeout
+                metrics.increment(f"breaker.{self.name}.deadline_cut")
+                self.record_skipped()
+            else:
+                self.record_failure(e)
+            raise
+        except BaseException:
+            # e.g. GeneratorExit when a streaming consumer stops early
+            self.record_skipped()
+            raise
+        else:
+            self.record_success()
+
+    def remember(self, key, value):
+        """Store a good result as the last-known-good snapshot for key."""
+        with self._lock:
+            self._snapshots[key] = (time.time(), value)
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+
+    def last_good(self, key):
+        """
+        Get the last-known-good snapshot for key.
+
+        Returns:
+            tuple: (value, age_seconds), or (None, None) when nothing was remembered
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            return None, None
+        stored_at, value = snapshot
+        return value, time.time() - stored_at
+
+    def snapshot(self):
+        with self._lock:
+            state = self._state
+            if state == OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                state = HALF_OPEN  # the next call will be the trial
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "last_error": self._last_error,
+                "snapshots": len(self._snapshots)
+            }
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(dependency):
+    """Get the breaker for a dependency ('oracle', 'impala', 'yarn', 'openai', 'adjustments')."""
+    with _breakers_lock:
+        breaker = _breakers.get(dependency)
+        if breaker is None:
+            breaker = _breakers[dependency] = CircuitBreaker(dependency)
+        return breaker
+
+@contextmanager
+def protect(dependency):
+    """
+    Run the enclosed outbound call through the dependency's breaker.
+
+        with protect("oracle"), admit("oracle"):
+            cursor.execute(query)
+
+    Raises:
+        CircuitOpen: The breaker is open; the dependency was not contacted
+    """
+    if not Config.BREAKER_ENABLED:
+        yield
+        return
+    with get_breaker(dependency).protect():
+        yield
+
+def call_with_fallback(dependency, key, func, *args, **kwargs):
+    """
+    Call func and remember its result; serve the last-known-good result while the breaker is open.
+
+    Args:
+        dependency (str): Breaker name
+        key: Snapshot key (e.g. ('status', cob_date, table_name))
+        func (callable): The call to make
+
+    Returns:
+        tuple: (result, age_seconds) where age_seconds is None for a fresh result
+
+    Raises:
+        CircuitOpen: The breaker is open and there is no snapshot for key
+    """
+    breaker = get_breaker(dependency)
+    try:
+        result = func(*args, **kwargs)
+    except CircuitOpen:
+        value, age = breaker.last_good(key)
+        if age is None:
+            raise
+        metrics.increment(f"breaker.{dependency}.served_stale")
+        logger.warning("Serving %ds old %s snapshot for %s while its circuit is open", age, dependency, key)
+        return value, age
+    breaker.remember(key, result)
+    return result, None
+
+def get_breaker_report():
+    """Current state of every breaker that has been used."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
@@ -0,0 +1,172 @@
+# backend/services/cpu_pool.py
+import logging
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import pandas as pd
+from config import Config
+from services import metrics
+
+try:
+    import pyarrow as pa
+except ImportError:  # DataFrames are pickled instead
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# CPU-heavy stages that may run in the process pool, by name
+_CPU_STAGES = {}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def register_cpu_stage(name, func):
+    """
+    Register a CPU-heavy function that run_cpu_stage may run in a worker process.
+
+    The function must be importable at module level (it is pickled by reference)
+    and its arguments and result must be picklable; DataFrame arguments are
+    shipped through shared memory as Arrow IPC.
+
+    Args:
+        name (str): Stage name
+        func (callable): Stage implementation
+    """
+    _CPU_STAGES[name] = func
+
+class SharedFrame:
+    """
+    Picklable handle to a DataFrame written to shared memory as an Arrow IPC stream.
+
+    The parent writes the stream straight into the shared block (no intermediate
+    copy); the worker maps the block and rebuilds the DataFrame (categoricals
+    included). The parent unlinks the block once the stage has finished.
+    """
+
+    def __init__(self, df):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.MockOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        self.size = sink.size()
+        self._shm = shared_memory.SharedMemory(create=True, size=max(self.size, 1))
+        self.name = self._shm.name
+        stream = pa.FixedSizeBufferWriter(pa.py_buffer(self._shm.buf))
+        with pa.ipc.new_stream(stream, table.schema) as writer:
+            writer.write_table(table)
+        stream.close()
+        del stream  # drop the export of shm.buf so release() can close it
+
+    def __getstate__(self):
+        return {"name": self.name, "size": self.size}
+
+    def __setstate__(self, state):
+        self.name = state["name"]
+        self.size = state["size"]
+        self._shm = None
+
+    def load(self):
+        """
+        Attach in the worker process and rebuild the DataFrame.
+
+        Numeric columns may reference the shared block directly, so the block
+        stays attached until detach() is called after the stage has run.
+        """
+        self._shm = shared_memory.SharedMemory(name=self.name)
+        return pa.ipc.open_stream(pa.py_buffer(self._shm.buf)[:self.size]).read_all().to_pandas()
+
+    def detach(self):
+        try:
+            self._shm.close()
+        except BufferError:
+            # A zero-copy column is still referenced; the mapping goes with the process
+            pass
+
+    def release(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+def _share(value, shared):
+    if pa is not None and isinstance(value, pd.DataFrame):
+        handle = SharedFrame(value)
+        shared.append(handle)
+        return handle
+    return value
+
+def _run_in_worker(func, args, kwargs):
+    handles = [value for value in list(args) + list(kwargs.values()) if isinstance(value, SharedFrame)]
+    args = [value.load() if isinstance(value, SharedFrame) else value for value in args]
+    kwargs = {key: value.load() if isinstance(value, SharedFrame) else value for key, value in kwargs.items()}
+    try:
+        return func(*args, **kwargs)
+    finally:
+        del args, kwargs
+        for handle in handles:
+            handle.detach()
+
+def get_cpu_pool():
+    """Get the shared process pool, or None when Config.CPU_POOL_SIZE is 0."""
+    global _pool
+    if Config.CPU_POOL_SIZE <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # forkserver/spawn workers do not inherit the parent's threads and locks
+            context = multiprocessing.get_context(Config.CPU_POOL_START_METHOD)
+            _pool = ProcessPoolExecutor(max_workers=Config.CPU_POOL_SIZE, mp_context=context)
+            logger.info("Started CPU pool with %d %s workers", Config.CPU_POOL_SIZE, Config.CPU_POOL_START_METHOD)
+        return _pool
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+def shutdown_cpu_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+def run_cpu_stage(name, *args, **kwargs):
+    """
+    Run a registered CPU-heavy stage, in the process pool when one is configured.
+
+    Without a pool (CPU_POOL_SIZE=0) the stage runs on the calling thread. If
+    the pool has broken (a worker died), it is replaced and the stage runs
+    inline for this call.
+
+    Args:
+        name (str): Registered stage name
+        *args, **kwargs: Stage arguments
+
+    Returns:
+        The stage's result
+    """
+    func = _CPU_STAGES[name]
+    pool = get_cpu_pool()
+    if pool is None:
+        return func(*args, **kwargs)
+
+    shared = []
+    try:
+        worker_args = [_share(value, shared) for value in args]
+        worker_kwargs = {key: _share(value, shared) for key, value in kwargs.items()}
+        result = pool.submit(_run_in_worker, func, worker_args, worker_kwargs).result()
+        metrics.increment(f"cpu_pool.offloaded.{name}")
+        return result
+    except BrokenProcessPool:
+        logger.warning("CPU pool broke while running %s; restarting it and running inline", name)
+        metrics.increment(f"cpu_pool.broken.{name}")
+        _discard_pool(pool)
+        return func(*args, **kwargs)
+    finally:
+        for handle in shared:
+            handle.release()
@@ -0,0 +1,82 @@
+# backend/services/deadline.py
+import time
+import contextvars
+from contextlib import contextmanager
+
+# Absolute time.monotonic() by which the current request must finish, or None
+_deadline = contextvars.ContextVar("request_deadline", default=None)
+# Whether the last timeout_for() returned less than the dependency's own timeout
+_capped = contextvars.ContextVar("timeout_capped", default=False)
+
+# Timers may fire slightly before the deadline they were derived from
+DEADLINE_SLACK_SECONDS = 0.1
+
+class DeadlineExceeded(Exception):
+    """Raised when the request's time budget is spent before an outbound call (mapped to HTTP 504)."""
+
+@contextmanager
+def deadline_scope(seconds):
+    """
+    Give the enclosed work a time budget of `seconds`.
+
+    Outbound calls made inside the block (on this thread, or on threads started
+    with contextvars.copy_context()) cap their timeouts with timeout_for().
+    A nested scope can only shorten the budget, never extend it.
+
+        with deadline_scope(Config.CHAT_DEADLINE_SECONDS):
+            ai_response = get_openai_response(user_message, chat_history)
+
+    Args:
+        seconds (float): Budget in seconds; None or <= 0 leaves the current deadline unchanged
+    """
+    current = _deadline.get()
+    deadline = current
+    if seconds and seconds > 0:
+        deadline = time.monotonic() + seconds
+        if current is not None:
+            deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining():
+    """Seconds left in the current budget, or None when no deadline is set."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+def timeout_for(default):
+    """
+    Timeout for the next outbound call: the call's own default capped by the budget left.
+
+    Args:
+        default (float): The dependency's own timeout in seconds (None for no limit)
+
+    Returns:
+        float: Timeout in seconds, or None when there is neither a default nor a deadline
+
+    Raises:
+        DeadlineExceeded: The budget is already spent
+    """
+    left = remaining()
+    if left is None:
+        _capped.set(False)
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("The request ran out of time before all backend calls completed.")
+    _capped.set(default is None or left < default)
+    return left if default is None else min(default, left)
+
+def cut_short_by_deadline():
+    """
+    Whether a call that just failed was stopped by the request deadline rather than by the dependency.
+
+    True when the last timeout_for() was capped below the dependency's own
+    timeout and that (shorter) budget has now run out, so a timeout error says
+    nothing about the dependency's health.
+    """
+    left = remaining()
+    return left is not None and left <= DEADLINE_SLACK_SECONDS and _capped.get()
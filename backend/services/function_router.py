@@ -1,17 +1,126 @@
 # backend/services/function_router.py
 import json
-from functions.function_registry import get_function
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from config import Config
+from functions.function_registry import get_function, is_long_running
+from services import metrics
+from services.job_queue import get_job_queue
+from services.deadline import remaining, DeadlineExceeded
+from services.circuit_breaker import UNAVAILABLE_ERRORS
+
+logger = logging.getLogger(__name__)
+
+# Calls currently executing, keyed by (function name, normalized args).
+# Identical concurrent calls wait on the leader's future instead of
+# repeating the Oracle/Impala/YARN work.
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+def normalize_args(args):
+    """
+    Build a stable key for a set of function arguments.
+
+    Strings are stripped, empty/None values are dropped and keys are sorted,
+    so calls that only differ in formatting noise coalesce.
+
+    Args:
+        args (dict): Parsed function arguments
+
+    Returns:
+        str: Canonical JSON representation of the arguments
+    """
+    normalized = {}
+    for key, value in (args or {}).items():
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == "":
+            continue
+        normalized[key] = value
+    return json.dumps(normalized, sort_keys=True, default=str)
+
+def _execute_single_flight(function_name, func, args):
+    """
+    Run func(**args), sharing the result with identical concurrent calls.
+
+    A follower whose leader ran out of its own (earlier) deadline runs the call
+    again while it still has time left, instead of failing with the leader's error.
+    """
+    key = (function_name, normalize_args(args))
+
+    while True:
+        with _in_flight_lock:
+            future = _in_flight.get(key)
+            # A finished future is only waiting for its leader to remove it
+            is_leader = future is None or future.done()
+            if is_leader:
+                future = Future()
+                _in_flight[key] = future
+
+        if is_leader:
+            break
+
+        metrics.increment(f"function_router.coalesced.{function_name}")
+        logger.info("Coalescing %s call with an identical in-flight call", function_name)
+        try:
+            # The leader runs under its own deadline; don't wait past ours
+            return future.result(timeout=remaining())
+        except FutureTimeoutError:
+            raise DeadlineExceeded(f"The request ran out of time waiting for {function_name}.")
+        except DeadlineExceeded:
+            left = remaining()
+            if left is not None and left <= 0:
+                raise
+            metrics.increment(f"function_router.leader_deadline_retried.{function_name}")
+            logger.info("Leader of %s ran out of time; retrying with this request's budget", function_name)
+
+    metrics.increment(f"function_router.executed.{function_name}")
+    try:
+        result = func(**args)
+        future.set_result(result)
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            if _in_flight.get(key) is future:
+                del _in_flight[key]
+
+def execute_function(function_name, args):
+    """
+    Run a registered function synchronously (job queue workers, batch_runner.py).
+    
+    Args:
+        function_name (str): Name of the function to call
+        args (dict): Parsed function arguments
+        
+    Returns:
+        Result of the function
+    """
+    func = get_function(function_name)
+    if not func:
+        raise ValueError(f"Function {function_name} not found")
+    return _execute_single_flight(function_name, func, args or {})
 
 def route_function_call(function_name, function_args):
     """
     Routes a function call to the appropriate function implementation.
     
+    Functions registered with long_running=True are submitted to the job
+    queue and return the job ID instead of their result.
+    
     Args:
         function_name (str): Name of the function to call
         function_args (str): JSON string of arguments
         
     Returns:
         dict: Result of the function call
+
+    Raises:
+        AdmissionRejected, CircuitOpen: A backend is busy or unavailable (HTTP 503)
+        DeadlineExceeded: The request ran out of time (HTTP 504)
     """
     try:
         # Parse arguments
@@ -25,14 +134,30 @@ def route_function_call(function_name, function_args):
                 "result": {"error": f"Function {function_name} not found"}
             }
         
-        # Execute the function
-        result = func(**args)
+        # Long-running functions go to the job queue; the chat turn gets the job ID
+        if Config.JOB_QUEUE_ENABLED and is_long_running(function_name):
+            job = get_job_queue().submit(function_name, args or {})
+            return {
+                "name": function_name,
+                "result": {
+                    "success": True,
+                    "job_id": job["job_id"],
+                    "status": job["status"],
+                    "message": (f"{function_name} is running in the background as job {job['job_id']}. "
+                                f"Ask for the job status, or poll /api/jobs/{job['job_id']}/result.")
+                }
+            }
+        
+        # Execute the function (coalescing identical concurrent calls)
+        result = _execute_single_flight(function_name, func, args or {})
         
         return {
             "name": function_name,
             "result": result
         }
         
+    except UNAVAILABLE_ERRORS:
+        raise
     except Exception as e:
         return {
             "name": function_name,
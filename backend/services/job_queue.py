@@ -0,0 +1,265 @@
+# backend/services/job_queue.py
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from services import metrics
+from utils.serialization import dumps_str
+
+logger = logging.getLogger(__name__)
+
+# Job states; queued jobs (and running jobs of idempotent functions) are
+# re-queued when the process restarts
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+PENDING_STATES = (QUEUED, RUNNING)
+
+class JobQueueFull(RuntimeError):
+    """Raised when JOB_MAX_PENDING jobs are already queued or running."""
+
+class JobQueue:
+    """
+    Bounded worker pool for long-running functions, persisted in SQLite.
+
+    Every state change is written to the jobs table, so status and results
+    survive a restart; jobs that were queued when the process stopped, and
+    interrupted jobs of idempotent functions, are picked up again by
+    recover(). An identical call (same function
+    and normalized arguments) that is still pending returns the existing job
+    instead of starting another one.
+    """
+
+    def __init__(self, db_path=None, max_workers=None, max_pending=None, retention_hours=None):
+        self.db_path = db_path or Config.JOB_DB_PATH
+        self.max_workers = max_workers or Config.JOB_WORKERS
+        self.max_pending = max_pending or Config.JOB_MAX_PENDING
+        self.retention_seconds = (retention_hours or Config.JOB_RETENTION_HOURS) * 3600
+        self._lock = threading.Lock()
+        self._active = {}  # (function name, normalized args) -> job_id of pending jobs
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    function_name TEXT NOT NULL,
+                    args TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    owner_pid INTEGER,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    result TEXT,
+                    error TEXT
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+
+    def _update(self, job_id, **fields):
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", (*fields.values(), job_id))
+
+    def submit(self, function_name, args):
+        """
+        Queue a function call.
+
+        Args:
+            function_name (str): Registered function name
+            args (dict): Parsed function arguments
+
+        Returns:
+            dict: The job (without result), either new or an identical pending one
+        """
+        from services.function_router import normalize_args
+        key = (function_name, normalize_args(args))
+        with self._lock:
+            job_id = self._active.get(key)
+            if job_id is None:
+                if len(self._active) >= self.max_pending:
+                    metrics.increment("job_queue.rejected")
+                    raise JobQueueFull(f"{len(self._active)} jobs are already pending; try again later")
+                job_id = uuid.uuid4().hex[:16]
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT INTO jobs (job_id, function_name, args, status, owner_pid, created_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (job_id, function_name, json.dumps(args, default=str), QUEUED, os.getpid(), time.time()))
+                self._active[key] = job_id
+                is_new = True
+            else:
+                is_new = False
+
+        if is_new:
+            metrics.increment(f"job_queue.submitted.{function_name}")
+            logger.info("Queued job %s for %s", job_id, function_name)
+            self._executor.submit(self._run, job_id, key, function_name, args)
+        else:
+            metrics.increment(f"job_queue.coalesced.{function_name}")
+            logger.info("Reusing pending job %s for %s", job_id, function_name)
+        return self.get_job(job_id)
+
+    def _run(self, job_id, key, function_name, args):
+        from services.function_router import execute_function
+        start_time = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1 WHERE job_id = ?",
+                (RUNNING, start_time, job_id))
+        try:
+            result = execute_function(function_name, args)
+            self._update(job_id, status=SUCCEEDED, finished_at=time.time(),
+                         result=dumps_str(result))
+            metrics.increment(f"job_queue.succeeded.{function_name}")
+        except Exception as e:
+            logger.error(f"Job {job_id} ({function_name}) failed: {str(e)}")
+            logger.error(traceback.format_exc())
+            self._update(job_id, status=FAILED, finished_at=time.time(), error=str(e))
+            metrics.increment(f"job_queue.failed.{function_name}")
+        finally:
+            metrics.observe(f"job_queue.duration_ms.{function_name}", (time.time() - start_time) * 1000)
+            with self._lock:
+                self._active.pop(key, None)
+
+    def recover(self):
+        """
+        Re-queue jobs left queued or running by a previous process and drop
+        finished jobs older than the retention period.
+
+        Jobs owned by another live process (e.g. a sibling gunicorn worker
+        sharing JOB_DB_PATH) are left alone; orphaned ones are claimed with a
+        conditional update so only one process picks each up. A job that was
+        interrupted JOB_MAX_ATTEMPTS times is marked failed instead of being
+        run again.
+
+        A running job of a function not registered as idempotent (e.g.
+        sync_adjustments) may already have had side effects, so it is marked
+        failed rather than run a second time.
+
+        Returns:
+            int: Number of jobs re-queued
+        """
+        from services.function_router import normalize_args
+        from functions.function_registry import is_idempotent
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM jobs WHERE status NOT IN (?, ?) AND finished_at < ?",
+                               (*PENDING_STATES, time.time() - self.retention_seconds))
+            rows = self._conn.execute(
+                "SELECT job_id, function_name, args, status, attempts, owner_pid FROM jobs "
+                "WHERE status IN (?, ?) ORDER BY created_at",
+                PENDING_STATES).fetchall()
+
+        requeued = 0
+        for row in rows:
+            if not _is_orphaned(row["owner_pid"]):
+                continue
+            with self._lock, self._conn:
+                claimed = self._conn.execute(
+                    "UPDATE jobs SET owner_pid = ? WHERE job_id = ? AND owner_pid IS ?",
+                    (os.getpid(), row["job_id"], row["owner_pid"])).rowcount
+            if not claimed:
+                continue
+            if row["attempts"] >= Config.JOB_MAX_ATTEMPTS:
+                self._update(row["job_id"], status=FAILED, finished_at=time.time(),
+                             error=f"Interrupted by {row['attempts']} restarts")
+                continue
+            if row["status"] == RUNNING and not is_idempotent(row["function_name"]):
+                logger.warning(f"Not re-running interrupted job {row['job_id']} ({row['function_name']})")
+                self._update(row["job_id"], status=FAILED, finished_at=time.time(),
+                             error=(f"Interrupted by a restart while running; {row['function_name']} is not "
+                                    "safe to repeat, so check what it completed before submitting it again"))
+                continue
+            args = json.loads(row["args"])
+            key = (row["function_name"], normalize_args(args))
+            with self._lock:
+                if key in self._active:
+                    continue
+                self._active[key] = row["job_id"]
+            self._update(row["job_id"], status=QUEUED)
+            self._executor.submit(self._run, row["job_id"], key, row["function_name"], args)
+            requeued += 1
+
+        if requeued:
+            logger.info(f"Re-queued {requeued} job(s) from {self.db_path}")
+        return requeued
+
+    def get_job(self, job_id, include_result=False):
+        """
+        Get a job's status and, optionally, its result.
+
+        Args:
+            job_id (str): Job ID returned by submit
+            include_result (bool): Include the function result of a finished job
+
+        Returns:
+            dict: job_id, function_name, args, status, attempts, timestamps, error
+                  (and result), or None if the job is unknown
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_dict(row, include_result) if row else None
+
+    def list_jobs(self, limit=50):
+        """List the most recent jobs, newest first (results are not included)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    @staticmethod
+    def _to_dict(row, include_result=False):
+        job = {
+            "job_id": row["job_id"],
+            "function_name": row["function_name"],
+            "args": json.loads(row["args"]),
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "error": row["error"]
+        }
+        if include_result:
+            job["result"] = json.loads(row["result"]) if row["result"] else None
+        return job
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+        self._conn.close()
+
+def _is_orphaned(owner_pid):
+    """True if the process that queued a job is gone (or was an earlier run of this PID)."""
+    if not owner_pid or owner_pid == os.getpid():
+        return True
+    try:
+        os.kill(owner_pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_job_queue():
+    """Get the shared job queue, re-queueing unfinished jobs on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+            _queue.recover()
+        return _queue
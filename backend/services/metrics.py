@@ -0,0 +1,55 @@
+# backend/services/metrics.py
+import threading
+
+# In-process counters and timing summaries, exposed through the /metrics endpoint
+_lock = threading.Lock()
+_counters = {}
+_timings = {}
+
+def increment(name, value=1):
+    """
+    Increment a named counter.
+
+    Args:
+        name (str): Counter name (dotted, e.g. 'function_router.coalesced.get_6g_status')
+        value (int): Amount to add
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+def observe(name, value):
+    """
+    Record one observation (e.g. a duration in milliseconds) for a named timing.
+
+    Args:
+        name (str): Timing name
+        value (float): Observed value
+    """
+    with _lock:
+        timing = _timings.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+        timing["count"] += 1
+        timing["total"] += value
+        timing["max"] = max(timing["max"], value)
+
+def get_metrics():
+    """
+    Get a snapshot of all counters and timings.
+
+    Returns:
+        dict: {"counters": {...}, "timings": {name: {count, total, max, avg}}}
+    """
+    with _lock:
+        timings = {}
+        for name, timing in _timings.items():
+            timings[name] = dict(timing)
+            timings[name]["avg"] = round(timing["total"] / timing["count"], 3) if timing["count"] else 0
+        return {
+            "counters": dict(_counters),
+            "timings": timings
+        }
+
+def reset_metrics():
+    """Clear all counters and timings."""
+    with _lock:
+        _counters.clear()
+        _timings.clear()
@@ -0,0 +1,163 @@
+# backend/services/session_store.py
+import os
+import abc
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def new_conversation_id():
+    """Create an ID for a new conversation."""
+    return uuid.uuid4().hex
+
+class SessionStore(abc.ABC):
+    """
+    Interface for server-side conversation history, keyed by conversation ID.
+
+    A session is the list of chat messages ({"role", "content"}) sent to
+    OpenAI before the current turn. Turns are only ever appended, so the
+    message prefix of a conversation stays byte-identical from one request to
+    the next (which is what Azure prompt caching matches on). When a session
+    grows past max_messages, its oldest turns are dropped in one block,
+    so the prefix changes once per trim rather than on every turn.
+    """
+    name = "base"
+
+    def __init__(self, max_messages=None, ttl_seconds=None):
+        self.max_messages = max_messages or Config.SESSION_MAX_MESSAGES
+        self.ttl_seconds = Config.SESSION_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+
+    @abc.abstractmethod
+    def get(self, conversation_id):
+        """
+        Get a conversation's messages.
+
+        Returns:
+            list: Messages in order; empty for an unknown or expired conversation
+        """
+
+    @abc.abstractmethod
+    def append(self, conversation_id, messages):
+        """Append one turn's messages to a conversation (creating it if needed)."""
+
+    @abc.abstractmethod
+    def delete(self, conversation_id):
+        """Forget a conversation."""
+
+    def _trim(self, messages):
+        if len(messages) <= self.max_messages:
+            return messages
+        # Keep the newest half, starting on a user message
+        keep = messages[len(messages) - self.max_messages // 2:]
+        while keep and keep[0].get("role") != "user":
+            keep = keep[1:]
+        return keep
+
+    def _expired(self, updated_at):
+        return self.ttl_seconds > 0 and time.time() - updated_at > self.ttl_seconds
+
+class MemorySessionStore(SessionStore):
+    """Sessions in this process, least recently used evicted beyond max_sessions."""
+    name = "memory"
+
+    def __init__(self, max_sessions=None, **kwargs):
+        super().__init__(**kwargs)
+        self.max_sessions = max_sessions or Config.SESSION_MAX_SESSIONS
+        self._sessions = OrderedDict()  # conversation_id -> (updated_at, messages)
+        self._lock = threading.Lock()
+
+    def get(self, conversation_id):
+        with self._lock:
+            session = self._sessions.get(conversation_id)
+            if session is None:
+                return []
+            if self._expired(session[0]):
+                del self._sessions[conversation_id]
+                return []
+            self._sessions.move_to_end(conversation_id)
+            return list(session[1])
+
+    def append(self, conversation_id, messages):
+        with self._lock:
+            session = self._sessions.get(conversation_id)
+            existing = session[1] if session and not self._expired(session[0]) else []
+            self._sessions[conversation_id] = (time.time(), self._trim(existing + list(messages)))
+            self._sessions.move_to_end(conversation_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def delete(self, conversation_id):
+        with self._lock:
+            self._sessions.pop(conversation_id, None)
+
+class SqliteSessionStore(SessionStore):
+    """Sessions in a SQLite file, shared by worker processes and kept across restarts."""
+    name = "sqlite"
+
+    def __init__(self, db_path=None, **kwargs):
+        super().__init__(**kwargs)
+        self.db_path = db_path or Config.SESSION_DB_PATH
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    conversation_id TEXT PRIMARY KEY,
+                    messages TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated_at)")
+
+    def _load(self, conversation_id):
+        row = self._conn.execute(
+            "SELECT messages, updated_at FROM sessions WHERE conversation_id = ?", (conversation_id,)).fetchone()
+        if row is None or self._expired(row[1]):
+            return []
+        return json.loads(row[0])
+
+    def get(self, conversation_id):
+        with self._lock:
+            return self._load(conversation_id)
+
+    def append(self, conversation_id, messages):
+        with self._lock, self._conn:
+            updated = self._trim(self._load(conversation_id) + list(messages))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (conversation_id, messages, updated_at) VALUES (?, ?, ?)",
+                (conversation_id, json.dumps(updated), time.time()))
+            if self.ttl_seconds > 0:
+                self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.ttl_seconds,))
+
+    def delete(self, conversation_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE conversation_id = ?", (conversation_id,))
+
+_store = None
+_store_lock = threading.Lock()
+
+def create_session_store(name):
+    """Create a session store by name ('memory' or 'sqlite')."""
+    if name == "memory":
+        return MemorySessionStore()
+    if name == "sqlite":
+        return SqliteSessionStore()
+    raise ValueError(f"Unknown session store: {name}")
+
+def get_session_store():
+    """Get the shared session store selected by Config.SESSION_BACKEND."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = create_session_store(Config.SESSION_BACKEND)
+            logger.info(f"Using session store: {_store.name}")
+        return _store
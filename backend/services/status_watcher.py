@@ -0,0 +1,234 @@
+# backend/services/status_watcher.py
+import time
+import queue
+import logging
+import threading
+import traceback
+from datetime import datetime
+from config import Config
+from services import metrics
+from functions.get_6g_status import (
+    load_config,
+    get_historical_runtime_data,
+    get_yarn_cluster_metrics,
+    fetch_status_rows,
+    build_status_response
+)
+
+logger = logging.getLogger(__name__)
+
+# One watcher per COB date, shared by every subscriber; idle watchers are evicted
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+def diff_table_states(previous, current, eta_move_minutes):
+    """
+    Compare two per-table states and describe what changed.
+
+    Args:
+        previous (dict): bpf_id -> table data from the previous poll
+        current (dict): bpf_id -> table data from the latest poll
+        eta_move_minutes (int): Minimum ETA shift that is reported
+
+    Returns:
+        list: Events such as table_started, table_completed and eta_moved
+    """
+    events = []
+    for bpf_id, table in current.items():
+        before = previous.get(bpf_id)
+        old_status = before['status'] if before else 'PENDING'
+        new_status = table['status']
+
+        if new_status != old_status:
+            if new_status == 'RUNNING':
+                event_type = 'table_started'
+            elif new_status == 'COMPLETED':
+                event_type = 'table_completed'
+            else:
+                event_type = 'table_status_changed'
+            events.append({
+                "type": event_type,
+                "bpf_id": bpf_id,
+                "name": table['name'],
+                "previous_status": old_status,
+                "status": new_status,
+                "table": table
+            })
+            continue
+
+        if new_status == 'RUNNING' and before:
+            old_eta = before.get('estimated_completion_time')
+            new_eta = table.get('estimated_completion_time')
+            if old_eta and new_eta:
+                moved = (datetime.strptime(new_eta, '%Y-%m-%d %H:%M:%S') -
+                         datetime.strptime(old_eta, '%Y-%m-%d %H:%M:%S')).total_seconds() / 60
+                if abs(moved) >= eta_move_minutes:
+                    events.append({
+                        "type": "eta_moved",
+                        "bpf_id": bpf_id,
+                        "name": table['name'],
+                        "previous_eta": old_eta,
+                        "eta": new_eta,
+                        "moved_minutes": round(moved, 1),
+                        "table": table
+                    })
+    return events
+
+class StatusWatcher:
+    """
+    Polls the 6G status query for one COB date and pushes changes to subscribers.
+
+    The Oracle status query runs once per interval regardless of how many
+    clients are subscribed; every subscriber gets its own bounded event queue.
+    A subscriber that falls behind loses its oldest events, not the newest.
+    """
+
+    def __init__(self, cob_date, interval=None, queue_size=None):
+        self.cob_date = cob_date
+        self.interval = interval or Config.STATUS_WATCH_INTERVAL_SECONDS
+        self.queue_size = queue_size or Config.STATUS_SUBSCRIBER_QUEUE_SIZE
+        self.snapshot = None
+        self.last_polled_at = None
+        self.last_error = None
+        self._tables = {}
+        self._subscribers = set()
+        self._idle_since = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self):
+        """
+        Register a subscriber and start polling if needed.
+
+        Returns:
+            queue.Queue: Receives event dicts; the first one is the current snapshot
+        """
+        subscriber = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            self._idle_since = None
+            if self.snapshot:
+                subscriber.put({"type": "snapshot", "status": self.snapshot})
+            self._stop.clear()
+            if not self._thread:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"status-watcher-{self.cob_date}", daemon=True
+                )
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Remove a subscriber; polling stops once nobody is listening."""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            if not self._subscribers:
+                self._idle_since = time.monotonic()
+                self._stop.set()
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def idle_for(self):
+        """Seconds since the last subscriber left (0 while anyone is subscribed)."""
+        with self._lock:
+            return 0 if self._idle_since is None else time.monotonic() - self._idle_since
+
+    def _publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            while True:
+                try:
+                    subscriber.put_nowait(event)
+                    break
+                except queue.Full:
+                    # Slow consumer: drop its oldest event to make room
+                    try:
+                        subscriber.get_nowait()
+                        metrics.increment("status_watcher.dropped_events")
+                    except queue.Empty:
+                        pass
+
+    def poll_once(self):
+        """
+        Run the status query once, update the in-memory state and publish changes.
+
+        Returns:
+            list: Events generated by this poll
+        """
+        config = load_config()
+        all_bpf_ids = [table['bpf_id'] for table in config['tables']]
+        historical_data = get_historical_runtime_data(all_bpf_ids, days=30)
+        cluster_metrics = get_yarn_cluster_metrics()
+
+        results = fetch_status_rows(config, self.cob_date)
+        response = build_status_response(config, self.cob_date, results, historical_data, cluster_metrics)
+
+        tables = {table['bpf_id']: table for table in response['tables']}
+        is_first_poll = self.snapshot is None
+        events = [] if is_first_poll else diff_table_states(
+            self._tables, tables, Config.STATUS_ETA_MOVE_MINUTES
+        )
+
+        with self._lock:
+            self._tables = tables
+            self.snapshot = response
+            self.last_polled_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self.last_error = None
+
+        if is_first_poll:
+            self._publish({"type": "snapshot", "status": response})
+        for event in events:
+            self._publish(event)
+        if events:
+            logger.info("6G status for %s: %d change(s) published", self.cob_date, len(events))
+
+        return events
+
+    def _run(self):
+        logger.info(f"Starting 6G status watcher for COB date {self.cob_date}")
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    break
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Error polling 6G status: {str(e)}")
+                logger.error(traceback.format_exc())
+                self.last_error = str(e)
+                self._publish({"type": "error", "error": str(e)})
+            self._stop.wait(self.interval)
+        logger.info(f"Stopped 6G status watcher for COB date {self.cob_date}")
+
+def default_cob_date():
+    """The COB date being processed today, in MM-DD-YYYY format."""
+    return datetime.now().strftime('%m-%d-%Y')
+
+def get_watcher(cob_date=None):
+    """
+    Get (or create) the shared watcher for a COB date.
+
+    Watchers nobody has subscribed to for Config.STATUS_WATCHER_IDLE_SECONDS
+    are dropped, along with their snapshot.
+
+    Args:
+        cob_date (str, optional): COB date in MM-DD-YYYY format; defaults to today
+
+    Returns:
+        StatusWatcher: The watcher for that date
+    """
+    cob_date = cob_date or default_cob_date()
+    with _watchers_lock:
+        for idle_date in [date for date, watcher in _watchers.items()
+                          if date != cob_date and watcher.idle_for() > Config.STATUS_WATCHER_IDLE_SECONDS]:
+            logger.info(f"Evicting idle 6G status watcher for COB date {idle_date}")
+            del _watchers[idle_date]
+        watcher = _watchers.get(cob_date)
+        if not watcher:
+            watcher = StatusWatcher(cob_date)
+            _watchers[cob_date] = watcher
+        return watcher
@@ -0,0 +1,124 @@
+# backend/services/warmup.py
+import time
+import logging
+import threading
+import traceback
+from datetime import datetime
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def _warm_config():
+    from functions.get_6g_status import load_config
+    load_config()
+
+def _warm_pandas():
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+
+def _warm_oracle():
+    # Starts the JVM for the JDBC backend, or opens the pool's minimum sessions
+    from utils.oracle_connector import get_oracle_backend
+    get_oracle_backend().warm_up()
+
+def _warm_openai_token():
+    from services.azure_openai import get_access_token
+    get_access_token()
+
+def _warm_history():
+    from functions.get_6g_status import load_config, get_historical_runtime_data
+    all_bpf_ids = [table['bpf_id'] for table in load_config()['tables']]
+    history = get_historical_runtime_data(all_bpf_ids, days=30)
+    if history.empty:
+        raise RuntimeError("No historical runtime data loaded")
+
+# Available warm-up steps, run in the order given by Config.WARMUP_STEPS
+WARMUP_STEPS = {
+    "config": _warm_config,
+    "pandas": _warm_pandas,
+    "oracle": _warm_oracle,
+    "openai_token": _warm_openai_token,
+    "history": _warm_history
+}
+
+_state_lock = threading.Lock()
+_state = {
+    "status": "pending",
+    "started_at": None,
+    "finished_at": None,
+    "total_ms": None,
+    "steps": []
+}
+
+def run_warm_up(step_names=None):
+    """
+    Run warm-up steps in order, recording the duration and outcome of each.
+
+    A failing step is logged and reported but does not stop the remaining steps.
+
+    Args:
+        step_names (list, optional): Steps to run; defaults to Config.WARMUP_STEPS
+
+    Returns:
+        dict: Warm-up report
+    """
+    step_names = Config.WARMUP_STEPS if step_names is None else step_names
+    with _state_lock:
+        _state.update({
+            "status": "running",
+            "started_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "steps": []
+        })
+
+    start = time.perf_counter()
+    failed = False
+    for name in step_names:
+        step = WARMUP_STEPS.get(name)
+        step_start = time.perf_counter()
+        result = {"name": name, "status": "ok"}
+        try:
+            if not step:
+                raise ValueError(f"Unknown warm-up step: {name}")
+            step()
+        except Exception as e:
+            failed = True
+            result.update({"status": "failed", "error": str(e)})
+            logger.warning(f"Warm-up step {name} failed: {str(e)}")
+            logger.debug(traceback.format_exc())
+        result["duration_ms"] = round((time.perf_counter() - step_start) * 1000, 1)
+        logger.info(f"Warm-up step {name}: {result['status']} in {result['duration_ms']} ms")
+        with _state_lock:
+            _state["steps"].append(result)
+
+    with _state_lock:
+        _state.update({
+            "status": "degraded" if failed else "ready",
+            "finished_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "total_ms": round((time.perf_counter() - start) * 1000, 1)
+        })
+    return get_warm_up_report()
+
+def start_warm_up():
+    """Run the warm-up in a background thread so the process can answer liveness probes meanwhile."""
+    if not Config.WARMUP_ENABLED:
+        with _state_lock:
+            _state["status"] = "ready"
+        return None
+    thread = threading.Thread(target=run_warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+def is_ready():
+    """True once the warm-up has finished (even if some optional steps failed)."""
+    with _state_lock:
+        return _state["status"] in ("ready", "degraded")
+
+def get_warm_up_report():
+    with _state_lock:
+        return {
+            "status": _state["status"],
+            "started_at": _state["started_at"],
+            "finished_at": _state["finished_at"],
+            "total_ms": _state["total_ms"],
+            "steps": [dict(step) for step in _state["steps"]]
+        }
@@ -0,0 +1,79 @@
+# backend/tests/test_admission.py
+import os
+import sys
+import time
+import threading
+import pytest
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.admission import BackendLimiter, AdmissionRejected, parse_limits
+
+def hold(limiter, started, release, order=None, tag=None):
+    with limiter.admit():
+        if order is not None:
+            order.append(tag)
+        started.set()
+        release.wait(5)
+
+def test_parse_limits():
+    assert parse_limits("oracle=8:32, yarn=2:8,openai=16") == {"oracle": (8, 32), "yarn": (2, 8), "openai": (16, 0)}
+    assert parse_limits("") == {}
+
+def test_rejects_when_queue_is_full():
+    limiter = BackendLimiter("test", max_concurrent=1, max_queue=0, queue_timeout=5)
+    started, release = threading.Event(), threading.Event()
+    worker = threading.Thread(target=hold, args=(limiter, started, release))
+    worker.start()
+    started.wait(5)
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        with limiter.admit():
+            pass
+    assert excinfo.value.backend == "test"
+    assert excinfo.value.retry_after >= 1
+
+    release.set()
+    worker.join()
+    assert limiter.snapshot()["active"] == 0
+
+def test_queue_wait_times_out():
+    limiter = BackendLimiter("test", max_concurrent=1, max_queue=1, queue_timeout=0.05)
+    started, release = threading.Event(), threading.Event()
+    worker = threading.Thread(target=hold, args=(limiter, started, release))
+    worker.start()
+    started.wait(5)
+
+    start = time.perf_counter()
+    with pytest.raises(AdmissionRejected):
+        with limiter.admit():
+            pass
+    assert time.perf_counter() - start < 2
+    assert limiter.snapshot()["waiting"] == 0
+
+    release.set()
+    worker.join()
+
+def test_waiters_are_admitted_in_arrival_order():
+    limiter = BackendLimiter("test", max_concurrent=1, max_queue=3, queue_timeout=5)
+    release = threading.Event()
+    order = []
+    first_started = threading.Event()
+    threads = [threading.Thread(target=hold, args=(limiter, first_started, release, order, 0))]
+    threads[0].start()
+    first_started.wait(5)
+
+    for tag in (1, 2, 3):
+        thread = threading.Thread(target=hold, args=(limiter, threading.Event(), release, order, tag))
+        thread.start()
+        threads.append(thread)
+        while limiter.snapshot()["waiting"] < tag:
+            time.sleep(0.001)
+
+    assert limiter.snapshot() == {"active": 1, "waiting": 3, "max_concurrent": 1, "max_queue": 3}
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert order == [0, 1, 2, 3]
+    assert limiter.snapshot()["active"] == 0
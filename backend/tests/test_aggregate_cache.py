@@ -0,0 +1,91 @@
+# backend/tests/test_aggregate_cache.py
+import os
+import re
+import importlib
+import sys
+import pandas as pd
+import pytest
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest.importorskip("pyarrow")
+
+variance = importlib.import_module("functions.sls_details_variance")
+from utils.aggregate_cache import AggregateCache
+
+CONTEXT_KEYS = {"2025-04-02": [101], "2025-04-03": [102], "2025-03-31": [99]}
+
+def rows(context_key, cob_date, amounts):
+    return pd.DataFrame([
+        {"context_key": context_key, "lri_position_str_cob_date": cob_date,
+         "lri_position_str_sls_line_no": line, "context_name": "CTX", "ccf_flow_amt": amount}
+        for line, amount in amounts.items()
+    ])
+
+DATA = pd.concat([
+    rows(99, "2025-03-31", {"L1": 90.0, "L2": 9.0, "L3": 1.0}),
+    rows(101, "2025-04-02", {"L1": 100.0, "L2": 10.0, "L3": 1.0}),
+    rows(102, "2025-04-03", {"L1": 150.0, "L2": 10.0, "L3": 2.0}),
+], ignore_index=True)
+
+def in_list(query, column):
+    match = re.search(re.escape(column) + r" IN \(([^)]*)\)", query)
+    return None if not match else [value.strip(" '") for value in match.group(1).split(",")]
+
+@pytest.fixture
+def impala(monkeypatch, tmp_path):
+    """Serve aggregate queries from DATA and record which context keys were queried."""
+    queried = []
+
+    def fake_context_keys(dates, service_names):
+        return {date: CONTEXT_KEYS.get(date, []) for date in dates}
+
+    def fake_fetch(query, key_columns, sum_columns):
+        keys = [int(key) for key in in_list(query, "sls.context_key")]
+        queried.append((sorted(keys), query))
+        df = DATA[DATA['context_key'].isin(keys)]
+        lines = in_list(query, "sls.lri_position_str_sls_line_no")
+        if lines is not None:
+            df = df[df['lri_position_str_sls_line_no'].isin(lines)]
+        return df.reset_index(drop=True), {"mode": "stream", "rows": len(df)}
+
+    monkeypatch.setattr(variance, "get_final_context_keys", fake_context_keys)
+    monkeypatch.setattr(variance, "fetch_aggregated", fake_fetch)
+    monkeypatch.setattr(variance, "get_aggregate_cache", lambda: AggregateCache(str(tmp_path)))
+    return queried
+
+def test_cached_dates_are_not_queried_again(impala):
+    df, stats = variance.load_table_aggregates("sls_details", ["2025-04-02", "2025-04-03"])
+    assert len(df) == 6
+    assert stats["queried_dates"] == ["2025-04-02", "2025-04-03"]
+
+    # D vs D-2: only the unseen date goes to Impala
+    df, stats = variance.load_table_aggregates("sls_details", ["2025-04-03", "2025-03-31"])
+    assert impala[-1][0] == [99]
+    assert stats["cached_dates"] == ["2025-04-03"]
+    assert stats["queried_dates"] == ["2025-03-31"]
+    assert sorted(df['context_key'].unique()) == [99, 102]
+
+    _, stats = variance.load_table_aggregates("sls_details", ["2025-04-03", "2025-03-31"])
+    assert len(impala) == 2
+    assert stats["queried_dates"] == []
+
+def test_line_subsets_extend_cached_coverage(impala):
+    df, _ = variance.load_table_aggregates("sls_details", ["2025-04-02"], sls_lines=["L1"])
+    assert list(df['lri_position_str_sls_line_no']) == ["L1"]
+
+    # L2 is missing from the cached entry, so only L2 is fetched and merged in
+    df, _ = variance.load_table_aggregates("sls_details", ["2025-04-02"], sls_lines=["L1", "L2"])
+    assert "IN ('L2')" in impala[-1][1]
+    assert sorted(df['lri_position_str_sls_line_no']) == ["L1", "L2"]
+
+    variance.load_table_aggregates("sls_details", ["2025-04-02"], sls_lines=["L2"])
+    assert len(impala) == 2
+
+def test_variance_is_the_same_from_cache(impala):
+    first = variance.analyze_sls_details_table("2025-04-02", "2025-04-03", ["L1", "L2", "L3"])
+    second = variance.analyze_sls_details_table("2025-04-02", "2025-04-03", ["L1", "L2", "L3"])
+    assert len(impala) == 1
+    assert sorted(first['sls_lines_with_variance']) == ["L1", "L3"]
+    assert first['variance_data'] == second['variance_data']
@@ -0,0 +1,77 @@
+# backend/tests/test_batch_eta.py
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from functions.get_6g_status import estimate_batch_eta, estimate_parallelism
+
+NOW = datetime(2025, 4, 3, 20, 0, 0)  # a Thursday
+BPF_IDS = [str(6101 + i) for i in range(13)]
+
+def history(days=30, parallel=3, seed=11):
+    """Each day runs the 13 tables `parallel` at a time, 30 +/- 5 minutes each."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for day in range(days):
+        cob_date = NOW.date() - timedelta(days=day + 1)
+        slots = [datetime.combine(cob_date, datetime.min.time()) + timedelta(hours=18)] * parallel
+        for bpf_id in BPF_IDS:
+            slot = int(np.argmin(slots))
+            duration = float(rng.normal(30, 5))
+            start = slots[slot]
+            slots[slot] = start + timedelta(minutes=duration)
+            rows.append({"BPF_ID": bpf_id, "COB_DATE": cob_date, "START_TIME": start, "END_TIME": slots[slot],
+                         "DAY_OF_WEEK": int(start.strftime('%w')) + 1, "DURATION_MINUTES": duration})
+    return pd.DataFrame(rows)
+
+def tables(completed, running_elapsed):
+    result = []
+    for i, bpf_id in enumerate(BPF_IDS):
+        if i < completed:
+            result.append({"bpf_id": bpf_id, "name": f"T{i}", "status": "COMPLETED"})
+        elif i < completed + len(running_elapsed):
+            result.append({"bpf_id": bpf_id, "name": f"T{i}", "status": "RUNNING",
+                           "elapsed_minutes": running_elapsed[i - completed]})
+        else:
+            result.append({"bpf_id": bpf_id, "name": f"T{i}", "status": "PENDING"})
+    return result
+
+def test_parallelism_is_estimated_from_history():
+    assert estimate_parallelism(history(parallel=3)) == 3
+
+def test_eta_percentiles_match_remaining_work():
+    hist = history()
+    not_started = estimate_batch_eta(tables(0, []), hist, {}, now=NOW, seed=1)
+    # 13 tables of ~30 minutes, 3 at a time: 5 waves
+    assert 130 < not_started["p50_remaining_minutes"] < 170
+    assert not_started["p50_remaining_minutes"] <= not_started["p90_remaining_minutes"]
+
+    late = estimate_batch_eta(tables(12, [25]), hist, {}, now=NOW, seed=1)
+    assert late["tables_remaining"] == 1 and late["likely_last_table"]["bpf_id"] == "6113"
+    assert 0 < late["p50_remaining_minutes"] < 15
+    assert late["p50_completion_time"] > NOW.strftime('%Y-%m-%d %H:%M:%S')
+
+    overloaded = estimate_batch_eta(tables(12, [25]), hist, {"is_overloaded": True}, now=NOW, seed=1)
+    assert overloaded["p50_remaining_minutes"] == late["p50_remaining_minutes"] + 10
+
+    assert estimate_batch_eta(tables(13, []), hist, {}, now=NOW) == {"complete": True, "tables_remaining": 0}
+
+def test_thousands_of_draws_run_in_milliseconds():
+    hist = history()
+    start = time.perf_counter()
+    eta = estimate_batch_eta(tables(4, [10, 20]), hist, {}, now=NOW, draws=10000, seed=2)
+    assert eta["draws"] == 10000
+    assert time.perf_counter() - start < 1.0
+
+def test_running_tables_beyond_parallelism_all_start_now():
+    hist = history()
+    # 5 tables running for ~20 of their ~30 minutes on a cluster that usually runs 3
+    eta = estimate_batch_eta(tables(8, [20] * 5), hist, {}, now=NOW, parallelism=3, seed=3)
+    assert eta["tables_remaining"] == 5
+    assert 0 < eta["p50_remaining_minutes"] < 20
@@ -0,0 +1,80 @@
+# backend/tests/test_batch_runner.py
+import os
+import sys
+import json
+import pandas as pd
+import pytest
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import batch_runner
+
+def test_tasks_cover_business_days_and_previous_business_day():
+    dates = batch_runner.business_days("2025-03-07", "2025-03-11")
+    assert dates == ["2025-03-07", "2025-03-10", "2025-03-11"]
+
+    tasks = batch_runner.build_tasks(dates, ["get_6g_status", "sls_details_variance"], "OS-09")
+    assert tasks[0]["args"] == {"cob_date": "03-07-2025"}
+    assert tasks[4]["args"] == {"date1": "2025-03-07", "date2": "2025-03-10", "top_k": 0,
+                                "product_identifiers": "OS-09"}
+    with pytest.raises(ValueError):
+        batch_runner.build_tasks(dates, ["time_remaining"])
+
+class StandIn:
+    """Registered-function stand-in whose first call for each of fail_dates fails."""
+
+    def __init__(self, fail_dates=()):
+        self.failures = {(name, date) for name in batch_runner.BATCH_FUNCTIONS for date in fail_dates}
+        self.calls = []
+
+    def __call__(self, function_name, args):
+        date = args.get("date2") or pd.Timestamp(args["cob_date"]).strftime('%Y-%m-%d')
+        self.calls.append((function_name, date))
+        if (function_name, date) in self.failures:
+            self.failures.discard((function_name, date))
+            return {"success": False, "error": "ORA-12170: TNS:Connect timeout occurred"}
+        if function_name == "get_6g_status":
+            return {"success": True, "tables": [{"bpf_id": "6101", "status": "COMPLETED", "duration_minutes": 42},
+                                                {"bpf_id": "6102", "status": "RUNNING", "prediction_range": "5-10 mins"}]}
+        return {"success": True, "date1": args["date1"], "date2": date,
+                "reporting_table_analysis": {"variance_data": [{"sls_line": "I.A.1", "percentage_variance": 25.0}],
+                                             "missing_pairs": []},
+                "base_data_analysis": None, "sls_details_analysis": None}
+
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+def test_interrupted_run_resumes_from_checkpoint(tmp_path, output_format):
+    tasks = batch_runner.build_tasks(batch_runner.business_days("2025-03-03", "2025-03-05"),
+                                     ["get_6g_status", "sls_details_variance"])
+    stand_in = StandIn(fail_dates={"2025-03-04"})
+
+    first = batch_runner.run_batch(tasks, str(tmp_path), output_format, workers=3, execute=stand_in)
+    assert first["failed"] == 2 and first["done"] == 4
+    assert "outputs" not in first
+
+    stand_in.calls.clear()
+    second = batch_runner.run_batch(tasks, str(tmp_path), output_format, workers=3, execute=stand_in)
+    assert sorted(stand_in.calls) == [("get_6g_status", "2025-03-04"), ("sls_details_variance", "2025-03-04")]
+    assert second == {**second, "done": 2, "skipped": 4, "failed": 0}
+
+    status = batch_runner.read_frame(second["outputs"]["get_6g_status"]["path"], output_format)
+    assert len(status) == 6 and sorted(status["cob_date"].unique()) == ["2025-03-03", "2025-03-04", "2025-03-05"]
+    variance = batch_runner.read_frame(second["outputs"]["sls_details_variance"]["path"], output_format)
+    assert sorted(variance["date2"]) == ["2025-03-03", "2025-03-04", "2025-03-05"]
+    assert "2025-02-28" in set(variance["date1"])  # D-1 of a Monday is the Friday before
+    assert set(variance["analysis"]) == {"reporting_table"}
+
+    with open(tmp_path / batch_runner.CHECKPOINT_FILE) as checkpoint_file:
+        records = [json.loads(line) for line in checkpoint_file]
+    assert [record["status"] for record in records].count("failed") == 2
+
+def test_changed_arguments_rerun_tasks(tmp_path):
+    dates = batch_runner.business_days("2025-03-03", "2025-03-04")
+    stand_in = StandIn()
+    batch_runner.run_batch(batch_runner.build_tasks(dates, ["sls_details_variance"], top_k=10),
+                           str(tmp_path), "csv", workers=2, execute=stand_in)
+
+    stand_in.calls.clear()
+    rerun = batch_runner.run_batch(batch_runner.build_tasks(dates, ["sls_details_variance"], top_k=0),
+                                   str(tmp_path), "csv", workers=2, execute=stand_in)
+    assert rerun["skipped"] == 0 and len(stand_in.calls) == 2
@@ -0,0 +1,80 @@
+# backend/tests/test_chat_routes.py
+import os
+import sys
+import threading
+from types import SimpleNamespace
+import pytest
+from flask import Flask
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api import chat_routes
+from api.chat_routes import chat_bp
+from config import Config
+from services import admission
+from services.admission import BackendLimiter, admit
+from functions.function_registry import register_function
+from services.circuit_breaker import CircuitOpen
+from services.deadline import DeadlineExceeded
+
+@pytest.fixture
+def client(monkeypatch):
+    def function_call(message, history=None, function_result=None, **kwargs):
+        assert function_result is None, "the second completion must not run after a failed function call"
+        call = SimpleNamespace(name="test_backend_call", arguments='{"cob_date": "04-03-2025"}')
+        return SimpleNamespace(content=None, function_call=call)
+    monkeypatch.setattr(chat_routes, "get_openai_response", function_call)
+
+    app = Flask(__name__)
+    app.register_blueprint(chat_bp, url_prefix='/api')
+    return app.test_client()
+
+def ask(client):
+    return client.post('/api/chat', json={"message": "What is the 6G status?", "history": []})
+
+def test_open_circuit_in_a_function_returns_503(client):
+    def status(cob_date):
+        raise CircuitOpen("oracle", 12.5)
+    register_function("test_backend_call", status)
+
+    response = ask(client)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "13"
+    assert response.get_json()["backend"] == "oracle"
+
+def test_deadline_in_a_function_returns_504(client):
+    def status(cob_date):
+        raise DeadlineExceeded("The request ran out of time before all backend calls completed.")
+    register_function("test_backend_call", status)
+
+    assert ask(client).status_code == 504
+
+def test_admission_rejection_in_a_function_returns_503(client, monkeypatch):
+    monkeypatch.setattr(Config, "ADMISSION_ENABLED", True)
+    limiter = BackendLimiter("oracle", max_concurrent=1, max_queue=0, queue_timeout=5)
+    monkeypatch.setitem(admission._limiters, "oracle", limiter)
+
+    def status(cob_date):
+        with admit("oracle"):
+            return {"success": True}
+    register_function("test_backend_call", status)
+
+    # Another request holds the only Oracle slot
+    started, release = threading.Event(), threading.Event()
+    def hold():
+        with limiter.admit():
+            started.set()
+            release.wait(5)
+    holder = threading.Thread(target=hold)
+    holder.start()
+    try:
+        assert started.wait(5)
+        response = ask(client)
+    finally:
+        release.set()
+        holder.join()
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.get_json()["backend"] == "oracle"
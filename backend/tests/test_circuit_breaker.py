@@ -0,0 +1,105 @@
+# backend/tests/test_circuit_breaker.py
+import os
+import sys
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import circuit_breaker
+from services.circuit_breaker import CircuitBreaker, CircuitOpen, call_with_fallback
+from services.deadline import deadline_scope, remaining, timeout_for, DeadlineExceeded
+
+def fail(breaker):
+    with pytest.raises(ConnectionError):
+        with breaker.protect():
+            raise ConnectionError("refused")
+
+def test_deadline_caps_timeouts_and_propagates_to_copied_contexts():
+    assert timeout_for(10) == 10
+    with deadline_scope(5):
+        assert timeout_for(10) <= 5
+        assert timeout_for(2) == 2
+        with deadline_scope(60):
+            # A nested scope never extends the budget
+            assert remaining() <= 5
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(contextvars.copy_context().run, remaining).result() <= 5
+    assert remaining() is None
+
+    with deadline_scope(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            timeout_for(10)
+
+def test_breaker_opens_fails_fast_and_recovers():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=0.05)
+    fail(breaker)
+    assert breaker.snapshot()["state"] == "closed"
+    fail(breaker)
+    assert breaker.snapshot()["state"] == "open"
+
+    with pytest.raises(CircuitOpen) as excinfo:
+        with breaker.protect():
+            pytest.fail("an open breaker must not call the dependency")
+    assert excinfo.value.retry_after >= 1
+
+    time.sleep(0.06)
+    with breaker.protect():
+        # Only the trial call gets through while half-open
+        with pytest.raises(CircuitOpen):
+            with breaker.protect():
+                pass
+    assert breaker.snapshot() == {"state": "closed", "consecutive_failures": 0,
+                                  "last_error": "refused", "snapshots": 0}
+
+def test_failed_trial_reopens_and_local_errors_do_not_count():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=0.05)
+    with pytest.raises(DeadlineExceeded):
+        with breaker.protect():
+            raise DeadlineExceeded("budget spent")
+    assert breaker.snapshot()["state"] == "closed"
+
+    fail(breaker)
+    time.sleep(0.06)
+    fail(breaker)
+    assert breaker.snapshot()["state"] == "open"
+
+def test_last_known_good_is_served_while_open(monkeypatch):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=60)
+    monkeypatch.setitem(circuit_breaker._breakers, "test", breaker)
+
+    def fetch(cob_date):
+        with circuit_breaker.protect("test"):
+            if breaker.snapshot()["consecutive_failures"] == 0 and cob_date == "fresh":
+                return ["row"]
+            raise ConnectionError("down")
+
+    assert call_with_fallback("test", "04-03-2025", fetch, "fresh") == (["row"], None)
+    with pytest.raises(ConnectionError):
+        call_with_fallback("test", "04-03-2025", fetch, "down")
+
+    rows, age = call_with_fallback("test", "04-03-2025", fetch, "fresh")
+    assert rows == ["row"] and age >= 0
+    with pytest.raises(CircuitOpen):
+        call_with_fallback("test", "04-04-2025", fetch, "fresh")
+
+def test_deadline_capped_timeouts_do_not_count_as_failures():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=60)
+    with deadline_scope(0.05):
+        with pytest.raises(TimeoutError):
+            with breaker.protect():
+                time.sleep(timeout_for(10))  # the deadline, not the 10s call timeout, is binding
+                raise TimeoutError("timed out")
+    assert breaker.snapshot()["state"] == "closed"
+
+    # The dependency's own timeout expiring well inside the budget still counts
+    with deadline_scope(60):
+        with pytest.raises(TimeoutError):
+            with breaker.protect():
+                timeout_for(0.01)
+                raise TimeoutError("timed out")
+    assert breaker.snapshot()["state"] == "open"
@@ -0,0 +1,50 @@
+# backend/tests/test_completion_cache.py
+import os
+import sys
+import time
+import pytest
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import azure_openai
+from services.azure_openai import CompletionCache, build_messages, completion_cache_key
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = CompletionCache(max_entries=2, ttl_seconds=60)
+    monkeypatch.setattr(azure_openai, "_completion_cache", cache)
+    return cache
+
+def test_key_normalizes_text_but_not_function_results():
+    result = {"name": "time_remaining", "result": {"remaining": "2h 10m"}}
+    key = completion_cache_key(build_messages("How much  time is left?\n", function_result=result))
+    assert key == completion_cache_key(build_messages("How much time is left?", function_result=result))
+
+    other = {"name": "time_remaining", "result": {"remaining": "2h 09m"}}
+    assert key != completion_cache_key(build_messages("How much time is left?", function_result=other))
+    assert key != completion_cache_key(build_messages("How much time is left?", function_result=result),
+                                       model="another-model")
+
+def test_lru_ttl_and_hit_rate(cache):
+    cache.put("a", "reply a")
+    cache.put("b", "reply b")
+    assert cache.get("a") == "reply a"
+    cache.put("c", "reply c")  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    assert cache.stats() == {"entries": 2, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    cache.ttl_seconds = 0.01
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+def test_cached_completion_skips_the_api_unless_bypassed(cache, monkeypatch):
+    def no_api_calls():
+        raise AssertionError("the cached completion should be returned without calling Azure OpenAI")
+    monkeypatch.setattr(azure_openai, "get_access_token", no_api_calls)
+
+    cache.put(completion_cache_key(build_messages("What is the 6G status?")), "cached reply")
+    assert azure_openai.get_openai_response("What is the  6G status?") == "cached reply"
+
+    with pytest.raises(AssertionError):
+        azure_openai.get_openai_response("What is the 6G status?", use_cache=False)
@@ -0,0 +1,37 @@
+# backend/tests/test_cpu_pool.py
+import os
+import sys
+import importlib
+import pandas as pd
+import pytest
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from services import cpu_pool
+
+variance = importlib.import_module("functions.sls_details_variance")
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(Config, "CPU_POOL_SIZE", 1)
+    yield cpu_pool.get_cpu_pool()
+    cpu_pool.shutdown_cpu_pool()
+
+def test_variance_stage_in_worker_matches_inline(pool):
+    rows = [(key, date, f"L{line}", context, 100.0 + line * (key - 1) * 7)
+            for key, date in ((1, "2025-04-02"), (2, "2025-04-03"))
+            for line in range(6) for context in ("A", "B")]
+    df = pd.DataFrame(rows, columns=["context_key", "cob_date", "sls_line_number", "context_name", "ccf_flow_amt"])
+    df["sls_line_number"] = df["sls_line_number"].astype("category")
+    args = (df, "sls_line_number", "ccf_flow_amt", "2025-04-02", "2025-04-03")
+
+    inline = variance.rank_variance_result(variance.analyze_variance_in_dataframe(*args, rank=False), top_k=2)
+    offloaded = variance.run_variance_analysis(*args, top_k=2)
+
+    for key in ("variance_data", "missing_pairs", "sls_lines_with_variance"):
+        assert offloaded[key] == inline[key]
+    assert offloaded["variance_page"]["total"] == inline["variance_page"]["total"]
+    # The remainder is paged from this process's store
+    assert variance.variance_page(offloaded["variance_page"]["next_cursor"])["success"]
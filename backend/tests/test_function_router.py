@@ -0,0 +1,109 @@
+# backend/tests/test_function_router.py
+import os
+import sys
+import time
+import threading
+import pytest
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from functions.function_registry import register_function
+from services.function_router import route_function_call, normalize_args
+from services import metrics
+from services.deadline import deadline_scope, DeadlineExceeded
+
+def test_normalize_args():
+    """Formatting noise in arguments should not change the coalescing key."""
+    assert normalize_args({"cob_date": " 04-03-2025 ", "table_name": None}) == \
+        normalize_args({"cob_date": "04-03-2025"})
+    assert normalize_args({"a": 1, "b": 2}) == normalize_args({"b": 2, "a": 1})
+    assert normalize_args({"cob_date": "04-03-2025"}) != normalize_args({"cob_date": "04-02-2025"})
+
+def test_identical_concurrent_calls_are_coalesced():
+    """Identical concurrent calls should run the backend work once."""
+    calls = []
+    release = threading.Event()
+
+    def slow_status(cob_date, table_name=None):
+        calls.append(cob_date)
+        release.wait(5)
+        return {"success": True, "cob_date": cob_date}
+
+    register_function("test_slow_status", slow_status)
+    metrics.reset_metrics()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(
+            route_function_call("test_slow_status", '{"cob_date": "04-03-2025"}')))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+
+    # Give the followers time to attach to the leader's call
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["04-03-2025"]
+    assert len(results) == 5
+    assert all(r["result"] == {"success": True, "cob_date": "04-03-2025"} for r in results)
+
+    counters = metrics.get_metrics()["counters"]
+    assert counters["function_router.executed.test_slow_status"] == 1
+    assert counters["function_router.coalesced.test_slow_status"] == 4
+
+def test_errors_are_shared_and_not_cached():
+    """A failing leader should fail its followers, and the next call should run again."""
+    attempts = []
+
+    def failing(x):
+        attempts.append(x)
+        raise RuntimeError("backend down")
+
+    register_function("test_failing", failing)
+
+    first = route_function_call("test_failing", {"x": 1})
+    second = route_function_call("test_failing", {"x": 1})
+
+    assert first["result"] == {"error": "backend down"}
+    assert second["result"] == {"error": "backend down"}
+    assert attempts == [1, 1]
+
+def test_follower_retries_when_the_leader_runs_out_of_its_own_time():
+    """A follower with time left should not inherit the leader's DeadlineExceeded."""
+    attempts = []
+    leader_started, release = threading.Event(), threading.Event()
+
+    def status(cob_date):
+        attempts.append(cob_date)
+        if len(attempts) == 1:
+            leader_started.set()
+            release.wait(5)
+            raise DeadlineExceeded("leader budget spent")
+        return {"success": True}
+
+    register_function("test_deadline_status", status)
+    def leader():
+        with deadline_scope(60), pytest.raises(DeadlineExceeded):
+            route_function_call("test_deadline_status", {"cob_date": "04-03-2025"})
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    leader_started.wait(5)
+
+    follower_result = []
+    def follower():
+        with deadline_scope(60):
+            follower_result.append(route_function_call("test_deadline_status", {"cob_date": "04-03-2025"}))
+    follower_thread = threading.Thread(target=follower)
+    follower_thread.start()
+    time.sleep(0.1)
+    release.set()
+    leader_thread.join()
+    follower_thread.join()
+
+    assert follower_result == [{"name": "test_deadline_status", "result": {"success": True}}]
+    assert len(attempts) == 2
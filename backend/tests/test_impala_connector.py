@@ -0,0 +1,85 @@
+# backend/tests/test_impala_connector.py
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import impala_connector
+from utils.impala_connector import GroupAccumulator, fetch_aggregated
+
+def sample_rows(n=2000, keys=300):
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({
+        "table_name": [f"T{k}" for k in rng.integers(0, keys, n)],
+        "cob_date": "04-03-2025",
+        "amount": rng.normal(size=n),
+        "region": "US",
+    })
+    df.loc[df["table_name"] == "T0", "amount"] = np.nan
+    return df
+
+def chunks_of(df, size):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+def expected_sums(df):
+    return df.groupby(["table_name", "cob_date"])["amount"].sum(min_count=1)
+
+def test_accumulator_matches_groupby_and_keeps_null_sums():
+    df = sample_rows()
+    accumulator = GroupAccumulator(["table_name", "cob_date"], ["amount"], ["region"], compact_rows=100)
+    for chunk in chunks_of(df, 50):
+        accumulator.add(chunk)
+    result = accumulator.result().set_index(["table_name", "cob_date"])["amount"]
+
+    expected = expected_sums(df)
+    pd.testing.assert_series_equal(result.sort_index(), expected.sort_index(), check_names=False)
+    assert pd.isna(result.loc[("T0", "04-03-2025")])
+
+def test_accumulator_only_re_reduces_the_pending_tail():
+    # Every row is its own key, so the compacted result keeps growing
+    df = sample_rows(n=2000)
+    df["table_name"] = [f"T{i}" for i in range(len(df))]
+    accumulator = GroupAccumulator(["table_name", "cob_date"], ["amount"], compact_rows=200)
+    reduced_rows = []
+    reduce = accumulator._reduce
+    accumulator._reduce = lambda frame: reduced_rows.append(len(frame)) or reduce(frame)
+
+    for chunk in chunks_of(df, 50):
+        accumulator.add(chunk)
+    assert len(accumulator.result()) == 2000
+
+    # Chunk reductions (2,000 rows) plus ~10 merges; re-reducing everything on
+    # every add past the threshold would be over 40,000 rows
+    assert sum(reduced_rows) < 15000
+
+def test_empty_accumulator_returns_the_expected_columns():
+    accumulator = GroupAccumulator(["table_name"], ["amount"], ["region"])
+    accumulator.add(pd.DataFrame(columns=["table_name", "amount", "region"]))
+    assert list(accumulator.result().columns) == ["table_name", "amount", "region"]
+
+def test_fetch_aggregated_stream_and_frame_modes_agree(monkeypatch):
+    df = sample_rows()
+    expected = expected_sums(df).sort_index()
+
+    monkeypatch.setattr(impala_connector, "iter_query_chunks", lambda query, chunk_size=None: iter(chunks_of(df, 250)))
+    streamed, stats = fetch_aggregated("SELECT ...", ["table_name", "cob_date"], ["amount"], mode="stream")
+    assert stats["mode"] == "stream" and stats["rows"] == 2000 and stats["chunks"] == 8
+    pd.testing.assert_series_equal(streamed.set_index(["table_name", "cob_date"])["amount"].sort_index(),
+                                   expected, check_names=False)
+
+    class FakeConnection:
+        closed = False
+        def close(self):
+            self.closed = True
+
+    conn = FakeConnection()
+    monkeypatch.setattr(impala_connector, "get_impala_connection", lambda: conn)
+    monkeypatch.setattr(impala_connector.pd, "read_sql_query",
+                        lambda query, connection: expected.reset_index())
+    framed, stats = fetch_aggregated("SELECT ...", ["table_name", "cob_date"], ["amount"], mode="frame")
+    assert stats["mode"] == "frame" and stats["rows"] == len(expected) and stats["chunks"] == 1
+    assert conn.closed
+    assert len(framed) == len(streamed)
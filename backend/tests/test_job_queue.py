@@ -0,0 +1,97 @@
+# backend/tests/test_job_queue.py
+import os
+import sys
+import json
+import time
+import threading
+import pytest
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from functions.function_registry import register_function
+from services import function_router
+from services.job_queue import JobQueue, JobQueueFull, PENDING_STATES
+
+release = threading.Event()
+calls = []
+
+def slow_report(date):
+    calls.append(date)
+    release.wait(5)
+    return {"success": True, "date": date}
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get_job(job_id, include_result=True)
+        if job["status"] not in PENDING_STATES:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    register_function("slow_report", slow_report, long_running=True, idempotent=True)
+    register_function("slow_sync", slow_report, long_running=True)
+    release.clear()
+    calls.clear()
+    queue = JobQueue(db_path=str(tmp_path / "jobs.sqlite3"), max_workers=2, max_pending=2)
+    monkeypatch.setattr(function_router, "get_job_queue", lambda: queue)
+    yield queue
+    release.set()
+    queue.shutdown()
+
+def test_long_running_call_returns_job_id_and_result_is_kept(queue):
+    routed = function_router.route_function_call("slow_report", json.dumps({"date": "2025-04-03"}))
+    job_id = routed["result"]["job_id"]
+    assert routed["result"]["status"] in PENDING_STATES
+
+    # An identical call while pending joins the same job
+    again = function_router.route_function_call("slow_report", {"date": " 2025-04-03 "})
+    assert again["result"]["job_id"] == job_id
+
+    release.set()
+    job = wait_for(queue, job_id)
+    assert job["status"] == "succeeded" and job["attempts"] == 1
+    assert job["result"] == {"success": True, "date": "2025-04-03"}
+    assert calls == ["2025-04-03"]
+
+def test_pending_jobs_are_bounded(queue):
+    queue.submit("slow_report", {"date": "a"})
+    queue.submit("slow_report", {"date": "b"})
+    with pytest.raises(JobQueueFull):
+        queue.submit("slow_report", {"date": "c"})
+
+def test_restart_requeues_unfinished_jobs(queue, tmp_path):
+    job_id = queue.submit("slow_report", {"date": "2025-04-04"})["job_id"]
+    # Simulate a crash: the row stays 'running' and its owner is gone
+    with queue._conn:
+        queue._conn.execute("UPDATE jobs SET status = 'running', owner_pid = NULL WHERE job_id = ?", (job_id,))
+
+    restarted = JobQueue(db_path=queue.db_path, max_workers=1)
+    try:
+        assert restarted.recover() == 1
+        release.set()
+        job = wait_for(restarted, job_id)
+        assert job["status"] == "succeeded" and job["attempts"] == 2
+    finally:
+        restarted.shutdown()
+
+def test_interrupted_non_idempotent_jobs_are_failed_not_rerun(queue):
+    running_id = queue.submit("slow_sync", {"date": "2025-04-04"})["job_id"]
+    queued_id = queue.submit("slow_sync", {"date": "2025-04-05"})["job_id"]
+    with queue._conn:
+        queue._conn.execute("UPDATE jobs SET status = 'running', owner_pid = NULL WHERE job_id = ?", (running_id,))
+        queue._conn.execute("UPDATE jobs SET status = 'queued', owner_pid = NULL WHERE job_id = ?", (queued_id,))
+
+    restarted = JobQueue(db_path=queue.db_path, max_workers=1)
+    try:
+        # Only the job that never started runs again
+        assert restarted.recover() == 1
+        failed = restarted.get_job(running_id)
+        assert failed["status"] == "failed" and "not safe to repeat" in failed["error"]
+        release.set()
+        assert wait_for(restarted, queued_id)["status"] == "succeeded"
+    finally:
+        restarted.shutdown()
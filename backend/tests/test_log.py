@@ -0,0 +1,55 @@
+# backend/tests/test_log.py
+import io
+import os
+import sys
+import json
+import logging
+import pytest
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.log import configure_logging, summarize, sampled
+
+@pytest.fixture(autouse=True)
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    logging.getLogger("tests.log.poll").setLevel(logging.NOTSET)
+
+class CountingPayload:
+    renders = 0
+
+    def __str__(self):
+        CountingPayload.renders += 1
+        return "payload"
+
+def test_payloads_are_only_rendered_when_emitted_and_capped():
+    stream = io.StringIO()
+    configure_logging(level="INFO", log_format="text", module_levels="", stream=stream)
+    logger = logging.getLogger("tests.log.lazy")
+
+    logger.debug("Function result: %s", summarize(CountingPayload()))
+    assert CountingPayload.renders == 0
+
+    logger.info("Query: %s", summarize("x" * 5000, 100))
+    logger.info("Result: %s", summarize({"rows": list(range(10000))}))
+    lines = stream.getvalue().splitlines()
+    assert lines[0].endswith("x" * 100 + "... (5000 chars)")
+    assert lines[1].endswith("Result: {'rows': [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...]}")
+
+def test_json_format_module_levels_and_sampling():
+    stream = io.StringIO()
+    configure_logging(level="WARNING", log_format="json", module_levels="tests.log.poll=DEBUG", stream=stream)
+    logger = logging.getLogger("tests.log.poll")
+
+    for i in range(10):
+        logger.debug("Delta poll returned %d rows", i, extra=sampled(5))
+    logging.getLogger("tests.log.other").info("not emitted")
+
+    entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [entry["message"] for entry in entries] == ["Delta poll returned 0 rows", "Delta poll returned 5 rows"]
+    assert entries[0]["level"] == "DEBUG" and entries[0]["sample_every"] == 5
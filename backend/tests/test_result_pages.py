@@ -0,0 +1,82 @@
+# backend/tests/test_result_pages.py
+import os
+import sys
+import pytest
+import numpy as np
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import result_pages
+from utils.result_pages import ResultPageStore, take_top_k, get_result_page_store
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    store = ResultPageStore(db_path=str(tmp_path / "result_pages.sqlite3"))
+    monkeypatch.setattr(result_pages, "_store", store)
+    return store
+
+def test_top_k_then_pages_cover_everything_in_order():
+    records = [{"id": i, "score": (i * 37) % 101} for i in range(100)]
+    top, page = take_top_k(records, [r["score"] for r in records], 10, kind="test")
+
+    assert page["total"] == 100 and page["returned"] == 10
+    collected = list(top)
+    cursor = page["next_cursor"]
+    while cursor:
+        result = get_result_page_store().get_page(cursor, page_size=25)
+        assert result["success"]
+        collected.extend(result["items"])
+        cursor = result["next_cursor"]
+
+    assert len(collected) == 100
+    assert [r["score"] for r in collected] == sorted((r["score"] for r in records), reverse=True)
+
+def test_small_results_are_returned_whole():
+    top, page = take_top_k([{"v": 1}, {"v": 3}], [1, 3], 10)
+    assert top == [{"v": 3}, {"v": 1}]
+    assert page["next_cursor"] is None
+
+def test_unknown_cursor():
+    assert not get_result_page_store().get_page("deadbeef:0")["success"]
+    assert not get_result_page_store().get_page("garbage")["success"]
+
+def test_total_and_offsets_count_the_whole_result():
+    records = list(range(30))
+    top, page = take_top_k(records, records, 10)
+    first = get_result_page_store().get_page(page["next_cursor"], page_size=15)
+    second = get_result_page_store().get_page(first["next_cursor"], page_size=15)
+
+    assert page["total"] == first["total"] == second["total"] == 30
+    assert (first["offset"], second["offset"]) == (10, 25)
+    assert second["items"] == [4, 3, 2, 1, 0] and second["next_cursor"] is None
+
+def test_negative_top_k_and_offsets_are_rejected():
+    with pytest.raises(ValueError):
+        take_top_k([1, 2], [1, 2], -1)
+
+    _, page = take_top_k(list(range(30)), list(range(30)), 10)
+    result_id = page["next_cursor"].split(':')[0]
+    assert not get_result_page_store().get_page(f"{result_id}:-5")["success"]
+    assert not get_result_page_store().get_page(f"{result_id}:3")["success"]
+    assert not get_result_page_store().get_page(page["next_cursor"], page_size=-1)["success"]
+
+def test_pages_are_served_by_any_worker_sharing_the_file(store):
+    records = [{"sls_line": f"I.A.{i}", "pct": np.float64(i)} for i in range(20)]
+    _, page = take_top_k(records, [r["pct"] for r in records], 5)
+
+    # Another worker process opens the same file
+    other_worker = ResultPageStore(db_path=store.db_path)
+    result = other_worker.get_page(page["next_cursor"], page_size=100)
+    assert result["success"] and result["total"] == 20
+    assert [item["sls_line"] for item in result["items"]] == [f"I.A.{i}" for i in range(14, -1, -1)]
+
+def test_expired_and_evicted_results_are_gone(tmp_path):
+    store = ResultPageStore(db_path=str(tmp_path / "pages.sqlite3"), max_results=2)
+    cursors = [store.put("test", [1, 2], np.array([1.0, 2.0])) for _ in range(3)]
+    assert not store.get_page(cursors[0])["success"]
+    assert store.get_page(cursors[2])["items"] == [2, 1]
+
+    store.ttl_seconds = -1
+    expired = store.put("test", [1], np.array([1.0]))
+    assert not store.get_page(expired)["success"]
@@ -0,0 +1,190 @@
+# backend/tests/test_s3_list.py
+import os
+import sys
+import gzip
+import json
+import threading
+import pytest
+from collections import Counter
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from functions.s3_list import list_s3_stats, merge_listing_stats, refresh_inventory, s3_inventory, read_inventory_report
+
+class FakeS3:
+    """Serves list_objects_v2 from an in-memory {key: size} dict, with S3's paging and delimiter rules."""
+
+    def __init__(self, objects, page_size=100):
+        self.objects = dict(sorted(objects.items()))
+        self.page_size = page_size
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def list_objects_v2(self, Bucket, Prefix="", Delimiter=None, StartAfter=None, ContinuationToken=None):
+        with self._lock:
+            self.calls[Prefix] += 1
+        after = ContinuationToken or StartAfter or ""
+        contents, prefixes = [], []
+        for key, size in self.objects.items():
+            if not key.startswith(Prefix) or key <= after:
+                continue
+            if Delimiter and Delimiter in key[len(Prefix):]:
+                common = Prefix + key[len(Prefix):].split(Delimiter)[0] + Delimiter
+                if common in prefixes or common <= after:
+                    continue
+                prefixes.append(common)
+                marker = common + '￿'
+            else:
+                contents.append({"Key": key, "Size": size, "LastModified": "2025-04-03T00:00:00Z"})
+                marker = key
+            if len(contents) + len(prefixes) == self.page_size:
+                return {"Contents": contents, "CommonPrefixes": [{"Prefix": p} for p in prefixes],
+                        "IsTruncated": True, "NextContinuationToken": marker}
+        return {"Contents": contents, "CommonPrefixes": [{"Prefix": p} for p in prefixes], "IsTruncated": False}
+
+def make_objects():
+    objects = {"refined/reporting/": 0, "refined/reporting/_SUCCESS": 12}
+    for day in range(1, 21):
+        for part in range(day * 10):
+            objects[f"refined/reporting/cob_date=2025-04-{day:02d}/part-{part:05d}.parquet"] = 1000 + part
+        objects[f"refined/reporting/cob_date=2025-04-{day:02d}/"] = 0
+    return objects
+
+def test_parallel_listing_matches_serial():
+    objects = make_objects()
+    real = {k: v for k, v in objects.items() if not k.endswith('/') and v > 0}
+
+    serial = list_s3_stats("bucket", "refined/reporting/", max_workers=1, sample_limit=50, s3=FakeS3(objects), seed=1)
+    fake = FakeS3(objects)
+    parallel = list_s3_stats("bucket", "refined/reporting/", max_workers=4, sample_limit=50, s3=fake, seed=1)
+
+    for result in (serial, parallel):
+        assert result["total_file_count"] == len(real)
+        assert result["total_bytes"] == sum(real.values())
+        assert result["sample_size"] == 50
+    assert parallel["shards"] == 20
+    # Every partition was listed on its own
+    assert fake.calls["refined/reporting/cob_date=2025-04-20/"] >= 1
+
+def test_merged_sample_is_drawn_in_proportion_to_shard_counts():
+    small = {"count": 100, "total_bytes": 100, "sample": [1] * 10}
+    large = {"count": 900, "total_bytes": 1800, "sample": [2] * 10}
+    picks = Counter()
+    for seed in range(200):
+        merged = merge_listing_stats([small, large], 10, seed=seed)
+        assert merged["count"] == 1000 and merged["total_bytes"] == 1900
+        picks.update(merged["sample"])
+    share = picks[1] / (picks[1] + picks[2])
+    assert 0.07 < share < 0.13
+
+def test_inventory_refresh_lists_only_new_and_latest_partitions(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "S3_INVENTORY_DIR", str(tmp_path))
+    monkeypatch.setattr(Config, "S3_INVENTORY_RELIST_LATEST", 2)
+    objects = make_objects()
+    fake = FakeS3(objects)
+
+    snapshot = refresh_inventory("bucket", "refined/reporting/", s3=fake)
+    assert snapshot["last_refresh"]["mode"] == "full"
+    assert len(snapshot["partitions"]) == 21  # 20 dates + files directly under the prefix
+    assert snapshot["partitions"]["refined/reporting/"]["count"] == 1
+
+    # A new date arrives and the latest date gets another file
+    objects["refined/reporting/cob_date=2025-04-21/part-00000.parquet"] = 5000
+    objects["refined/reporting/cob_date=2025-04-20/part-99999.parquet"] = 7000
+    fake = FakeS3(objects)
+    snapshot = refresh_inventory("bucket", "refined/reporting/", s3=fake)
+
+    assert snapshot["last_refresh"]["mode"] == "incremental"
+    assert snapshot["last_refresh"]["partitions_listed"] == 3
+    assert snapshot["last_refresh"]["new_partitions"] == 1
+    listed = {prefix for prefix in fake.calls if prefix.startswith("refined/reporting/cob_date=")}
+    assert listed == {"refined/reporting/cob_date=2025-04-19/", "refined/reporting/cob_date=2025-04-20/",
+                      "refined/reporting/cob_date=2025-04-21/"}
+
+    real = {k: v for k, v in objects.items() if not k.endswith('/') and v > 0}
+    partitions = snapshot["partitions"]
+    assert sum(p["count"] for p in partitions.values()) == len(real)
+    assert sum(p["total_bytes"] for p in partitions.values()) == sum(real.values())
+    assert partitions["refined/reporting/cob_date=2025-04-20/"]["count"] == 201
+
+def test_inventory_function_answers_from_snapshot(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "S3_INVENTORY_DIR", str(tmp_path))
+    monkeypatch.setattr(Config, "S3_BUCKET", "bucket")
+    refresh_inventory("bucket", "refined/reporting/", s3=FakeS3(make_objects()))
+
+    result = s3_inventory(top_k=3)
+    assert result["success"] and not result["refresh_in_progress"]
+    assert result["partition_count"] == 21
+    assert [p["prefix"] for p in result["partitions"]] == [
+        f"refined/reporting/cob_date=2025-04-{day}/" for day in (20, 19, 18)]
+    assert result["partitions_page"]["total"] == 21
+
+def write_inventory_report(root, objects, file_format="CSV", files=2):
+    """Write objects as an S3 Inventory report under root/<config>/ like S3 does."""
+    config_dir = os.path.join(root, "inventory", "source-bucket", "daily")
+    data_dir = os.path.join(config_dir, "data")
+    report_dir = os.path.join(config_dir, "2025-04-22T01-00Z")
+    os.makedirs(data_dir)
+    os.makedirs(report_dir)
+    rows = [("source-bucket", key, size, "2025-04-03T01:02:03.000Z", "true", "false")
+            for key, size in objects.items()]
+    # A non-current version and a delete marker must not be counted
+    rows.append(("source-bucket", "refined/reporting/cob_date=2025-04-01/old.parquet", 99, "2025-04-01T00:00:00.000Z", "false", "false"))
+    rows.append(("source-bucket", "refined/reporting/cob_date=2025-04-01/gone.parquet", 0, "2025-04-01T00:00:00.000Z", "true", "true"))
+    entries = []
+    for index in range(files):
+        part = rows[index::files]
+        key = f"inventory/source-bucket/daily/data/part-{index}.{'csv.gz' if file_format == 'CSV' else 'parquet'}"
+        path = os.path.join(root, key)
+        if file_format == "CSV":
+            with gzip.open(path, 'wt') as data_file:
+                for bucket, object_key, size, modified, latest, marker in part:
+                    encoded = object_key.replace("=", "%3D")
+                    data_file.write(f'"{bucket}","{encoded}","{size}","{modified}","{latest}","{marker}"\n')
+        else:
+            pa = pytest.importorskip("pyarrow")
+            import pyarrow.parquet as pq
+            columns = list(zip(*part))
+            pq.write_table(pa.table({
+                "bucket": list(columns[0]), "key": list(columns[1]), "size": [int(v) for v in columns[2]],
+                "last_modified_date": pa.array([v.replace(".000Z", "") for v in columns[3]]).cast(pa.timestamp("s")),
+                "is_latest": [v == "true" for v in columns[4]], "is_delete_marker": [v == "true" for v in columns[5]]
+            }), path, row_group_size=50)
+        entries.append({"key": key, "size": os.path.getsize(path), "MD5checksum": ""})
+    with open(os.path.join(report_dir, "manifest.json"), 'w') as manifest_file:
+        json.dump({
+            "sourceBucket": "source-bucket",
+            "destinationBucket": "arn:aws:s3:::inventory-bucket",
+            "fileFormat": file_format,
+            "fileSchema": "Bucket, Key, Size, LastModifiedDate, IsLatest, IsDeleteMarker",
+            "creationTimestamp": "1745283600000",
+            "files": entries
+        }, manifest_file)
+    return config_dir
+
+@pytest.mark.parametrize("file_format", ["CSV", "Parquet"])
+def test_inventory_report_gives_exact_partition_stats(monkeypatch, tmp_path, file_format):
+    monkeypatch.setattr(Config, "S3_INVENTORY_CHUNK_ROWS", 64)
+    objects = make_objects()
+    config_dir = write_inventory_report(str(tmp_path), objects, file_format)
+
+    report = read_inventory_report(config_dir, "refined/reporting/", max_workers=2)
+
+    real = {k: v for k, v in objects.items() if not k.endswith('/') and v > 0}
+    partitions = report["partitions"]
+    assert report["files"] == 2
+    assert report["rows_scanned"] == len(objects) + 2
+    assert sum(p["count"] for p in partitions.values()) == len(real)
+    assert sum(p["total_bytes"] for p in partitions.values()) == sum(real.values())
+    assert partitions["refined/reporting/cob_date=2025-04-01/"]["count"] == 10
+    assert partitions["refined/reporting/"]["count"] == 1
+    assert partitions["refined/reporting/cob_date=2025-04-05/"]["max_last_modified"].startswith("2025-04-03T01:02:03")
+
+def test_inventory_snapshot_from_report(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "S3_INVENTORY_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(Config, "S3_INVENTORY_MANIFEST", write_inventory_report(str(tmp_path), make_objects()))
+    snapshot = refresh_inventory("bucket", "refined/reporting/")
+    assert snapshot["last_refresh"]["mode"] == "inventory_report"
+    assert len(snapshot["partitions"]) == 21
@@ -0,0 +1,61 @@
+# backend/tests/test_serialization.py
+import os
+import sys
+import gzip
+import json
+import datetime
+import numpy as np
+import pandas as pd
+from flask import Flask, jsonify, request
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.serialization import dumps, FastJSONProvider, compress_response, choose_encoding, brotli
+
+def test_encodes_numpy_pandas_and_non_finite_values():
+    payload = {
+        "count": np.int64(3),
+        "pct": np.float64(12.5),
+        "flag": np.bool_(True),
+        "values": np.array([1.5, 2.5]),
+        "when": pd.Timestamp("2025-04-03 18:00:00"),
+        "missing": pd.NaT,
+        "date": datetime.date(2025, 4, 3),
+        "series": pd.Series([1, 2]),
+        "nan": float("nan"),
+        "inf": np.inf,
+    }
+    assert json.loads(dumps(payload)) == {
+        "count": 3, "pct": 12.5, "flag": True, "values": [1.5, 2.5],
+        "when": "2025-04-03T18:00:00", "missing": None, "date": "2025-04-03",
+        "series": [1, 2], "nan": None, "inf": None,
+    }
+
+def test_choose_encoding_honours_q_values():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding(None) is None
+    assert choose_encoding("br, gzip") == ("br" if brotli is not None else "gzip")
+
+def test_large_json_responses_are_compressed():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+
+    @app.route('/big')
+    def big():
+        return jsonify({"rows": [{"sls_line": f"I.A.{i}", "amount": np.float64(i)} for i in range(500)]})
+
+    @app.route('/small')
+    def small():
+        return jsonify({"status": "ok"})
+
+    app.after_request(lambda response: compress_response(response, request.headers.get('Accept-Encoding')))
+    client = app.test_client()
+
+    response = client.get('/big', headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.data))["rows"][499] == {"sls_line": "I.A.499", "amount": 499.0}
+
+    assert "Content-Encoding" not in client.get('/big').headers
+    assert "Content-Encoding" not in client.get('/small', headers={"Accept-Encoding": "gzip"}).headers
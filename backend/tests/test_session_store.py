@@ -0,0 +1,55 @@
+# backend/tests/test_session_store.py
+import os
+import sys
+import json
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.session_store import MemorySessionStore, SqliteSessionStore
+
+def turn(n):
+    return [{"role": "user", "content": f"question {n}"}, {"role": "assistant", "content": f"answer {n}"}]
+
+def test_memory_store_appends_and_evicts_least_recently_used():
+    store = MemorySessionStore(max_sessions=2, max_messages=40, ttl_seconds=0)
+    store.append("a", turn(1))
+    store.append("b", turn(1))
+    store.append("a", turn(2))
+    store.append("c", turn(1))  # evicts "b", the least recently used
+
+    assert store.get("a") == turn(1) + turn(2)
+    assert store.get("b") == []
+    assert store.get("c") == turn(1)
+
+def test_prefix_is_stable_until_trimmed_in_one_block():
+    store = MemorySessionStore(max_messages=8, ttl_seconds=0)
+    previous = []
+    for n in range(4):
+        store.append("a", turn(n))
+        current = store.get("a")
+        assert current[:len(previous)] == previous
+        previous = current
+
+    store.append("a", turn(4))  # 10 messages > 8: keep the newest 4, starting on a user turn
+    assert store.get("a") == turn(3) + turn(4)
+
+def test_sqlite_store_survives_reopening(tmp_path):
+    db_path = str(tmp_path / "sessions.sqlite3")
+    store = SqliteSessionStore(db_path=db_path, max_messages=40, ttl_seconds=3600)
+    store.append("a", turn(1))
+    store.append("a", turn(2))
+
+    reopened = SqliteSessionStore(db_path=db_path, max_messages=40, ttl_seconds=3600)
+    messages = reopened.get("a")
+    assert messages == turn(1) + turn(2)
+    assert json.dumps(messages) == json.dumps(store.get("a"))
+
+    reopened.delete("a")
+    assert store.get("a") == []
+
+def test_expired_sessions_start_empty(tmp_path):
+    store = SqliteSessionStore(db_path=str(tmp_path / "sessions.sqlite3"), ttl_seconds=3600)
+    store.append("a", turn(1))
+    store.ttl_seconds = 1e-9
+    assert store.get("a") == []
@@ -0,0 +1,50 @@
+# backend/tests/test_sls_details_variance.py
+import os
+import sys
+import math
+import pandas as pd
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from functions.sls_details_variance import analyze_variance_in_dataframe
+
+D1 = "2025-04-02"
+D2 = "2025-04-03"
+
+def frame(rows, categorical=False):
+    df = pd.DataFrame(rows, columns=["context_key", "cob_date", "sls_line_number", "context_name", "ccf_flow_amt"])
+    if categorical:
+        for column in ("sls_line_number", "context_name"):
+            df[column] = df[column].astype('category')
+    return df
+
+ROWS = [
+    (1, D1, "L1", "A", 100.0), (2, D2, "L1", "A", 120.0),   # +20%
+    (1, D1, "L1", "B", 100.0), (2, D2, "L1", "B", 105.0),   # +5%, below threshold
+    (1, D1, "L2", "A", 0.0),   (2, D2, "L2", "A", 7.0),     # 0 -> 7 is infinite
+    (1, D1, "L3", "A", None),  (2, D2, "L3", "A", 50.0),    # null amount is skipped
+    (1, D1, "L4", "A", 10.0),                               # missing on date2
+    (2, D2, "L5", "B", -30.0),                              # missing on date1
+]
+
+def check(result):
+    assert sorted(result["sls_lines_analyzed"]) == ["L1", "L2", "L3", "L4", "L5"]
+    assert sorted(result["sls_lines_with_variance"]) == ["L1", "L2"]
+    variance = {item["pair_id"]: item for item in result["variance_data"]}
+    assert set(variance) == {"L1|A", "L2|A"}
+    assert variance["L1|A"]["percentage_variance"] == 20.0
+    assert variance["L1|A"]["context_key_date1"] == 1 and variance["L1|A"]["context_key_date2"] == 2
+    assert math.isinf(variance["L2|A"]["percentage_variance"])
+    missing = {(item["sls_line"], item["missing_from"]): item["amount"] for item in result["missing_pairs"]}
+    assert missing == {("L4", D2): 10.0, ("L5", D1): -30.0}
+
+def test_pairs_match_on_codes():
+    check(analyze_variance_in_dataframe(frame(ROWS), "sls_line_number", "ccf_flow_amt", D1, D2))
+
+def test_categorical_columns():
+    check(analyze_variance_in_dataframe(frame(ROWS, categorical=True), "sls_line_number", "ccf_flow_amt", D1, D2))
+
+def test_missing_date():
+    result = analyze_variance_in_dataframe(frame(ROWS[:1]), "sls_line_number", "ccf_flow_amt", D1, D2)
+    assert result["message"] == f"Missing data for dates: {D2}"
@@ -0,0 +1,52 @@
+# backend/tests/test_sls_variance_trend.py
+import os
+import sys
+import pandas as pd
+import pytest
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from functions.sls_variance_trend import compute_variance_trend, parse_trend_dates
+
+DATES = ["2025-04-01", "2025-04-02", "2025-04-03", "2025-04-04"]
+
+def frame(series):
+    return pd.DataFrame([
+        {"cob_date": date, "sls_line_number": line, "context_name": context, "ccf_flow_amt": amount}
+        for (line, context), amounts in series.items()
+        for date, amount in zip(DATES, amounts) if amount is not None
+    ])
+
+def test_flags_lines_that_breach_anywhere_in_the_window():
+    df = frame({
+        ("L1", "CTX"): [100.0, 101.0, 150.0, 151.0],   # +48.5% on day 3
+        ("L2", "CTX"): [10.0, 10.5, 10.0, 10.2],        # never crosses 10%
+        ("L3", "CTX"): [0.0, 5.0, 5.0, 5.0],            # 0 -> 5 is infinite
+        ("L4", "CTX"): [50.0, None, 80.0, 80.0],        # missing day never breaches
+    })
+    trend = compute_variance_trend(df, DATES, "cob_date", "sls_line_number", "ccf_flow_amt", 10)
+
+    assert trend["pairs_analyzed"] == 4
+    assert sorted(trend["sls_lines_with_variance"]) == ["L1", "L3"]
+    assert [item["sls_line"] for item in trend["series"]] == ["L3", "L1"]
+    l1 = trend["series"][1]
+    assert l1["amounts"] == [100.0, 101.0, 150.0, 151.0]
+    assert [(b["from_date"], b["to_date"]) for b in l1["breaches"]] == [("2025-04-02", "2025-04-03")]
+    assert l1["max_abs_percentage_variance"] == pytest.approx(48.5148, rel=1e-4)
+
+def test_sums_several_context_keys_and_reports_empty_dates():
+    df = pd.concat([
+        frame({("L1", "CTX"): [100.0, 100.0, None, 100.0]}),
+        frame({("L1", "CTX"): [None, 50.0, None, None]}),
+    ])
+    trend = compute_variance_trend(df, DATES, "cob_date", "sls_line_number", "ccf_flow_amt", 10)
+
+    assert trend["dates_without_data"] == ["2025-04-03"]
+    assert trend["series"][0]["amounts"] == [100.0, 150.0, None, 100.0]
+
+def test_date_range_uses_business_days():
+    assert parse_trend_dates(start_date="2025-04-04", end_date="2025-04-08") == \
+        ["2025-04-04", "2025-04-07", "2025-04-08"]
+    with pytest.raises(ValueError):
+        parse_trend_dates(dates="2025-04-04")
@@ -0,0 +1,126 @@
+# backend/tests/test_status_delta.py
+import os
+import sys
+import threading
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from functions.get_6g_status import load_config, IncrementalStatusEngine
+
+COB_DATE = "04-03-2025"
+
+def run(bpf_id, status, start_time, end_time=None):
+    return {
+        "BPF_ID": bpf_id, "PROCESS_ID": "10", "BPF_NAME": "", "PROCESS_NAME": "",
+        "COB_DATE": "2025-04-03 00:00:00", "STATUS": status,
+        "START_TIME": start_time, "END_TIME": end_time
+    }
+
+class FakeOracle:
+    """Answers delta queries from an in-memory list of runs."""
+
+    def __init__(self, runs, window_start="2025-04-03 17:00:00", window_end=None):
+        self.runs = runs
+        self.window_start = window_start
+        self.window_end = window_end
+        self.queries = []
+
+    def __call__(self, query):
+        self.queries.append(query)
+        since = None
+        if "TO_DATE('2025" in query:
+            since = query.split("START_TIME >= TO_DATE('")[1][:19]
+        changed = [r for r in self.runs if r["START_TIME"] >= self.window_start and (
+            since is None or r["START_TIME"] >= since or (r["END_TIME"] or "") >= since)]
+        window = {"WINDOW_START": self.window_start, "WINDOW_END": self.window_end}
+        if not changed:
+            return [dict(window, BPF_ID=None)]
+        return [dict(window, **r) for r in changed]
+
+def test_delta_polls_merge_changes():
+    config = load_config()
+    oracle = FakeOracle([
+        run("6101", "COMPLETED", "2025-04-03 18:00:00", "2025-04-03 18:30:00"),
+        run("6102", "RUNNING", "2025-04-03 18:10:00"),
+    ])
+    engine = IncrementalStatusEngine(execute_query=oracle, full_refresh_polls=100, overlap_seconds=0)
+
+    rows = engine.fetch_rows(config, COB_DATE)
+    assert [(r["BPF_ID"], r["STATUS"]) for r in rows] == [("6101", "COMPLETED"), ("6102", "RUNNING")]
+    assert "START_TIME >= TO_DATE" not in oracle.queries[0]
+
+    # 6102 completes and 6103 starts
+    oracle.runs[1] = run("6102", "COMPLETED", "2025-04-03 18:10:00", "2025-04-03 18:50:00")
+    oracle.runs.append(run("6103", "RUNNING", "2025-04-03 18:50:00"))
+    rows = engine.fetch_rows(config, COB_DATE)
+
+    assert "START_TIME >= TO_DATE('2025-04-03 18:30:00'" in oracle.queries[1]
+    assert [(r["BPF_ID"], r["STATUS"]) for r in rows] == [
+        ("6101", "COMPLETED"), ("6102", "COMPLETED"), ("6103", "RUNNING")
+    ]
+
+def test_sls_lock_window_is_applied_to_cached_rows():
+    config = load_config()
+    oracle = FakeOracle([
+        run("6101", "COMPLETED", "2025-04-03 18:00:00", "2025-04-03 18:30:00"),
+        run("6102", "COMPLETED", "2025-04-03 19:00:00", "2025-04-03 20:30:00"),
+    ])
+    engine = IncrementalStatusEngine(execute_query=oracle, full_refresh_polls=100, overlap_seconds=0)
+    assert len(engine.fetch_rows(config, COB_DATE)) == 2
+
+    # SLS lock starts at 20:00, so the cached 6102 run falls outside the window
+    oracle.window_end = "2025-04-03 20:00:00"
+    rows = engine.fetch_rows(config, COB_DATE)
+    assert [r["BPF_ID"] for r in rows] == ["6101"]
+
+def test_prelim_window_change_forces_full_reload():
+    config = load_config()
+    oracle = FakeOracle([run("6101", "COMPLETED", "2025-04-03 18:00:00", "2025-04-03 18:30:00")])
+    engine = IncrementalStatusEngine(execute_query=oracle, full_refresh_polls=100, overlap_seconds=0)
+    engine.fetch_rows(config, COB_DATE)
+
+    # A later prelim run moves the window start past the cached run
+    oracle.window_start = "2025-04-03 19:00:00"
+    oracle.runs.append(run("6101", "RUNNING", "2025-04-03 19:30:00"))
+    rows = engine.fetch_rows(config, COB_DATE)
+
+    assert [(r["BPF_ID"], r["STATUS"]) for r in rows] == [("6101", "RUNNING")]
+    assert "START_TIME >= TO_DATE" not in oracle.queries[-1]
+
+def test_slow_query_for_one_date_does_not_block_another():
+    config = load_config()
+    oracle = FakeOracle([run("6101", "COMPLETED", "2025-04-03 18:00:00", "2025-04-03 18:30:00")])
+    started, release = threading.Event(), threading.Event()
+
+    def execute_query(query):
+        if "02-Apr-2025" in query:
+            started.set()
+            release.wait(5)
+        return oracle(query)
+
+    engine = IncrementalStatusEngine(execute_query=execute_query, full_refresh_polls=100, overlap_seconds=0)
+    slow = threading.Thread(target=engine.fetch_rows, args=(config, "04-02-2025"))
+    slow.start()
+    try:
+        assert started.wait(5)
+        fast = []
+        other = threading.Thread(target=lambda: fast.append(engine.fetch_rows(config, COB_DATE)))
+        other.start()
+        other.join(2)
+        assert fast and len(fast[0]) == 1
+    finally:
+        release.set()
+        slow.join()
+
+def test_evicting_a_date_keeps_its_lock():
+    config = load_config()
+    oracle = FakeOracle([run("6101", "COMPLETED", "2025-04-03 18:00:00", "2025-04-03 18:30:00")])
+    engine = IncrementalStatusEngine(execute_query=oracle, full_refresh_polls=100, overlap_seconds=0, max_dates=1)
+    lock = engine._date_lock("04-02-2025")
+    engine.fetch_rows(config, "04-02-2025")
+    engine.fetch_rows(config, COB_DATE)  # evicts 04-02-2025's state
+
+    # A thread still loading 04-02-2025 and the next caller must share one lock
+    assert "04-02-2025" not in engine._states
+    assert engine._date_lock("04-02-2025") is lock
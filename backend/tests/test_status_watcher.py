@@ -0,0 +1,60 @@
+# backend/tests/test_status_watcher.py
+import os
+import sys
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from services import status_watcher
+from services.status_watcher import StatusWatcher, diff_table_states, get_watcher
+
+def table(status, eta=None):
+    return {"name": "T1", "status": status, "estimated_completion_time": eta}
+
+def test_diff_reports_status_changes_and_large_eta_moves():
+    previous = {"6101": table("RUNNING", "2025-04-03 19:00:00"), "6102": table("RUNNING", "2025-04-03 19:00:00")}
+    current = {
+        "6101": table("COMPLETED"),
+        "6102": table("RUNNING", "2025-04-03 19:03:00"),  # moved less than the threshold
+        "6103": table("RUNNING", "2025-04-03 20:00:00"),  # new since the last poll
+    }
+    events = diff_table_states(previous, current, eta_move_minutes=5)
+    assert [(e["type"], e["bpf_id"]) for e in events] == [("table_completed", "6101"), ("table_started", "6103")]
+    assert events[1]["previous_status"] == "PENDING"
+
+    current["6102"] = table("RUNNING", "2025-04-03 18:50:00")
+    moved = diff_table_states(previous, current, eta_move_minutes=5)[1]
+    assert moved["type"] == "eta_moved" and moved["moved_minutes"] == -10.0
+
+def quiet_watcher(cob_date="04-03-2025", queue_size=3):
+    watcher = StatusWatcher(cob_date, interval=60, queue_size=queue_size)
+    watcher.poll_once = lambda: []
+    return watcher
+
+def test_slow_subscribers_lose_their_oldest_events():
+    watcher = quiet_watcher()
+    subscriber = watcher.subscribe()
+    try:
+        for n in range(5):
+            watcher._publish({"type": "eta_moved", "n": n})
+        assert [subscriber.get_nowait()["n"] for _ in range(subscriber.qsize())] == [2, 3, 4]
+    finally:
+        watcher.unsubscribe(subscriber)
+
+def test_idle_watchers_are_evicted(monkeypatch):
+    monkeypatch.setattr(status_watcher, "_watchers", {})
+    monkeypatch.setattr(Config, "STATUS_WATCHER_IDLE_SECONDS", 0)
+    monkeypatch.setattr(status_watcher, "StatusWatcher", lambda cob_date: quiet_watcher(cob_date))
+
+    watched = get_watcher("04-02-2025")
+    subscriber = watched.subscribe()
+    get_watcher("04-03-2025")
+    # A watcher with a subscriber is kept; one nobody subscribed to is dropped
+    assert set(status_watcher._watchers) == {"04-02-2025", "04-03-2025"}
+    get_watcher("04-04-2025")
+    assert set(status_watcher._watchers) == {"04-02-2025", "04-04-2025"}
+
+    watched.unsubscribe(subscriber)
+    get_watcher("04-04-2025")
+    assert set(status_watcher._watchers) == {"04-04-2025"}
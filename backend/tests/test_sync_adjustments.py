@@ -0,0 +1,95 @@
+# backend/tests/test_sync_adjustments.py
+import os
+import sys
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import importlib
+from config import Config
+
+sync_module = importlib.import_module("functions.sync_adjustments")
+
+class StandInAdjustmentsApi(BaseHTTPRequestHandler):
+    """Local stand-in for the IDA token and adjustments callback endpoints."""
+    state = None
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        with self.state["lock"]:
+            self.state["token_requests"] += 1
+        self._reply(200, {"access_token": "token-1", "expires_in": 3600})
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.state["lock"]:
+            self.state["connections"].add(self.client_address)
+            if self.state["failures_left"] > 0:
+                self.state["failures_left"] -= 1
+                return self._reply(503, {"error": "busy"})
+            rejected = set(payload["dmatIdList"]) & self.state["reject_ids"]
+            if rejected:
+                return self._reply(500, {"error": "rejected"})
+            self.state["batches"].append(payload["dmatIdList"])
+        self._reply(200, {"status": "OK"})
+
+@pytest.fixture
+def api(monkeypatch):
+    state = {"lock": threading.Lock(), "token_requests": 0, "failures_left": 0,
+             "reject_ids": set(), "batches": [], "connections": set()}
+    StandInAdjustmentsApi.state = state
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInAdjustmentsApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(Config, "ADJUSTMENTS_TOKEN_URL", f"{base_url}/ida/getTokens")
+    monkeypatch.setattr(Config, "ADJUSTMENTS_CALLBACK_URL", f"{base_url}/dmatcallback")
+    monkeypatch.setattr(Config, "ADJUSTMENTS_BATCH_SIZE", 2)
+    monkeypatch.setattr(Config, "ADJUSTMENTS_MAX_CONCURRENCY", 2)
+    monkeypatch.setattr(Config, "ADJUSTMENTS_MAX_RETRIES", 2)
+    monkeypatch.setattr(Config, "ADJUSTMENTS_BACKOFF_SECONDS", 0.01)
+    sync_module.clear_token_cache()
+    yield state
+    server.shutdown()
+    server.server_close()
+    sync_module.clear_token_cache()
+
+def test_syncs_in_batches_and_reuses_token(api):
+    result = sync_module.sync_adjustments("MDU", "1, 2, 3, 2, 4, 5")
+    assert result["success"]
+    assert result["dmat_ids"] == ["1", "2", "3", "4", "5"]
+    assert sorted(api["batches"]) == [["1", "2"], ["3", "4"], ["5"]]
+    assert [batch["batch"] for batch in result["batches"]] == [0, 1, 2]
+
+    sync_module.sync_adjustments("MSDU", "6")
+    assert api["token_requests"] == 1
+
+def test_retries_transient_errors_and_reports_failed_batches(api):
+    api["failures_left"] = 1
+    api["reject_ids"] = {"3"}
+    result = sync_module.sync_adjustments("MDU", "1,2,3")
+
+    assert not result["success"]
+    assert result["synced_dmat_ids"] == ["1", "2"]
+    assert result["failed_dmat_ids"] == ["3"]
+    failed = result["batches"][1]
+    assert failed["status_code"] == 500 and failed["attempts"] == 3
+    # The one 503 lands on whichever batch is sent first and is retried
+    assert api["failures_left"] == 0 and result["batches"][0]["success"]
+
+def test_rejects_non_numeric_ids(api):
+    result = sync_module.sync_adjustments("MDU", "1,abc")
+    assert not result["success"] and api["token_requests"] == 0
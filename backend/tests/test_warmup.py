@@ -0,0 +1,63 @@
+# backend/tests/test_warmup.py
+import os
+import sys
+import importlib
+import pandas as pd
+import pytest
+
+# Add parent directory to path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from services import warmup
+
+get_6g_status = importlib.import_module("functions.get_6g_status")
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(warmup, "_state", {"status": "pending", "started_at": None, "finished_at": None,
+                                           "total_ms": None, "steps": []})
+
+def test_failed_steps_are_reported_but_do_not_stop_the_warm_up(monkeypatch):
+    ran = []
+    monkeypatch.setitem(warmup.WARMUP_STEPS, "first", lambda: ran.append("first"))
+    monkeypatch.setitem(warmup.WARMUP_STEPS, "broken", lambda: 1 / 0)
+    monkeypatch.setitem(warmup.WARMUP_STEPS, "last", lambda: ran.append("last"))
+    assert not warmup.is_ready()
+
+    report = warmup.run_warm_up(["first", "broken", "missing", "last"])
+    assert ran == ["first", "last"]
+    assert [(step["name"], step["status"]) for step in report["steps"]] == [
+        ("first", "ok"), ("broken", "failed"), ("missing", "failed"), ("last", "ok")]
+    assert "Unknown warm-up step" in report["steps"][2]["error"]
+    assert report["status"] == "degraded" and report["total_ms"] is not None
+    # Optional steps failing still lets the process take traffic
+    assert warmup.is_ready()
+
+def test_background_warm_up_and_disabled_warm_up(monkeypatch):
+    monkeypatch.setitem(warmup.WARMUP_STEPS, "quick", lambda: None)
+    monkeypatch.setattr(Config, "WARMUP_STEPS", ["quick"])
+    monkeypatch.setattr(Config, "WARMUP_ENABLED", True)
+    warmup.start_warm_up().join(5)
+    assert warmup.get_warm_up_report()["status"] == "ready"
+
+    monkeypatch.setattr(warmup, "_state", {"status": "pending", "steps": []})
+    monkeypatch.setattr(Config, "WARMUP_ENABLED", False)
+    assert warmup.start_warm_up() is None
+    assert warmup.is_ready()
+
+def test_history_step_fills_the_cache_and_callers_get_copies(monkeypatch):
+    queries = []
+    def query(bpf_ids, days=30):
+        queries.append(days)
+        return pd.DataFrame({"BPF_ID": bpf_ids, "DURATION_MINUTES": 30.0})
+    monkeypatch.setattr(get_6g_status, "query_historical_runtime_data", query)
+    monkeypatch.setattr(get_6g_status, "_history_cache", {})
+
+    assert warmup.run_warm_up(["history"])["status"] == "ready"
+    bpf_ids = [table['bpf_id'] for table in get_6g_status.load_config()['tables']]
+    history = get_6g_status.get_historical_runtime_data(bpf_ids, days=30)
+    history['DURATION_MINUTES'] = 0.0
+
+    assert (get_6g_status.get_historical_runtime_data(bpf_ids, days=30)['DURATION_MINUTES'] == 30.0).all()
+    assert queries == [30]
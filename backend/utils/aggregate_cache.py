@@ -0,0 +1,104 @@
+# backend/utils/aggregate_cache.py
+import os
+import re
+import json
+import logging
+import threading
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+except ImportError:  # Cache is disabled without pyarrow
+    pa = None
+
+def _safe(part):
+    """Make a key part safe to use as a path component."""
+    return re.sub(r'[^A-Za-z0-9_.=-]', '_', str(part))
+
+class AggregateCache:
+    """
+    Local columnar cache of per-(sls_line, context) aggregates.
+
+    One Arrow IPC file per (table, cob_date, context_key, namespace). FINAL
+    snapshots never change, so an entry stays valid for as long as its
+    context_key is the FINAL one for that date. Files are memory-mapped on
+    read, so cached dates load without copying the column buffers.
+
+    Each entry records the SLS lines it covers ('*' for all lines) in the
+    schema metadata, so a request for a subset of lines can be answered
+    from an entry that was built for a superset.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or Config.AGGREGATE_CACHE_DIR
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return pa is not None and Config.AGGREGATE_CACHE_ENABLED
+
+    def _path(self, table, cob_date, context_key, namespace):
+        return os.path.join(self.cache_dir, _safe(table), _safe(cob_date),
+                            f"{_safe(context_key)}__{_safe(namespace)}.arrow")
+
+    def get(self, table, cob_date, context_key, namespace="all"):
+        """
+        Read a cached entry.
+
+        Returns:
+            tuple: (pyarrow.Table, covered lines as a set or '*') or (None, None) on a miss
+        """
+        if not self.enabled:
+            return None, None
+        path = self._path(table, cob_date, context_key, namespace)
+        if not os.path.exists(path):
+            return None, None
+        try:
+            with pa.memory_map(path, 'r') as source:
+                arrow_table = pa.ipc.open_file(source).read_all()
+            metadata = arrow_table.schema.metadata or {}
+            covered = json.loads(metadata.get(b'covered_lines', b'"*"'))
+            return arrow_table, (covered if covered == '*' else set(covered))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable aggregate cache entry {path}: {str(e)}")
+            return None, None
+
+    def put(self, table, cob_date, context_key, df, covered_lines='*', namespace="all"):
+        """
+        Write an entry atomically.
+
+        Args:
+            table (str): Logical table name
+            cob_date (str): COB date of the snapshot
+            context_key: FINAL snapshot context key
+            df (pd.DataFrame): Aggregates for that context key
+            covered_lines: '*' or an iterable of the SLS lines the entry covers
+            namespace (str): Separates entries built with different non-line filters
+        """
+        if not self.enabled:
+            return
+        path = self._path(table, cob_date, context_key, namespace)
+        covered = covered_lines if covered_lines == '*' else sorted(covered_lines)
+        arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+        arrow_table = arrow_table.replace_schema_metadata({
+            **(arrow_table.schema.metadata or {}),
+            b'covered_lines': json.dumps(covered).encode()
+        })
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, arrow_table.schema) as writer:
+                    writer.write_table(arrow_table)
+            os.replace(tmp_path, path)
+
+_cache = None
+
+def get_aggregate_cache():
+    """Get the shared aggregate cache."""
+    global _cache
+    if _cache is None:
+        _cache = AggregateCache()
+    return _cache
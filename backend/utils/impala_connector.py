@@ -0,0 +1,177 @@
+# backend/utils/impala_connector.py
+import time
+import math
+import logging
+import pandas as pd
+import pyodbc
+from config import Config
+from services.admission import admit
+from services.circuit_breaker import protect
+from services.deadline import timeout_for
+
+logger = logging.getLogger(__name__)
+
+def get_impala_connection():
+    """
+    Open a pyodbc connection to Impala (IMPALA_LRI_DR DSN).
+
+    Login and query timeouts are Config.IMPALA_QUERY_TIMEOUT_SECONDS, capped by
+    the current request's deadline.
+    """
+    timeout = timeout_for(Config.IMPALA_QUERY_TIMEOUT_SECONDS)
+    timeout = int(math.ceil(timeout)) if timeout else 0
+    conn = pyodbc.connect(
+        Config.IMPALA_DSN,
+        ssl=1,
+        AllowSelfSignedServerCert=1,
+        TrustedCerts=Config.IMPALA_CERT,
+        autocommit=True,
+        timeout=timeout
+    )
+    conn.timeout = timeout
+    return conn
+
+def iter_query_chunks(query, chunk_size=None):
+    """
+    Execute a query and yield the result as DataFrames of at most chunk_size rows.
+
+    Only one chunk of rows is held by the client at a time (cursor.fetchmany).
+
+    Args:
+        query (str): SQL query
+        chunk_size (int, optional): Rows per chunk; defaults to Config.IMPALA_CHUNK_SIZE
+
+    Yields:
+        pd.DataFrame: The next chunk of rows
+    """
+    chunk_size = chunk_size or Config.IMPALA_CHUNK_SIZE
+    # The slot is held until the generator is exhausted or closed
+    with protect("impala"), admit("impala"):
+        conn = get_impala_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            column_names = [desc[0] for desc in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records([tuple(row) for row in rows], columns=column_names)
+            cursor.close()
+        finally:
+            conn.close()
+
+class GroupAccumulator:
+    """
+    Incremental group-by over a stream of DataFrame chunks.
+
+    Each chunk is reduced to one row per key (sums for sum_columns, first value
+    for first_columns) and queued as a pending partial. Once the pending
+    partials exceed compact_rows they are merged into the compacted result, so
+    each merge re-reduces the compacted rows plus at least compact_rows new
+    ones, never the compacted result alone.
+
+    Memory is the distinct keys plus up to compact_rows pending rows and one
+    chunk. For a query that is already GROUP BY on the same keys the distinct
+    keys are the whole result, so stream mode saves the Python row objects of
+    fetchall, not the size of the result itself.
+    """
+
+    def __init__(self, key_columns, sum_columns, first_columns=None, compact_rows=None):
+        self.key_columns = list(key_columns)
+        self.sum_columns = list(sum_columns)
+        self.first_columns = list(first_columns or [])
+        self.compact_rows = compact_rows or Config.IMPALA_CHUNK_SIZE * 4
+        self._compacted = None
+        self._pending = []
+        self._pending_rows = 0
+
+    def _reduce(self, df):
+        aggregations = {column: 'sum' for column in self.sum_columns}
+        aggregations.update({column: 'first' for column in self.first_columns})
+        grouped = df.groupby(self.key_columns, dropna=False, sort=False)
+        reduced = grouped.agg(aggregations)
+        # Keep all-NULL amounts as NULL (like SQL SUM) instead of 0
+        non_null = grouped[self.sum_columns].count()
+        for column in self.sum_columns:
+            reduced[column] = reduced[column].where(non_null[column] > 0)
+        return reduced.reset_index()
+
+    def add(self, chunk):
+        """Fold one chunk into the running aggregate."""
+        if chunk.empty:
+            return
+        columns = self.key_columns + self.sum_columns + self.first_columns
+        self._pending.append(self._reduce(chunk[columns]))
+        self._pending_rows += len(self._pending[-1])
+        if self._pending_rows > self.compact_rows:
+            self._compact()
+
+    def _compact(self):
+        if not self._pending:
+            return
+        partials = ([self._compacted] if self._compacted is not None else []) + self._pending
+        self._compacted = partials[0] if len(partials) == 1 else self._reduce(pd.concat(partials, ignore_index=True))
+        self._pending = []
+        self._pending_rows = 0
+
+    def result(self):
+        """Return the aggregate as a DataFrame with key, sum and first columns."""
+        self._compact()
+        if self._compacted is None:
+            return pd.DataFrame(columns=self.key_columns + self.sum_columns + self.first_columns)
+        return self._compacted
+
+def fetch_aggregated(query, key_columns, sum_columns, first_columns=None, mode=None, chunk_size=None):
+    """
+    Run an aggregate query and return one row per key.
+
+    In 'stream' mode rows are pulled in fixed-size chunks and folded into a
+    GroupAccumulator, so only one chunk of raw rows is held at a time (the
+    aggregate itself still holds one row per key); in 'frame' mode the whole
+    result is materialized with pd.read_sql_query.
+
+    Args:
+        query (str): SQL query
+        key_columns (list): Columns identifying a group
+        sum_columns (list): Columns summed per group
+        first_columns (list, optional): Columns whose first value is kept per group
+        mode (str, optional): 'stream' or 'frame'; defaults to Config.IMPALA_FETCH_MODE
+        chunk_size (int, optional): Rows per fetchmany call in stream mode
+
+    Returns:
+        tuple: (pd.DataFrame, dict of fetch statistics incl. rows_per_sec)
+    """
+    mode = mode or Config.IMPALA_FETCH_MODE
+    start = time.perf_counter()
+    rows = 0
+    chunks = 0
+
+    if mode == 'stream':
+        accumulator = GroupAccumulator(key_columns, sum_columns, first_columns)
+        for chunk in iter_query_chunks(query, chunk_size):
+            rows += len(chunk)
+            chunks += 1
+            accumulator.add(chunk)
+        df = accumulator.result()
+    else:
+        with protect("impala"), admit("impala"):
+            conn = get_impala_connection()
+            try:
+                df = pd.read_sql_query(query, conn)
+            finally:
+                conn.close()
+        rows = len(df)
+        chunks = 1
+
+    seconds = time.perf_counter() - start
+    stats = {
+        "mode": mode,
+        "rows": rows,
+        "chunks": chunks,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds) if seconds > 0 else rows
+    }
+    logger.info(f"Impala fetch ({mode}): {rows} rows in {chunks} chunk(s), "
+                f"{stats['seconds']}s, {stats['rows_per_sec']} rows/sec")
+    return df, stats
@@ -0,0 +1,139 @@
+# backend/utils/log.py
+import sys
+import json
+import time
+import logging
+import reprlib
+import threading
+from config import Config
+
+# Attributes every LogRecord has; anything else was passed through `extra=` and
+# is emitted as a structured field by JsonFormatter
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_bounded_repr = reprlib.Repr()
+_bounded_repr.maxlevel = 4
+_bounded_repr.maxdict = 20
+_bounded_repr.maxlist = _bounded_repr.maxtuple = _bounded_repr.maxset = 10
+_bounded_repr.maxstring = _bounded_repr.maxother = 200
+
+class PayloadSummary:
+    """Lazy, size-capped rendering of a payload; see summarize()."""
+    __slots__ = ("value", "max_chars")
+
+    def __init__(self, value, max_chars=None):
+        self.value = value
+        self.max_chars = max_chars or Config.LOG_PAYLOAD_MAX_CHARS
+
+    def __str__(self):
+        value = self.value
+        if isinstance(value, bytes):
+            value = value.decode(errors='replace')
+        if isinstance(value, (dict, list, tuple, set)):
+            # reprlib stops descending once its limits are hit, so a 10k-row
+            # result is never stringified in full
+            text = _bounded_repr.repr(value)
+        else:
+            text = str(value)
+        if len(text) > self.max_chars:
+            return f"{text[:self.max_chars]}... ({len(text)} chars)"
+        return text
+
+    __repr__ = __str__
+
+def summarize(value, max_chars=None):
+    """
+    Wrap a payload for a log message so it is rendered lazily and size-capped.
+
+    Pass it as a %-style argument: nothing is converted until a handler
+    formats the record, so a disabled DEBUG line costs one small allocation
+    instead of stringifying the whole SQL text, OpenAI response or result.
+
+        logger.debug("Function result: %s", summarize(function_result))
+
+    Dicts and lists show only their first keys/items (nested up to four
+    levels); anything longer than max_chars (default
+    Config.LOG_PAYLOAD_MAX_CHARS) is cut with a note of the full length.
+    """
+    return PayloadSummary(value, max_chars)
+
+def sampled(every=None):
+    """
+    `extra=` for high-volume events: only one record in `every` (per logger and
+    message template) is emitted.
+
+        logger.debug("Delta poll for %s returned %d rows", cob_date, n, extra=sampled())
+    """
+    return {"sample_every": every or Config.LOG_SAMPLE_EVERY}
+
+class SamplingFilter(logging.Filter):
+    """Keep every Nth record of those logged with extra=sampled(N)."""
+
+    def __init__(self):
+        super().__init__()
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        every = getattr(record, "sample_every", 1)
+        if every <= 1:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        return count % every == 0
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, extra fields and exception."""
+
+    def format(self, record):
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+def parse_levels(spec):
+    """Parse 'module=LEVEL,module=LEVEL' into {module: level}."""
+    levels = {}
+    for item in (spec or "").split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+def configure_logging(level=None, log_format=None, module_levels=None, stream=None):
+    """
+    Set up the root logger from Config (replaces logging.basicConfig).
+
+    Args:
+        level (str, optional): Root level; defaults to Config.LOG_LEVEL
+        log_format (str, optional): 'text' or 'json'; defaults to Config.LOG_FORMAT
+        module_levels (str, optional): 'module=LEVEL,...' overrides; defaults to Config.LOG_LEVELS
+        stream (optional): Output stream; defaults to stderr
+    """
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if getattr(handler, "_lrot_handler", False):
+            root.removeHandler(handler)
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler._lrot_handler = True
+    if (log_format or Config.LOG_FORMAT) == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    handler.addFilter(SamplingFilter())
+    root.addHandler(handler)
+    root.setLevel((level or Config.LOG_LEVEL).upper())
+
+    for name, module_level in parse_levels(Config.LOG_LEVELS if module_levels is None else module_levels).items():
+        logging.getLogger(name).setLevel(module_level)
@@ -0,0 +1,230 @@
+# backend/utils/oracle_connector.py
+import os
+import abc
+import math
+import logging
+import threading
+from datetime import datetime
+import pandas as pd
+from config import Config
+from services.admission import admit
+from services.circuit_breaker import protect
+from services.deadline import timeout_for
+
+logger = logging.getLogger(__name__)
+
+def get_oracle_settings():
+    """
+    Read Oracle connection parameters from the environment.
+
+    Returns:
+        dict: user, password, host, port and service_name
+    """
+    settings = {
+        "user": os.environ.get('ORACLE_USER'),
+        "password": os.environ.get('ORACLE_PASSWORD'),
+        "host": os.environ.get('ORACLE_HOST'),
+        "port": os.environ.get('ORACLE_PORT'),
+        "service_name": os.environ.get('ORACLE_SERVICE_NAME')
+    }
+    if not all(settings.values()):
+        raise ValueError("Missing Oracle database connection parameters")
+    return settings
+
+class OracleBackend(abc.ABC):
+    """
+    Interface for Oracle query backends.
+
+    Subclasses implement fetch_rows(); dict and DataFrame results are built on top of it
+    unless a backend has a faster native path.
+    """
+    name = "base"
+
+    @abc.abstractmethod
+    def fetch_rows(self, query):
+        """
+        Execute a query.
+
+        Returns:
+            tuple: (column_names, rows) where rows is a list of tuples
+        """
+
+    def fetch_dicts(self, query):
+        """Execute a query and return a list of dicts with datetimes as 'YYYY-MM-DD HH:MM:SS' strings."""
+        column_names, data = self.fetch_rows(query)
+
+        results = []
+        for row in data:
+            result_row = {}
+            for i, column in enumerate(column_names):
+                # Handle special data types (dates, etc.)
+                value = row[i]
+                if isinstance(value, (datetime,)):
+                    value = value.strftime('%Y-%m-%d %H:%M:%S')
+                result_row[column] = value
+            results.append(result_row)
+        return results
+
+    def fetch_dataframe(self, query):
+        """Execute a query and return a pandas DataFrame."""
+        column_names, data = self.fetch_rows(query)
+        return pd.DataFrame(data, columns=column_names)
+
+    def warm_up(self):
+        """Pay one-time start-up costs (JVM start, pool creation) ahead of the first query."""
+        pass
+
+    def close(self):
+        pass
+
+class JdbcOracleBackend(OracleBackend):
+    """Oracle access through jaydebeapi/JPype and the ojdbc driver (one connection per query)."""
+    name = "jdbc"
+
+    def __init__(self):
+        self.jdbc_driver_path = os.environ.get('JDBC_DRIVER_PATH', 'ojdbc8.jar')
+        self.jdbc_driver_class = "oracle.jdbc.driver.OracleDriver"
+
+    def _connect(self, timeout=None):
+        import jaydebeapi
+
+        settings = get_oracle_settings()
+        jdbc_url = f"jdbc:oracle:thin:@{settings['host']}:{settings['port']}/{settings['service_name']}"
+        logger.debug(f"JDBC URL: {jdbc_url}")
+
+        properties = {"user": settings['user'], "password": settings['password']}
+        if timeout:
+            # ojdbc thin driver: connect and socket read timeouts in milliseconds
+            properties["oracle.net.CONNECT_TIMEOUT"] = str(int(timeout * 1000))
+            properties["oracle.jdbc.ReadTimeout"] = str(int(timeout * 1000))
+
+        return jaydebeapi.connect(
+            self.jdbc_driver_class,
+            jdbc_url,
+            properties,
+            self.jdbc_driver_path
+        )
+
+    def fetch_rows(self, query):
+        with protect("oracle"), admit("oracle"):
+            connection = self._connect(timeout_for(Config.ORACLE_CALL_TIMEOUT_SECONDS))
+            try:
+                cursor = connection.cursor()
+                cursor.execute(query)
+                data = cursor.fetchall()
+                column_names = [desc[0] for desc in cursor.description]
+                cursor.close()
+                return column_names, data
+            finally:
+                connection.close()
+
+    def warm_up(self):
+        # The first connect starts the JVM inside this process
+        self._connect().close()
+
+class OracleDbBackend(OracleBackend):
+    """
+    Oracle access through python-oracledb in thin mode (no JVM, no Instant Client).
+
+    Uses a session pool, array fetches of ORACLE_FETCH_ARRAYSIZE rows per round trip
+    and, when pyarrow is installed, fetches DataFrames directly in Arrow format.
+    """
+    name = "oracledb"
+
+    def __init__(self, arraysize=None, pool_min=None, pool_max=None):
+        import oracledb
+
+        self._oracledb = oracledb
+        self.arraysize = arraysize or Config.ORACLE_FETCH_ARRAYSIZE
+        self.pool_min = Config.ORACLE_POOL_MIN if pool_min is None else pool_min
+        self.pool_max = pool_max or Config.ORACLE_POOL_MAX
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                settings = get_oracle_settings()
+                dsn = f"{settings['host']}:{settings['port']}/{settings['service_name']}"
+                logger.debug(f"Creating python-oracledb pool for {dsn} ({self.pool_min}-{self.pool_max} sessions)")
+                self._pool = self._oracledb.create_pool(
+                    user=settings['user'],
+                    password=settings['password'],
+                    dsn=dsn,
+                    min=self.pool_min,
+                    max=self.pool_max,
+                    increment=1
+                )
+            return self._pool
+
+    def _set_call_timeout(self, connection):
+        # Round-trip timeout in milliseconds (0 = none); pooled sessions are reset on every use
+        timeout = timeout_for(Config.ORACLE_CALL_TIMEOUT_SECONDS)
+        connection.call_timeout = int(math.ceil(timeout * 1000)) if timeout else 0
+
+    def fetch_rows(self, query):
+        with protect("oracle"), admit("oracle"), self._get_pool().acquire() as connection:
+            self._set_call_timeout(connection)
+            with connection.cursor() as cursor:
+                cursor.arraysize = self.arraysize
+                cursor.prefetchrows = self.arraysize + 1
+                cursor.execute(query)
+                data = cursor.fetchall()
+                column_names = [desc[0] for desc in cursor.description]
+                return column_names, data
+
+    def fetch_arrow(self, query):
+        """Execute a query and return a pyarrow Table without building Python row objects."""
+        import pyarrow
+
+        with protect("oracle"), admit("oracle"), self._get_pool().acquire() as connection:
+            self._set_call_timeout(connection)
+            oracle_df = connection.fetch_df_all(statement=query, arraysize=self.arraysize)
+            return pyarrow.table(oracle_df)
+
+    def fetch_dataframe(self, query):
+        if not Config.ORACLE_USE_ARROW:
+            return super().fetch_dataframe(query)
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return super().fetch_dataframe(query)
+        return self.fetch_arrow(query).to_pandas()
+
+    def warm_up(self):
+        # Creating the pool opens ORACLE_POOL_MIN sessions
+        self._get_pool()
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def create_oracle_backend(name):
+    """
+    Create a backend by name ('oracledb' or 'jdbc').
+
+    Falls back to JDBC when python-oracledb is not installed.
+    """
+    if name == "oracledb":
+        try:
+            return OracleDbBackend()
+        except ImportError:
+            logger.warning("python-oracledb is not installed, falling back to the JDBC backend")
+            return JdbcOracleBackend()
+    if name == "jdbc":
+        return JdbcOracleBackend()
+    raise ValueError(f"Unknown Oracle backend: {name}")
+
+def get_oracle_backend():
+    """Get the shared Oracle backend selected by Config.ORACLE_BACKEND."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_oracle_backend(Config.ORACLE_BACKEND)
+            logger.info(f"Using Oracle backend: {_backend.name}")
+        return _backend
@@ -0,0 +1,179 @@
+# backend/utils/result_pages.py
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import numpy as np
+from config import Config
+from utils.serialization import dumps_str
+
+class ResultPageStore:
+    """
+    TTL store for the part of a ranked result that was not returned, kept in SQLite.
+
+    Pages are served by whichever worker process gets the request (including
+    results produced by job-queue workers), so the rows live in a file shared
+    by all of them, next to the jobs and sessions databases. Rows are written
+    unsorted with their score; SQLite's (result_id, score) index does the
+    ranking, so the request that produced them only pays for the top-K
+    selection. The oldest results are evicted once more than max_results are held.
+    """
+
+    def __init__(self, db_path=None, ttl_seconds=None, max_results=None):
+        self.db_path = db_path or Config.RESULT_PAGE_DB_PATH
+        self.ttl_seconds = ttl_seconds or Config.RESULT_PAGE_TTL_SECONDS
+        self.max_results = max_results or Config.RESULT_PAGE_MAX_RESULTS
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    result_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    returned INTEGER NOT NULL,
+                    stored INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS result_rows (
+                    result_id TEXT NOT NULL REFERENCES results (result_id) ON DELETE CASCADE,
+                    seq INTEGER NOT NULL,
+                    score REAL,
+                    record TEXT NOT NULL,
+                    PRIMARY KEY (result_id, seq)
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS result_rows_rank ON result_rows (result_id, score DESC, seq)")
+
+    def put(self, kind, records, scores, returned=0):
+        """
+        Store ranked records and return the cursor of their first page.
+
+        Args:
+            kind (str): Label returned with every page
+            records (list): Records not returned yet (JSON-serializable via utils.serialization)
+            scores (np.ndarray): One score per record
+            returned (int): Higher-ranked records already returned; cursor
+                offsets and totals count them, so they refer to the whole result
+        """
+        result_id = uuid.uuid4().hex[:16]
+        now = time.time()
+        # NaN scores are stored as NULL, which ranks last like np.argsort does
+        rows = [(result_id, seq, None if np.isnan(score) else float(score), dumps_str(record))
+                for seq, (record, score) in enumerate(zip(records, scores))]
+        with self._lock, self._conn:
+            self._evict(now)
+            self._conn.execute(
+                "INSERT INTO results (result_id, kind, returned, stored, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (result_id, kind, returned, len(rows), now, now + self.ttl_seconds))
+            self._conn.executemany(
+                "INSERT INTO result_rows (result_id, seq, score, record) VALUES (?, ?, ?, ?)", rows)
+            self._conn.execute(
+                "DELETE FROM results WHERE result_id NOT IN "
+                "(SELECT result_id FROM results ORDER BY created_at DESC, rowid DESC LIMIT ?)", (self.max_results,))
+        return f"{result_id}:{returned}"
+
+    def _evict(self, now):
+        self._conn.execute("DELETE FROM results WHERE expires_at < ?", (now,))
+
+    def get_page(self, cursor, page_size=None):
+        """
+        Get one page of a stored result.
+
+        Args:
+            cursor (str): Cursor returned with the result or the previous page
+            page_size (int, optional): Records per page; defaults to Config.RESULT_PAGE_SIZE
+
+        Returns:
+            dict: items, offset and total (both counted over the whole ranked
+                  result, including the top-K returned first) and next_cursor
+                  (None on the last page)
+        """
+        page_size = int(page_size or Config.RESULT_PAGE_SIZE)
+        if page_size < 0:
+            return {"success": False, "error": f"Invalid page_size: {page_size}"}
+        try:
+            result_id, offset = cursor.rsplit(':', 1)
+            offset = int(offset)
+        except (AttributeError, ValueError):
+            return {"success": False, "error": f"Invalid cursor: {cursor}"}
+        if offset < 0:
+            return {"success": False, "error": f"Invalid cursor: {cursor}"}
+
+        with self._lock:
+            entry = self._conn.execute(
+                "SELECT kind, returned, stored FROM results WHERE result_id = ? AND expires_at >= ?",
+                (result_id, time.time())).fetchone()
+            if entry is None:
+                return {"success": False, "error": "Cursor expired or unknown; run the analysis again"}
+            kind, returned, stored = entry
+            if offset < returned:
+                return {"success": False, "error": f"Cursor {cursor} points into records already returned"}
+            rows = self._conn.execute(
+                "SELECT record FROM result_rows WHERE result_id = ? ORDER BY score DESC, seq LIMIT ? OFFSET ?",
+                (result_id, page_size, offset - returned)).fetchall()
+
+        total = returned + stored
+        end = min(offset + page_size, total)
+        return {
+            "success": True,
+            "kind": kind,
+            "items": [json.loads(row[0]) for row in rows],
+            "offset": offset,
+            "total": total,
+            "next_cursor": f"{result_id}:{end}" if end < total else None
+        }
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_result_page_store():
+    """Get the shared result page store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResultPageStore()
+        return _store
+
+def take_top_k(records, scores, top_k, kind="records"):
+    """
+    Select the top_k records by descending score without sorting all of them.
+
+    np.argpartition finds the top_k in linear time and only those are sorted;
+    the remainder goes to the page store and is reachable through the cursor.
+
+    Args:
+        records (list): Records to rank
+        scores (array-like): One score per record (higher ranks first)
+        top_k (int): Records to return; None or 0 returns everything, sorted
+        kind (str): Label stored with the remainder
+
+    Returns:
+        tuple: (top records, dict with total, returned and next_cursor)
+
+    Raises:
+        ValueError: top_k is negative
+    """
+    if top_k is not None and top_k < 0:
+        raise ValueError(f"top_k must be 0 or more, got {top_k}")
+    scores = np.asarray(scores, dtype=float)
+    total = len(records)
+    if not top_k or total <= top_k:
+        order = np.argsort(-scores, kind='stable')
+        return [records[i] for i in order], {"total": total, "returned": total, "next_cursor": None}
+
+    partition = np.argpartition(-scores, top_k - 1)
+    top = partition[:top_k]
+    top = top[np.argsort(-scores[top], kind='stable')]
+    rest = partition[top_k:]
+    cursor = get_result_page_store().put(kind, [records[i] for i in rest], scores[rest], returned=top_k)
+    return [records[i] for i in top], {"total": total, "returned": top_k, "next_cursor": cursor}
@@ -0,0 +1,168 @@
+# backend/utils/serialization.py
+import gzip
+import json
+import logging
+import datetime
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+from flask.json.provider import JSONProvider
+from config import Config
+
+try:
+    import orjson
+except ImportError:  # fall back to the standard library encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+_ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+def _default(obj):
+    """Convert the pandas/numpy/stdlib values orjson (or json) does not handle natively."""
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, pd.Timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient='records')
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return obj.tolist()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+def dumps(obj):
+    """
+    Serialize to JSON bytes.
+
+    numpy scalars/arrays, pandas Timestamps/Series/DataFrames, datetimes and
+    Decimals are encoded directly. NaN and +/-inf become null so the output is
+    always valid JSON (the standard encoder writes NaN/Infinity, which browsers
+    reject).
+
+    Args:
+        obj: Value to serialize
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(_replace_non_finite(obj), default=_default, allow_nan=False).encode()
+
+def dumps_str(obj):
+    """Serialize to a JSON string (e.g. for an LLM message)."""
+    return dumps(obj).decode()
+
+def _replace_non_finite(obj):
+    if isinstance(obj, float):
+        return obj if np.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _replace_non_finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace_non_finite(value) for value in obj]
+    return obj
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by dumps(), so jsonify() handles numpy/pandas values."""
+
+    def dumps(self, obj, **kwargs):
+        return dumps_str(obj)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype="application/json")
+
+def _accepted_encodings(accept_encoding):
+    """Parse Accept-Encoding into {coding: q}."""
+    accepted = {}
+    for part in (accept_encoding or "").split(','):
+        coding, _, params = part.strip().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+def choose_encoding(accept_encoding):
+    """
+    Pick the response encoding for an Accept-Encoding header.
+
+    Brotli is preferred when the brotli package is installed, then gzip.
+
+    Returns:
+        str: 'br', 'gzip' or None (send uncompressed)
+    """
+    accepted = _accepted_encodings(accept_encoding)
+    candidates = (['br'] if brotli is not None else []) + ['gzip']
+    best = None
+    for coding in candidates:
+        q = accepted.get(coding, accepted.get('*', 0.0))
+        if q > 0 and (best is None or q > best[1]):
+            best = (coding, q)
+    return best[0] if best else None
+
+def compress_response(response, accept_encoding):
+    """
+    Compress a JSON/text response in place when the client accepts it.
+
+    Streamed responses (e.g. the SSE status feed), bodies smaller than
+    Config.RESPONSE_COMPRESSION_MIN_BYTES and already-encoded responses are
+    left untouched.
+
+    Args:
+        response (flask.Response): Response to compress
+        accept_encoding (str): The request's Accept-Encoding header
+
+    Returns:
+        flask.Response: The same response
+    """
+    response.vary.add('Accept-Encoding')
+    if (not Config.RESPONSE_COMPRESSION_ENABLED or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers or response.status_code < 200
+            or response.status_code in (204, 304)):
+        return response
+    if response.mimetype != 'application/json' and not response.mimetype.startswith('text/'):
+        return response
+
+    encoding = choose_encoding(accept_encoding)
+    if encoding is None:
+        return response
+    body = response.get_data()
+    if len(body) < Config.RESPONSE_COMPRESSION_MIN_BYTES:
+        return response
+
+    if encoding == 'br':
+        compressed = brotli.compress(body, quality=Config.RESPONSE_BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(body, compresslevel=Config.RESPONSE_GZIP_LEVEL)
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    return response
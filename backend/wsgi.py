@@ -0,0 +1,5 @@
+# backend/wsgi.py
+# WSGI entry point for production servers: gunicorn -w 4 wsgi:app
+from app import app, start_background_services
+
+start_background_services()
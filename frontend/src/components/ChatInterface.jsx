@@ -8,6 +8,8 @@ import DateSelector from './DateSelector';
 
 function ChatInterface() {
   const [messages, setMessages] = useState([]);
+  // Server-side session; the backend keeps the history, so only new messages are sent
+  const [conversationId, setConversationId] = useState(null);
   const [input, setInput] = useState('');
   const [isLoading, setIsLoading] = useState(false);
   const [showDateSelector, setShowDateSelector] = useState(false);
@@ -134,6 +136,7 @@ function ChatInterface() {
         
         const requestData = {
           message: 'Sync adjustments',
+          conversation_id: conversationId,
           function_call: {
             name: 'sync_adjustments',
             arguments: {
@@ -154,6 +157,9 @@ function ChatInterface() {
         if (!response.data || !response.data.response) {
           throw new Error("Invalid response format from server");
         }
+        if (response.data.conversation_id) {
+          setConversationId(response.data.conversation_id);
+        }
         
         // Add response to chat
         console.log("Adding assistant response to chat with function results");
@@ -261,10 +267,7 @@ function ChatInterface() {
       const apiUrl = `${process.env.REACT_APP_API_URL || 'http://172.24.98.189:5001'}/api/chat`;
       const requestData = {
         message: userMessage,
-        history: messages.map(msg => ({
-          user: msg.type === 'user' ? msg.content : '',
-          assistant: msg.type === 'assistant' ? msg.content : ''
-        })).filter(entry => entry.user || entry.assistant)
+        conversation_id: conversationId
       };
       
       console.log("Sending request to:", apiUrl);
@@ -279,6 +282,9 @@ function ChatInterface() {
       if (!response.data || !response.data.response) {
         throw new Error("Invalid response format from server");
       }
+      if (response.data.conversation_id) {
+        setConversationId(response.data.conversation_id);
+      }
       
       // Add response to chat
       console.log("Adding assistant response to chat");
@@ -337,6 +343,7 @@ function ChatInterface() {
       
       const requestData = {
         message: 'Calculate the variance for SLS details',
+        conversation_id: conversationId,
         function_call: {
           name: 'sls_details_variance',
           arguments: {
@@ -358,6 +365,9 @@ function ChatInterface() {
       if (!response.data || !response.data.response) {
         throw new Error("Invalid response format from server");
       }
+      if (response.data.conversation_id) {
+        setConversationId(response.data.conversation_id);
+      }
       
       // Add response to chat
       console.log("Adding assistant response to chat with function results");
@@ -27,10 +27,12 @@ apiClient.interceptors.response.use(
   }
 );
 
-export const sendMessage = async (message, history = []) => {
+// Only the new message is sent; the backend keeps the conversation under
+// conversation_id (returned with every response, omit it to start a new one)
+export const sendMessage = async (message, conversationId = null) => {
   try {
     console.log(`Sending message to ${apiClient.defaults.baseURL}/api/chat`);
-    const response = await apiClient.post('/api/chat', { message, history });
+    const response = await apiClient.post('/api/chat', { message, conversation_id: conversationId });
     return response.data;
   } catch (error) {
     console.error('API Error:', error);
@@ -47,3 +49,36 @@ export const executeFunction = async (functionName, args) => {
     throw error;
   }
 };
+
+export const getJob = async (jobId) => {
+  const response = await apiClient.get(`/api/jobs/${encodeURIComponent(jobId)}`);
+  return response.data;
+};
+
+// Resolves with the finished job (status 'succeeded' or 'failed') and its result
+export const waitForJobResult = async (jobId, intervalMs = 2000) => {
+  for (;;) {
+    const response = await apiClient.get(`/api/jobs/${encodeURIComponent(jobId)}/result`);
+    if (response.status !== 202) {
+      return response.data;
+    }
+    await new Promise(resolve => setTimeout(resolve, intervalMs));
+  }
+};
+
+export const subscribeToStatusFeed = (cobDate, onEvent, onError) => {
+  const params = cobDate ? `?cob_date=${encodeURIComponent(cobDate)}` : '';
+  const source = new EventSource(`${apiClient.defaults.baseURL}/api/status/stream${params}`);
+  const eventTypes = ['snapshot', 'table_started', 'table_completed', 'table_status_changed', 'eta_moved', 'error'];
+
+  eventTypes.forEach(eventType => {
+    source.addEventListener(eventType, event => onEvent(JSON.parse(event.data)));
+  });
+  source.onerror = error => {
+    console.error('Status feed error:', error);
+    if (onError) onError(error);
+  };
+
+  // Call the returned function to unsubscribe
+  return () => source.close();
+};